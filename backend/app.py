@@ -27,7 +27,15 @@ def create_app(config_name="default"):
     setup_logger(
         log_level=app.config.get('LOG_LEVEL', 'INFO'),
         json_output=(app.config.get('LOG_FORMAT', 'text') == 'json'),
-        log_file=app.config.get('LOG_FILE')
+        log_file=app.config.get('LOG_FILE'),
+        async_output=app.config.get('LOG_ASYNC', True),
+        queue_options={
+            'max_queue': app.config.get('LOG_QUEUE_SIZE', 10000),
+            'batch_size': app.config.get('LOG_BATCH_SIZE', 512),
+            'flush_interval': app.config.get('LOG_FLUSH_INTERVAL', 0.2),
+            'policy': app.config.get('LOG_QUEUE_POLICY', 'drop'),
+            'block_timeout': app.config.get('LOG_BLOCK_TIMEOUT', 1.0),
+        }
     )
     
     # Initialize Sentry if DSN is provided
@@ -63,19 +71,58 @@ def create_app(config_name="default"):
          allow_headers=["Content-Type", "Authorization"],
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
     jwt.init_app(app)
+    from auth.identity import init_jwt_identity
+    init_jwt_identity(jwt)
     migrate.init_app(app, db)
     
     # Create models dynamically
     from models.user import create_user_model, UserRole, ApprovalStatus
     from models.property import create_property_model
+    from models.property_amenity import create_property_amenity_model
+    from models.property_image import create_property_image_model
+    from models.collection_version import create_collection_version_model
+    from models.revoked_token import create_revoked_token_model
+    from models.refresh_token_family import create_refresh_token_family_model
     from models.lease import create_lease_model, LeaseStatus
     from models.payment import create_payment_model, PaymentStatus, PaymentMethod
     
     User = create_user_model(db)
     Property = create_property_model(db)
+    PropertyAmenity = create_property_amenity_model(db)
+    PropertyImage = create_property_image_model(db)
+    CollectionVersion = create_collection_version_model(db)
+    RevokedToken = create_revoked_token_model(db)
+    RefreshTokenFamily = create_refresh_token_family_model(db)
     Lease = create_lease_model(db)
     Payment = create_payment_model(db)
     
+    # jti revocation list checked on every protected request
+    from auth.revocation import init_revocation
+    init_revocation(app, jwt, db, RevokedToken)
+    
+    # current_user loading with a per-request memo and a short-TTL user cache
+    from auth.current_user import init_current_user
+    init_current_user(app, jwt)
+    
+    # Response cache for listing endpoints (Redis when REDIS_URL is set)
+    from utils.response_cache import create_response_cache
+    app.response_cache = create_response_cache(app.config)
+    
+    # Admin server-sent events, fanned out through Redis when configured
+    from utils.event_stream import create_event_broker
+    app.event_broker = create_event_broker(app.config)
+    
+    # bcrypt runs in a bounded worker pool, off the request thread
+    from auth.password_pool import init_password_pool
+    init_password_pool(app)
+    
+    if app.config.get('BCRYPT_CALIBRATE'):
+        # Calibrated once and recorded, not re-measured by every process
+        from auth.utils import bcrypt_calibration_path, load_calibrated_rounds
+        path = bcrypt_calibration_path(app)
+        app.config['BCRYPT_ROUNDS'] = load_calibrated_rounds(path, app.config.get('BCRYPT_TARGET_MS', 100))
+        app.logger.info(f"bcrypt cost {app.config['BCRYPT_ROUNDS']} (calibration recorded in {path})")
+    
     # Setup logging middleware
     from middleware.logging_middleware import setup_logging_middleware
     setup_logging_middleware(app)
@@ -87,7 +134,7 @@ def create_app(config_name="default"):
     # Register blueprints
     from routes.auth import auth_bp
     from routes.protected import protected_bp
-    from routes.health import health_bp
+    from routes.health import health_bp, init_health_sampler
     from routes.properties import properties_bp
     
     app.register_blueprint(auth_bp)
@@ -95,6 +142,13 @@ def create_app(config_name="default"):
     app.register_blueprint(health_bp)
     app.register_blueprint(properties_bp)
     
+    # Health checks are sampled in the background and served from a snapshot
+    init_health_sampler(app)
+    
+    # Per-route rate limits need the registered endpoints
+    from middleware.security_middleware import apply_rate_limit_policy
+    apply_rate_limit_policy(app)
+    
     # CLI commands are registered via FlaskGroup in run_cli.py
     
     # Make models and db available globally
@@ -102,6 +156,11 @@ def create_app(config_name="default"):
     app.UserRole = UserRole
     app.ApprovalStatus = ApprovalStatus
     app.Property = Property
+    app.PropertyAmenity = PropertyAmenity
+    app.PropertyImage = PropertyImage
+    app.CollectionVersion = CollectionVersion
+    app.RevokedToken = RevokedToken
+    app.RefreshTokenFamily = RefreshTokenFamily
     app.Lease = Lease
     app.LeaseStatus = LeaseStatus
     app.Payment = Payment
@@ -120,6 +179,8 @@ with app.app_context():
     UserRole = app.UserRole
     ApprovalStatus = app.ApprovalStatus
     Property = app.Property
+    PropertyAmenity = app.PropertyAmenity
+    PropertyImage = app.PropertyImage
     Lease = app.Lease
     LeaseStatus = app.LeaseStatus
     Payment = app.Payment
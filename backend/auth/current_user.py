@@ -0,0 +1,255 @@
+"""
+Authenticated user loading for ``flask_jwt_extended.current_user``.
+
+The ``user_lookup_loader`` registered by :func:`init_current_user` loads the
+caller's ``User`` once, when the token is verified; routes then read
+``current_user`` instead of querying for the row again. Other users fetched
+through :func:`load_user` are memoized for the rest of the request too.
+
+Across requests, user columns are kept in a small TTL LRU (:class:`UserCache`)
+and re-attached to the session with ``merge(load=False)``, which issues no
+SQL. The password hash is never cached; it loads on first access. Entries are
+invalidated when a user is approved, rejected or deleted. With ``REDIS_URL``
+set (:class:`RedisUserCache`) the invalidation is also published on a Redis
+channel that a listener thread in every worker follows, so no worker keeps
+serving the old role or approval status. Without Redis, other workers see
+the change once their entry's TTL runs out.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from flask import current_app, g
+from sqlalchemy.orm import make_transient_to_detached
+
+from auth.identity import identity_from_claims
+from utils.logger import get_logger
+from utils.redis_client import get_redis_client
+
+logger = get_logger(__name__)
+
+# Columns left out of cached snapshots; they are loaded from the row on demand
+UNCACHED_COLUMNS = frozenset({'password'})
+
+
+class UserCache:
+    """
+    Bounded in-process LRU of user column values with a per-entry TTL.
+
+    Args:
+        max_entries: Users kept before the least recently used is evicted
+        ttl: Seconds an entry is served before the row is read again
+    """
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # user_id -> (expires_at, column values)
+        self._entries: 'OrderedDict[int, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, user_id: int, values: Dict[str, Any]) -> None:
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._entries[user_id] = (time.monotonic() + self.ttl, values)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /health/metrics."""
+        with self._lock:
+            return {
+                'backend': self.name,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'evictions': self.evictions,
+            }
+
+
+class RedisUserCache(UserCache):
+    """
+    User cache whose invalidations reach every worker through a Redis channel.
+
+    Entries are only served while this worker's listener is subscribed; on
+    (re)subscribing the cache is cleared, since invalidations published in
+    between were missed.
+
+    Args:
+        url: Redis connection URL
+        max_entries: Users kept before the least recently used is evicted
+        ttl: Seconds an entry is served before the row is read again
+    """
+
+    name = 'redis'
+    channel = 'renteasy:user_cache'
+
+    def __init__(self, url: str, max_entries: int, ttl: float):
+        super().__init__(max_entries, ttl)
+        self.client = get_redis_client(url)
+        self._listener: Optional[threading.Thread] = None
+        self._listener_lock = threading.Lock()
+        self._subscribed = threading.Event()
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        # The listener starts with the first lookup, after gunicorn forked
+        self._ensure_listener()
+        if not self._subscribed.is_set():
+            with self._lock:
+                self.misses += 1
+            return None
+        return super().get(user_id)
+
+    def invalidate(self, user_id: int) -> None:
+        super().invalidate(user_id)
+        try:
+            self.client.publish(self.channel, str(user_id))
+        except Exception as e:
+            # Other workers fall back to the TTL
+            logger.warning(f"User cache invalidation publish to Redis failed: {e}")
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._subscribed.clear()
+                self._listener = threading.Thread(target=self._listen, name='user-cache-listener', daemon=True)
+                self._listener.start()
+
+    def _listen(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                self.clear()
+                self._subscribed.set()
+                backoff = 1.0
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        UserCache.invalidate(self, int(message['data']))
+            except Exception as e:
+                self._subscribed.clear()
+                logger.warning(f"User cache listener lost Redis, retrying in {backoff:g}s: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+def _snapshot(user) -> Dict[str, Any]:
+    """Cacheable column values of a loaded User."""
+    return {
+        attr.key: getattr(user, attr.key)
+        for attr in user.__mapper__.column_attrs
+        if attr.key not in UNCACHED_COLUMNS
+    }
+
+
+def _attach(User, values: Dict[str, Any]):
+    """Re-attach a cached user to the current session without a query."""
+    user = User(**values)
+    # Columns missing from the snapshot become expired and load on access
+    make_transient_to_detached(user)
+    return current_app.db.session.merge(user, load=False)
+
+
+def load_user(user_id: int):
+    """
+    Return the User with ``user_id``, at most one lookup per request.
+
+    Args:
+        user_id: Primary key of the user
+
+    Returns:
+        The User, or None if it does not exist
+    """
+    if user_id is None:
+        return None
+    # Reset by the before_request hook, so this never outlives a request
+    loaded = g.setdefault('loaded_users', {})
+    if user_id in loaded:
+        return loaded[user_id]
+
+    User = current_app.User
+    cache: UserCache = current_app.user_cache
+    values = cache.get(user_id)
+    if values is not None:
+        user = _attach(User, values)
+    else:
+        user = current_app.db.session.get(User, user_id)
+        if user is not None:
+            cache.set(user_id, _snapshot(user))
+    loaded[user_id] = user
+    return user
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop ``user_id`` from the user cache after its row changed."""
+    current_app.user_cache.invalidate(user_id)
+    if 'loaded_users' in g:
+        g.loaded_users.pop(user_id, None)
+
+
+def create_user_cache(config: Mapping[str, Any]) -> UserCache:
+    """Build the user cache described by the app config."""
+    max_entries = int(config.get('USER_CACHE_MAX_ENTRIES', 1024))
+    ttl = float(config.get('USER_CACHE_TTL', 30))
+    redis_url = config.get('REDIS_URL')
+    if redis_url:
+        try:
+            return RedisUserCache(redis_url, max_entries, ttl)
+        except ImportError:
+            logger.warning("redis package not available, user cache invalidations stay in this worker")
+    return UserCache(max_entries, ttl)
+
+
+def init_current_user(app, jwt) -> UserCache:
+    """Create the app's user cache and register the JWT user loader."""
+    app.user_cache = create_user_cache(app.config)
+
+    @app.before_request
+    def reset_loaded_users():
+        g.pop('loaded_users', None)
+
+    @jwt.user_lookup_loader
+    def lookup_user(jwt_header, jwt_data):
+        # None makes flask_jwt_extended answer 401, e.g. for deleted users
+        identity = identity_from_claims(jwt_data)
+        return load_user(identity.user_id) if identity else None
+
+    return app.user_cache
@@ -0,0 +1,94 @@
+"""
+JWT identity: structured claims in, one parsed identity per request out.
+
+Tokens carry the user id as ``sub`` and the username and role as top-level
+claims, all written by the loaders registered in :func:`init_jwt_identity`,
+so routes never build or decode identity payloads themselves.
+
+Tokens issued before this format put ``json.dumps({'user_id', 'username',
+'role'})`` in ``sub``. They are still accepted while
+``JWT_ACCEPT_LEGACY_SUBJECT`` is on, so sessions survive the rollout.
+"""
+import json
+from typing import Any, Dict, NamedTuple, Optional
+
+from flask import current_app, g
+from flask_jwt_extended import get_jwt
+
+
+class TokenIdentity(NamedTuple):
+    """The authenticated caller as described by their token."""
+    user_id: int
+    username: Optional[str]
+    role: Optional[str]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Legacy ``user_info`` shape: user_id, username and role."""
+        return self._asdict()
+
+    @classmethod
+    def from_user(cls, user) -> 'TokenIdentity':
+        """Build the identity to issue for a User row."""
+        return cls(user.id, user.username, user.role.value if user.role else None)
+
+
+def init_jwt_identity(jwt) -> None:
+    """Register the claim loaders on the app's JWTManager."""
+
+    @jwt.user_identity_loader
+    def user_identity(identity):
+        # The JWT spec makes sub a string
+        if isinstance(identity, TokenIdentity):
+            return str(identity.user_id)
+        return identity
+
+    @jwt.additional_claims_loader
+    def identity_claims(identity):
+        if isinstance(identity, TokenIdentity):
+            return {'username': identity.username, 'role': identity.role}
+        return {}
+
+
+def identity_from_claims(claims: Dict[str, Any]) -> Optional[TokenIdentity]:
+    """
+    Parse decoded JWT claims into a TokenIdentity.
+
+    Args:
+        claims: Decoded token payload
+
+    Returns:
+        Optional[TokenIdentity]: None if the token carries no usable identity
+    """
+    subject = claims.get('sub')
+    if subject is None:
+        return None
+
+    if isinstance(subject, str) and subject.startswith('{'):
+        # Legacy token: the whole identity is a JSON string in sub
+        if not current_app.config.get('JWT_ACCEPT_LEGACY_SUBJECT', True):
+            return None
+        try:
+            legacy = json.loads(subject)
+            return TokenIdentity(int(legacy['user_id']), legacy.get('username'), legacy.get('role'))
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    try:
+        return TokenIdentity(int(subject), claims.get('username'), claims.get('role'))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_current_identity() -> Optional[TokenIdentity]:
+    """
+    Return the verified caller's identity, parsing the token once per request.
+
+    Must be called after ``jwt_required`` has verified the token.
+    """
+    claims = get_jwt()
+    cached = g.get('token_identity')
+    # Keyed on the decoded claims so an app context shared by several
+    # requests (as in tests) never serves a previous caller's identity
+    if cached is None or cached[0] is not claims:
+        cached = g.token_identity = (claims, identity_from_claims(claims))
+    return cached[1]
@@ -0,0 +1,198 @@
+"""
+Bounded process pool for bcrypt work.
+
+bcrypt is deliberately slow (hundreds of milliseconds per call), so running
+it on a request thread pins a sync worker and a burst of logins starves
+every other endpoint. Hashing and verification are handed to a small pool of
+worker processes instead. Admission is capped at ``workers + max_queue``
+calls in flight; beyond that callers get :class:`PasswordPoolBusyError`
+straight away, which routes turn into ``503`` with ``Retry-After``.
+
+A call holds its admission slot until its work has actually finished or been
+cancelled, not merely until the caller stopped waiting, so timed-out calls
+cannot pile up work beyond the cap. Worker processes are started through a
+forkserver (spawn where that is unavailable) rather than forked from a
+threaded server worker.
+
+With ``workers=0`` the work runs inline on the calling thread (used by tests
+and CLI commands) while still recording latency.
+"""
+import math
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Deque, Dict, Optional
+
+from flask import jsonify
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Latency samples kept for the percentiles on /health/metrics
+LATENCY_WINDOW = 512
+
+
+def _mp_context():
+    # Forking a process with running threads (log writer, gevent hub, other
+    # request threads) can copy held locks into the child
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class PasswordPoolBusyError(RuntimeError):
+    """Raised when the pool's queue is full or a call waited past its timeout."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PasswordPool:
+    """
+    Size-limited pool running bcrypt calls in worker processes.
+
+    Args:
+        workers: Number of worker processes; 0 runs calls inline
+        max_queue: Calls allowed to wait for a worker beyond those running
+        timeout: Seconds a caller waits for its result before giving up
+    """
+
+    def __init__(self, workers: int, max_queue: int, timeout: float):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created on first use so each forked server worker gets its own pool
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context())
+        return self._executor
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run ``fn(*args)`` in the pool and return its result.
+
+        Raises:
+            PasswordPoolBusyError: If the queue is full or the call timed out
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordPoolBusyError('Password hashing queue is full', self.retry_after())
+
+        start = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+        if self.workers <= 0:
+            try:
+                result = fn(*args)
+            finally:
+                self._release()
+        else:
+            try:
+                future = self._get_executor().submit(fn, *args)
+            except Exception:
+                self._release()
+                raise
+            # The slot is freed when the work ends, even if the caller gave up
+            future.add_done_callback(lambda _: self._release())
+            try:
+                result = future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                # Drop it if it is still queued; a running call keeps its slot
+                future.cancel()
+                with self._lock:
+                    self._timeouts += 1
+                raise PasswordPoolBusyError('Password hashing timed out', self.retry_after())
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._completed += 1
+            self._latencies.append(elapsed)
+        return result
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained."""
+        with self._lock:
+            average = sum(self._latencies) / len(self._latencies) if self._latencies else 0.25
+            backlog = self._in_flight
+        return max(1, math.ceil(backlog * average / max(self.workers, 1)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and latency figures for /health/metrics."""
+        with self._lock:
+            samples = sorted(self._latencies)
+            in_flight = self._in_flight
+            counters = {
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'timeouts': self._timeouts,
+            }
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(len(samples) * fraction))] * 1000, 2)
+
+        return {
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'in_flight': in_flight,
+            'queue_depth': max(0, in_flight - max(self.workers, 1)),
+            **counters,
+            'latency_ms': {'p50': percentile(0.5), 'p95': percentile(0.95), 'max': percentile(1.0)},
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, if any were started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pool: Optional[PasswordPool] = None
+
+
+def init_password_pool(app) -> PasswordPool:
+    """Create the process-wide password pool from the app config."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+    _pool = PasswordPool(
+        workers=int(app.config.get('PASSWORD_POOL_WORKERS', 2)),
+        max_queue=int(app.config.get('PASSWORD_POOL_MAX_QUEUE', 16)),
+        timeout=float(app.config.get('PASSWORD_POOL_TIMEOUT', 5)),
+    )
+    app.password_pool = _pool
+    return _pool
+
+
+def get_password_pool() -> Optional[PasswordPool]:
+    """Return the configured pool, or None outside an initialized app."""
+    return _pool
+
+
+def busy_response(error: PasswordPoolBusyError):
+    """503 response telling the client when to retry."""
+    response = jsonify({'error': 'Server is busy, please retry shortly'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
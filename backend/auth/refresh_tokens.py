@@ -0,0 +1,173 @@
+"""
+Refresh-token rotation with reuse detection.
+
+Every refresh token belongs to a family: the chain of tokens descended from
+one login. ``/auth/refresh`` retires the presented token and hands out its
+successor, and the ``refresh_token_families`` row only remembers the newest
+jti. A token carrying the family id but an older jti has already been used,
+which means it was copied; the whole family is then revoked, logging out both
+the thief and the victim.
+
+One row per live session keeps the table small; :func:`compact_refresh_tokens`
+deletes expired and revoked families in batches and is meant to run
+periodically (``manage.py compact-refresh-tokens``).
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from flask import current_app
+from flask_jwt_extended import create_refresh_token
+from sqlalchemy import delete, or_, select, update
+
+from auth.identity import TokenIdentity, identity_from_claims
+from auth.revocation import revoke_token
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Claim holding the family id of a refresh token
+FAMILY_CLAIM = 'fam'
+
+
+class RefreshTokenError(Exception):
+    """Raised when a refresh token cannot be exchanged."""
+
+
+class RefreshTokenReuseError(RefreshTokenError):
+    """Raised when a retired refresh token is presented again."""
+
+
+def _refresh_lifetime() -> timedelta:
+    lifetime = current_app.config.get('JWT_REFRESH_TOKEN_EXPIRES', 2592000)
+    return lifetime if isinstance(lifetime, timedelta) else timedelta(seconds=lifetime)
+
+
+def _encode(identity: TokenIdentity, jti: str, family_id: str, expires_delta: timedelta) -> str:
+    return create_refresh_token(
+        identity=identity,
+        expires_delta=expires_delta,
+        additional_claims={'jti': jti, FAMILY_CLAIM: family_id},
+    )
+
+
+def issue_refresh_token(identity: TokenIdentity, expires_delta: Optional[timedelta] = None) -> str:
+    """
+    Issue the first refresh token of a new family and commit its row.
+
+    Args:
+        identity: Identity the token is issued for
+        expires_delta: Token lifetime; defaults to JWT_REFRESH_TOKEN_EXPIRES
+
+    Returns:
+        str: Encoded refresh token
+    """
+    expires_delta = expires_delta or _refresh_lifetime()
+    now = datetime.now(timezone.utc)
+    jti = str(uuid.uuid4())
+    Family = current_app.RefreshTokenFamily
+    current_app.db.session.add(Family(
+        id=jti, user_id=identity.user_id, current_jti=jti, generation=0,
+        expires_at=now + expires_delta, created_at=now,
+    ))
+    current_app.db.session.commit()
+    return _encode(identity, jti, jti, expires_delta)
+
+
+def rotate_refresh_token(claims) -> str:
+    """
+    Retire the refresh token described by ``claims`` and issue its successor.
+
+    Args:
+        claims: Decoded claims of the presented refresh token
+
+    Returns:
+        str: The new refresh token
+
+    Raises:
+        RefreshTokenReuseError: If the token was already rotated; the
+                                family is revoked
+        RefreshTokenError: If the family is revoked or unknown
+    """
+    identity = identity_from_claims(claims)
+    if identity is None:
+        raise RefreshTokenError('Invalid refresh token')
+
+    family_id = claims.get(FAMILY_CLAIM)
+    if family_id is None:
+        # Issued before rotation: retire it and start a family
+        revoke_token(claims)
+        return issue_refresh_token(identity)
+
+    db = current_app.db
+    Family = current_app.RefreshTokenFamily
+    expires_delta = _refresh_lifetime()
+    new_jti = str(uuid.uuid4())
+    # Compare-and-swap on the current jti, so of two concurrent uses of
+    # one token exactly one wins
+    result = db.session.execute(
+        update(Family)
+        .where(Family.id == family_id, Family.current_jti == claims['jti'], Family.revoked_at.is_(None))
+        .values(
+            current_jti=new_jti,
+            generation=Family.generation + 1,
+            expires_at=datetime.now(timezone.utc) + expires_delta,
+        )
+    )
+    if result.rowcount == 1:
+        db.session.commit()
+        return _encode(identity, new_jti, family_id, expires_delta)
+
+    db.session.rollback()
+    if revoke_family(family_id):
+        logger.warning(f"Refresh token reuse detected for user {identity.user_id}, family {family_id} revoked")
+        raise RefreshTokenReuseError('Refresh token reuse detected')
+    raise RefreshTokenError('Refresh token is no longer valid')
+
+
+def revoke_family(family_id: str) -> bool:
+    """
+    Revoke every token of a family.
+
+    Returns:
+        bool: True if the family was live and is now revoked
+    """
+    db = current_app.db
+    Family = current_app.RefreshTokenFamily
+    result = db.session.execute(
+        update(Family)
+        .where(Family.id == family_id, Family.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def compact_refresh_tokens(batch_size: int = 1000, now: Optional[datetime] = None) -> int:
+    """
+    Delete expired and revoked families in batches.
+
+    Revoked rows are not needed once gone: a token whose family row is
+    missing is rejected the same way. Batches keep each delete short so
+    refreshes are never blocked behind one large statement.
+
+    Args:
+        batch_size: Rows deleted per statement
+        now: Reference time, defaults to the current time
+
+    Returns:
+        int: Number of families deleted
+    """
+    db = current_app.db
+    Family = current_app.RefreshTokenFamily
+    now = now or datetime.now(timezone.utc)
+    stale = or_(Family.expires_at <= now, Family.revoked_at.isnot(None))
+    deleted = 0
+    while True:
+        ids = db.session.execute(select(Family.id).where(stale).limit(batch_size)).scalars().all()
+        if not ids:
+            break
+        db.session.execute(delete(Family).where(Family.id.in_(ids)))
+        db.session.commit()
+        deleted += len(ids)
+    return deleted
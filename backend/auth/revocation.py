@@ -0,0 +1,396 @@
+"""
+JWT revocation list keyed by ``jti``.
+
+Revoked token ids live in Redis when ``REDIS_URL`` is set and in the
+``revoked_tokens`` table otherwise (SQLite in development and tests), each
+entry kept only until the token's own ``exp``; past that the signature check
+rejects the token anyway, so expired entries are pruned.
+
+Nearly every token checked was never revoked, so each worker keeps a Bloom
+filter of the revoked ids in front of the store. A filter miss answers "not
+revoked" without touching Redis or the database; only filter hits (revoked
+tokens and the rare false positive) reach the store. Revocations made in this
+worker enter its filter at once. To pick up other workers' revocations, a
+background thread per worker adds the entries revoked since its previous
+sync every ``REVOCATION_SYNC_SECONDS``, so each sync reads only new rows. The
+filter is rebuilt from the whole list only on the first check and after
+expired entries are pruned every ``REVOCATION_PRUNE_SECONDS``. Sync and prune
+use their own database connection, never a request's session. With an
+interval of 0 the sync runs inline on every check instead.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from flask import current_app
+from sqlalchemy import delete, select
+
+from utils.logger import get_logger
+from utils.redis_client import get_redis_client
+
+logger = get_logger(__name__)
+
+# Incremental syncs re-read this much before the previous one, for rows
+# committed late or stamped by a clock slightly behind
+SYNC_OVERLAP = timedelta(seconds=15)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Args:
+        capacity: Number of items the filter is sized for
+        error_rate: False-positive rate at ``capacity`` items
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class DatabaseRevocationBackend:
+    """Revoked ids in the ``revoked_tokens`` table of the app database."""
+
+    name = 'database'
+    # Rows stay until pruned, so any sync can be incremental
+    log_retention = None
+
+    def __init__(self, db, model):
+        self.db = db
+        self.model = model
+
+    def _execute(self, statement):
+        try:
+            return self.db.session.execute(statement)
+        except Exception:
+            # Leave the request's session usable for the route
+            self.db.session.rollback()
+            raise
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        # Committed by the route, together with the rest of its changes
+        self.db.session.merge(self.model(jti=jti, expires_at=expires_at))
+
+    def is_revoked(self, jti: str) -> bool:
+        return self._execute(select(self.model.jti).where(self.model.jti == jti)).first() is not None
+
+    # Sync and prune use their own connection, outside any request's session
+
+    def active_ids(self, now: datetime) -> Iterable[str]:
+        with self.db.engine.connect() as connection:
+            return connection.execute(select(self.model.jti).where(self.model.expires_at > now)).scalars().all()
+
+    def revoked_since(self, since: datetime, now: datetime) -> Iterable[str]:
+        with self.db.engine.connect() as connection:
+            return connection.execute(
+                select(self.model.jti).where(self.model.revoked_at > since, self.model.expires_at > now)
+            ).scalars().all()
+
+    def prune(self, now: datetime) -> int:
+        with self.db.engine.begin() as connection:
+            result = connection.execute(delete(self.model).where(self.model.expires_at <= now))
+        return result.rowcount or 0
+
+
+class RedisRevocationBackend:
+    """
+    Revoked ids in a Redis sorted set scored by expiry, shared by every worker.
+
+    A second sorted set scored by revocation time feeds incremental syncs;
+    it keeps ``log_retention`` seconds, and a worker that fell further
+    behind rebuilds from the whole list.
+    """
+
+    name = 'redis'
+    key = 'renteasy:revoked_tokens'
+    log_key = 'renteasy:revoked_tokens:log'
+    log_retention = 3600.0
+
+    def __init__(self, url: str):
+        self.client = get_redis_client(url)
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        pipeline = self.client.pipeline()
+        pipeline.zadd(self.key, {jti: expires_at.timestamp()})
+        pipeline.zadd(self.log_key, {jti: time.time()})
+        pipeline.execute()
+
+    def is_revoked(self, jti: str) -> bool:
+        return self.client.zscore(self.key, jti) is not None
+
+    def active_ids(self, now: datetime) -> Iterable[str]:
+        members = self.client.zrangebyscore(self.key, f'({now.timestamp()}', '+inf')
+        return [member.decode('utf-8') for member in members]
+
+    def revoked_since(self, since: datetime, now: datetime) -> Iterable[str]:
+        # Expired ids may come back too; they only cost a store lookup on a hit
+        members = self.client.zrangebyscore(self.log_key, f'({since.timestamp()}', '+inf')
+        return [member.decode('utf-8') for member in members]
+
+    def prune(self, now: datetime) -> int:
+        self.client.zremrangebyscore(self.log_key, '-inf', now.timestamp() - self.log_retention)
+        return self.client.zremrangebyscore(self.key, '-inf', now.timestamp())
+
+
+class RevocationStore:
+    """
+    Revocation list with a per-worker Bloom filter in front of the backend.
+
+    Args:
+        backend: Database or Redis backend
+        bloom_capacity: Revoked ids the filter is sized for; it grows on
+                        rebuild when more are outstanding
+        error_rate: Target false-positive rate of the filter
+        sync_interval: Seconds between background syncs of new
+                       revocations; 0 syncs inline on every check
+        prune_interval: Seconds between deletions of expired entries, each
+                        followed by a full rebuild of the filter
+        app: Flask application whose context the background thread uses
+    """
+
+    def __init__(self, backend, bloom_capacity: int = 100000, error_rate: float = 0.001,
+                 sync_interval: float = 5.0, prune_interval: float = 300.0, app=None):
+        self.backend = backend
+        self.app = app
+        self.bloom_capacity = bloom_capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.prune_interval = prune_interval
+        self._bloom: Optional[BloomFilter] = None
+        self._synced_at = 0.0
+        # Wall-clock time the last sync started, for the next incremental one
+        self._watermark: Optional[datetime] = None
+        self._pruned_at = 0.0
+        self._lock = threading.Lock()
+        # Held for a whole sync, so the thread and inline syncs never overlap
+        self._sync_lock = threading.Lock()
+        self._syncer: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # Revoked here since the last rebuild
+        self._recent: List[str] = []
+        self._counters = {
+            'checks': 0, 'filter_negatives': 0, 'store_lookups': 0, 'revoked_hits': 0,
+            'revocations': 0, 'pruned': 0, 'rebuilds': 0, 'syncs': 0, 'errors': 0,
+        }
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def refresh(self, initial: bool = False) -> None:
+        """
+        Add revocations made since the last sync to the filter.
+
+        The filter is rebuilt from every active entry instead when there is
+        none yet, after pruning, when the backend no longer holds the changes
+        since the last sync, or when it is fuller than it was sized for.
+
+        Args:
+            initial: Skip the sync if another thread already built a filter
+        """
+        with self._sync_lock:
+            if initial and self._bloom is not None:
+                return
+            now = time.monotonic()
+            wall_now = datetime.now(timezone.utc)
+            bloom = self._bloom
+            rebuild = bloom is None or bloom.count > bloom.capacity
+            if now - self._pruned_at >= self.prune_interval:
+                self._count('pruned', self.backend.prune(wall_now))
+                self._pruned_at = now
+                rebuild = True
+            retention = self.backend.log_retention
+            if retention is not None and now - self._synced_at >= retention:
+                rebuild = True
+
+            if rebuild:
+                ids = list(self.backend.active_ids(wall_now))
+                bloom = BloomFilter(max(self.bloom_capacity, 2 * len(ids)), self.error_rate)
+                for jti in ids:
+                    bloom.add(jti)
+            else:
+                ids = list(self.backend.revoked_since(self._watermark - SYNC_OVERLAP, wall_now))
+            with self._lock:
+                if rebuild:
+                    # Revocations made here may have missed the query above
+                    for jti in self._recent:
+                        bloom.add(jti)
+                    self._bloom = bloom
+                    self._counters['rebuilds'] += 1
+                else:
+                    # The overlap returns some ids again; add each only once
+                    for jti in ids:
+                        if jti not in bloom:
+                            bloom.add(jti)
+                    self._counters['syncs'] += 1
+                self._recent = []
+                self._synced_at = now
+                self._watermark = wall_now
+
+    def _sync(self) -> None:
+        """Make sure a filter exists and, with an interval, that the thread keeps it fresh."""
+        if self.sync_interval <= 0:
+            self._refresh_in_context()
+            return
+        self._ensure_syncer()
+        if self._bloom is None:
+            # Only the first checks of a worker wait for a rebuild
+            self._refresh_in_context(initial=True)
+
+    def _refresh_in_context(self, initial: bool = False) -> None:
+        if self.app is None:
+            self.refresh(initial)
+            return
+        with self.app.app_context():
+            self.refresh(initial)
+
+    def _ensure_syncer(self) -> None:
+        # A thread started before fork is not alive in the child
+        if self._syncer is not None and self._syncer.is_alive():
+            return
+        with self._lock:
+            if not self._stop.is_set() and (self._syncer is None or not self._syncer.is_alive()):
+                self._syncer = threading.Thread(target=self._run_syncer, name='revocation-sync', daemon=True)
+                self._syncer.start()
+
+    def _run_syncer(self) -> None:
+        while not self._stop.wait(self.sync_interval):
+            try:
+                self._refresh_in_context()
+            except Exception as e:
+                self._count('errors')
+                logger.warning(f"Revocation list sync failed: {e}")
+
+    def close(self) -> None:
+        """Stop the background sync thread."""
+        self._stop.set()
+        if self._syncer is not None:
+            self._syncer.join(timeout=1.0)
+
+    def is_revoked(self, jti: str) -> bool:
+        """
+        Return whether ``jti`` has been revoked.
+
+        Backend errors fail closed for ids the filter flags and open for the
+        rest, so a Redis outage never locks out every session.
+        """
+        self._count('checks')
+        try:
+            self._sync()
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Revocation list sync failed: {e}")
+        bloom = self._bloom
+        if bloom is not None and jti not in bloom:
+            self._count('filter_negatives')
+            return False
+
+        self._count('store_lookups')
+        try:
+            revoked = self.backend.is_revoked(jti)
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Revocation lookup failed: {e}")
+            return bloom is not None
+        if revoked:
+            self._count('revoked_hits')
+        return revoked
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        """Revoke ``jti`` until ``expires_at``; the database backend leaves the commit to the caller."""
+        self.backend.revoke(jti, expires_at)
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+            self._recent.append(jti)
+            self._counters['revocations'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /health/metrics."""
+        with self._lock:
+            counters = dict(self._counters)
+            bloom = self._bloom
+        return {
+            'backend': self.backend.name,
+            **counters,
+            'filter_entries': bloom.count if bloom else None,
+            'filter_bits': bloom.size if bloom else None,
+        }
+
+
+def create_revocation_store(config: Mapping[str, Any], db, model, app=None) -> RevocationStore:
+    """
+    Build the revocation store described by the app config.
+
+    Args:
+        config: App config
+        db: Flask-SQLAlchemy extension, for the database backend
+        model: The RevokedToken model
+        app: Flask application, for the background sync thread
+    """
+    options = dict(
+        app=app,
+        bloom_capacity=int(config.get('REVOCATION_BLOOM_CAPACITY', 100000)),
+        error_rate=float(config.get('REVOCATION_BLOOM_ERROR_RATE', 0.001)),
+        sync_interval=float(config.get('REVOCATION_SYNC_SECONDS', 5)),
+        prune_interval=float(config.get('REVOCATION_PRUNE_SECONDS', 300)),
+    )
+    redis_url = config.get('REDIS_URL')
+    if redis_url:
+        try:
+            return RevocationStore(RedisRevocationBackend(redis_url), **options)
+        except ImportError:
+            logger.warning("redis package not available, keeping revoked tokens in the database")
+    return RevocationStore(DatabaseRevocationBackend(db, model), **options)
+
+
+def revoke_token(claims: Mapping[str, Any]) -> None:
+    """
+    Revoke the token described by decoded ``claims`` until it expires.
+
+    With the database backend the entry joins the request's session, which
+    the caller commits.
+
+    Args:
+        claims: Decoded JWT payload carrying ``jti`` and usually ``exp``
+    """
+    if 'exp' in claims:
+        expires_at = datetime.fromtimestamp(claims['exp'], timezone.utc)
+    else:
+        # Non-expiring token: keep it for the longest token lifetime
+        seconds = current_app.config.get('JWT_REFRESH_TOKEN_EXPIRES', 2592000)
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+    current_app.revocation_store.revoke(claims['jti'], expires_at)
+
+
+def init_revocation(app, jwt, db, model) -> None:
+    """Create ``app.revocation_store`` and register the JWT blocklist check."""
+    app.revocation_store = create_revocation_store(app.config, db, model, app)
+
+    @jwt.token_in_blocklist_loader
+    def token_revoked(jwt_header, jwt_payload):
+        return current_app.revocation_store.is_revoked(jwt_payload['jti'])
@@ -3,29 +3,146 @@ Authentication utility functions for password hashing and JWT token management.
 """
 
 import bcrypt
-import json
+import os
+import time
 from datetime import datetime, timedelta, timezone
-from flask_jwt_extended import create_access_token, create_refresh_token, decode_token
+from flask_jwt_extended import create_access_token, decode_token
 from flask_jwt_extended.exceptions import JWTExtendedException
 from typing import Tuple, Optional, Dict, Any
-from flask import current_app
+from flask import current_app, has_app_context
+from auth.identity import TokenIdentity, get_current_identity, identity_from_claims
+from auth.refresh_tokens import issue_refresh_token
+from auth.password_pool import PasswordPoolBusyError, get_password_pool
+from config import MAX_BCRYPT_ROUNDS, MIN_BCRYPT_ROUNDS
 
-def hash_password(password: str) -> str:
+# bcrypt's own default; used outside an app context and as the config default
+DEFAULT_BCRYPT_ROUNDS = 12
+
+def _bcrypt_hash(password: bytes, rounds: int = DEFAULT_BCRYPT_ROUNDS) -> bytes:
+    """Hash with a fresh salt (runs in a password pool worker)."""
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+def _bcrypt_check(password: bytes, hashed_password: bytes) -> bool:
+    """Check a password against a hash (runs in a password pool worker)."""
+    return bcrypt.checkpw(password, hashed_password)
+
+def _run_bcrypt(fn, *args):
+    """Run a bcrypt call in the password pool, or inline if there is none."""
+    pool = get_password_pool()
+    if pool is None:
+        return fn(*args)
+    return pool.run(fn, *args)
+
+def get_bcrypt_rounds() -> int:
+    """Return the target bcrypt cost from the app config (BCRYPT_ROUNDS)."""
+    if has_app_context():
+        return int(current_app.config.get('BCRYPT_ROUNDS', DEFAULT_BCRYPT_ROUNDS))
+    return DEFAULT_BCRYPT_ROUNDS
+
+def get_hash_rounds(hashed_password: str) -> Optional[int]:
+    """
+    Read the cost factor from a bcrypt hash such as ``$2b$12$...``.
+    
+    Returns:
+        Optional[int]: The cost, or None if the hash is not bcrypt
+    """
+    parts = (hashed_password or '').split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+def needs_rehash(hashed_password: str, rounds: Optional[int] = None) -> bool:
+    """
+    Whether a stored hash was made with a cost below the target.
+    
+    Hashes above the target are kept, so instances or deploys with different
+    targets never rewrite each other's hashes back and forth.
+    """
+    stored = get_hash_rounds(hashed_password)
+    return stored is None or stored < (rounds or get_bcrypt_rounds())
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int = MIN_BCRYPT_ROUNDS,
+                            max_rounds: int = MAX_BCRYPT_ROUNDS) -> int:
+    """
+    Pick the highest bcrypt cost whose hash time fits ``target_ms`` on this CPU.
+    
+    Each extra round doubles the work, so one timing at ``min_rounds`` is
+    enough to extrapolate the rest.
+    
+    Args:
+        target_ms (float): Time budget for one hash in milliseconds
+        min_rounds (int): Lowest cost ever returned
+        max_rounds (int): Highest cost ever returned
+        
+    Returns:
+        int: Chosen cost factor
+    """
+    # Best of three smooths out scheduler noise
+    samples = []
+    for _ in range(3):
+        start = time.perf_counter()
+        bcrypt.hashpw(b'calibration', bcrypt.gensalt(min_rounds))
+        samples.append((time.perf_counter() - start) * 1000)
+    elapsed_ms = min(samples)
+    
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms *= 2
+    return rounds
+
+def bcrypt_calibration_path(app) -> str:
+    """Return where the calibrated bcrypt cost is recorded (BCRYPT_CALIBRATION_FILE)."""
+    return app.config.get('BCRYPT_CALIBRATION_FILE') or os.path.join(app.instance_path, 'bcrypt_rounds')
+
+def record_calibrated_rounds(path: str, rounds: int) -> None:
+    """Write the calibrated bcrypt cost to ``path``."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(f"{rounds}\n")
+
+def load_calibrated_rounds(path: str, target_ms: float) -> int:
+    """
+    Read the recorded calibrated bcrypt cost, calibrating and recording it first if needed.
+    
+    Args:
+        path (str): File holding the cost
+        target_ms (float): Time budget for one hash, used when calibrating
+        
+    Returns:
+        int: The recorded cost
+    """
+    try:
+        with open(path) as f:
+            rounds = int(f.read().strip())
+        if MIN_BCRYPT_ROUNDS <= rounds <= MAX_BCRYPT_ROUNDS:
+            return rounds
+    except (OSError, ValueError):
+        pass
+    
+    rounds = calibrate_bcrypt_rounds(target_ms)
+    record_calibrated_rounds(path, rounds)
+    return rounds
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """
     Hash a password using bcrypt.
     
     Args:
         password (str): Plain text password to hash
+        rounds (int, optional): Cost factor; defaults to BCRYPT_ROUNDS
         
     Returns:
         str: Hashed password string
+        
+    Raises:
+        PasswordPoolBusyError: If the password pool cannot take the work
     """
     if not password:
         raise ValueError("Password cannot be empty")
     
-    # Generate salt and hash password
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+    # Generate salt and hash password off the request thread
+    hashed = _run_bcrypt(_bcrypt_hash, password.encode('utf-8'), rounds or get_bcrypt_rounds())
     return hashed.decode('utf-8')
 
 def verify_password(password: str, hashed_password: str) -> bool:
@@ -38,13 +155,18 @@ def verify_password(password: str, hashed_password: str) -> bool:
         
     Returns:
         bool: True if password matches, False otherwise
+        
+    Raises:
+        PasswordPoolBusyError: If the password pool cannot take the work
     """
     if not password or not hashed_password:
         return False
     
     try:
         # Check if password matches hash
-        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+        return _run_bcrypt(_bcrypt_check, password.encode('utf-8'), hashed_password.encode('utf-8'))
+    except PasswordPoolBusyError:
+        raise
     except Exception:
         return False
 
@@ -60,12 +182,8 @@ def generate_tokens(user_id: int, username: str, role: str) -> Tuple[str, str]:
     Returns:
         Tuple[str, str]: (access_token, refresh_token)
     """
-    # Create token identity as a JSON string (JWT subject must be a string)
-    token_identity = json.dumps({
-        'user_id': user_id,
-        'username': username,
-        'role': role
-    })
+    # sub is the user id; username and role become claims (see auth.identity)
+    token_identity = TokenIdentity(user_id, username, role)
     
     # Generate access token (short-lived)
     access_token = create_access_token(
@@ -73,11 +191,8 @@ def generate_tokens(user_id: int, username: str, role: str) -> Tuple[str, str]:
         expires_delta=timedelta(hours=1)  # 1 hour
     )
     
-    # Generate refresh token (long-lived)
-    refresh_token = create_refresh_token(
-        identity=token_identity,
-        expires_delta=timedelta(days=30)  # 30 days
-    )
+    # Generate refresh token (long-lived), starting a rotation family
+    refresh_token = issue_refresh_token(token_identity, expires_delta=timedelta(days=30))
     
     return access_token, refresh_token
 
@@ -132,17 +247,14 @@ def refresh_access_token(refresh_token: str) -> Optional[str]:
     try:
         # Decode refresh token to get user info
         decoded = decode_token(refresh_token)
-        user_info_str = decoded.get('sub', '{}')
+        identity = identity_from_claims(decoded)
         
-        if not user_info_str:
+        if identity is None:
             return None
         
-        # Parse the user info from JSON string
-        user_info = json.loads(user_info_str)
-        
         # Generate new access token
         new_access_token = create_access_token(
-            identity=user_info_str,
+            identity=identity,
             expires_delta=timedelta(hours=1)
         )
         
@@ -201,10 +313,8 @@ def get_user_info_from_token(token: str) -> Optional[Dict[str, Any]]:
     """
     try:
         decoded = verify_access_token(token)
-        if decoded and 'sub' in decoded:
-            user_info_str = decoded['sub']
-            return json.loads(user_info_str)
-        return None
+        identity = identity_from_claims(decoded) if decoded else None
+        return identity.as_dict() if identity else None
     except Exception:
         return None
 
@@ -217,22 +327,19 @@ def role_required(allowed_roles):
     """
     from functools import wraps
     from flask import jsonify, request
-    from flask_jwt_extended import get_jwt_identity
-    import json
     
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             try:
-                # Get current user from JWT token
-                current_user = get_jwt_identity()
+                # Identity parsed once per request from the verified token
+                identity = get_current_identity()
                 
-                if not current_user:
+                if not identity:
                     return jsonify({'error': 'No valid token found'}), 401
                 
-                # Parse user info from token
-                user_info = json.loads(current_user)
-                user_role = user_info.get('role')
+                user_info = identity.as_dict()
+                user_role = identity.role
                 
                 if not user_role:
                     return jsonify({'error': 'No role information in token'}), 401
@@ -254,8 +361,6 @@ def role_required(allowed_roles):
                 request.user_info = user_info
                 
                 return f(*args, **kwargs)
-            except json.JSONDecodeError:
-                return jsonify({'error': 'Invalid token format'}), 401
             except Exception as e:
                 return jsonify({'error': 'Authentication failed', 'details': str(e)}), 401
         decorated_function.__name__ = f.__name__
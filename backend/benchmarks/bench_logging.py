@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request cost of request logging.
+
+Times the logging middleware's work for one request, inside a request
+context: the old start and end records written by synchronous loguru
+handlers, against the single access record handed to the background
+writer. Both log to stdout (redirected to /dev/null) and to a rotating file.
+The last scenarios slow every stdout write down, as a full pipe to a log
+collector does.
+
+Usage:
+    python -m benchmarks.bench_logging [--iterations 20000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+from flask import Flask, g, request
+from loguru import logger
+
+from benchmarks.common import time_call, print_results
+from utils.logger import get_log_pipeline, log_request_end, log_request_start, setup_logger
+
+
+class SlowStream:
+    """Stream whose writes each take ``delay`` seconds."""
+
+    def __init__(self, stream, delay):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, text):
+        time.sleep(self.delay)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def legacy_request_logging():
+    """The removed start and end records."""
+    g.request_id = str(uuid.uuid4())[:8]
+    g.request_start_time = time.time()
+    logger.info("Request started", extra={
+        "method": request.method,
+        "path": request.path,
+        "remote_addr": request.remote_addr,
+        "user_agent": request.headers.get("User-Agent", ""),
+    })
+    logger.info("Request completed", extra={
+        "method": request.method,
+        "path": request.path,
+        "status_code": 200,
+        "duration_ms": round((time.time() - g.request_start_time) * 1000, 2),
+    })
+
+
+def access_record():
+    log_request_start()
+    g.response_status = 200
+    log_request_end()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--slow-write-ms', type=float, default=1.0)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    stdout = sys.stdout
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull, \
+            app.test_request_context('/api/properties', headers={'User-Agent': 'bench'}):
+        sys.stdout = devnull
+        try:
+            for json_output in (False, True):
+                fmt = 'json' if json_output else 'text'
+                log_file = os.path.join(directory, f'{fmt}.log')
+
+                setup_logger(json_output=json_output, log_file=log_file, async_output=False)
+                results[f'{fmt}: sync, start + end records'] = time_call(
+                    legacy_request_logging, args.iterations, warmup=100)
+                results[f'{fmt}: sync, one access record'] = time_call(
+                    access_record, args.iterations, warmup=100)
+
+                # Queue large enough that nothing is dropped while measuring
+                setup_logger(json_output=json_output, log_file=log_file,
+                             queue_options={'max_queue': args.iterations * 4})
+                results[f'{fmt}: async, one access record'] = time_call(
+                    access_record, args.iterations, warmup=100)
+                stats = get_log_pipeline().stats()
+                assert stats['dropped'] == 0, stats
+
+            sys.stdout = SlowStream(devnull, args.slow_write_ms / 1000)
+            label = f'slow stdout ({args.slow_write_ms:g} ms/write)'
+            setup_logger(async_output=False)
+            results[f'{label}: sync, start + end'] = time_call(
+                legacy_request_logging, args.iterations // 20, warmup=10)
+            setup_logger(queue_options={'max_queue': args.iterations * 4})
+            results[f'{label}: async'] = time_call(
+                access_record, args.iterations // 20, warmup=10)
+        finally:
+            setup_logger(log_level='WARNING', async_output=False)
+            sys.stdout = stdout
+
+    print_results(f'Request logging, {args.iterations} requests', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /api/properties/search latency over a large listing table.
+
+Usage:
+    python -m benchmarks.bench_property_search [--rows 100000] [--iterations 200]
+"""
+import argparse
+import json
+
+from flask_jwt_extended import create_access_token
+
+from benchmarks.common import create_benchmark_app, create_landlord, seed_properties, time_call, print_results
+
+SCENARIOS = {
+    'newest (no filters)': '',
+    'price range, price_asc': 'min_price=20000&max_price=60000&sort=price_asc',
+    'type + bedrooms, price_desc': 'property_type=apartment&min_bedrooms=2&sort=price_desc',
+    'size range, size_desc': 'min_sqft=800&max_sqft=2000&sort=size_desc',
+    'amenity + location': 'amenities=Gym&location=kilimani',
+    'text search, relevance': 'q=spacious villa',
+    'text search + price filter': 'q=kilimani&max_price=50000&sort=price_asc',
+    'near, 2 km radius': 'near=-1.2921,36.8219&radius=2',
+    'bbox viewport': 'bbox=36.80,-1.30,36.84,-1.27',
+    'all filters combined': 'min_price=10000&max_price=120000&min_bedrooms=1&min_bathrooms=1'
+                            '&property_type=apartment,house&min_sqft=400&amenities=Parking&sort=newest',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    app, db = create_benchmark_app()
+    landlord = create_landlord(app, db)
+    seed_properties(app, db, landlord.id, args.rows)
+
+    token = create_access_token(identity=json.dumps({
+        'user_id': landlord.id, 'username': landlord.username, 'role': 'landlord'
+    }))
+    headers = {'Authorization': f'Bearer {token}'}
+    client = app.test_client()
+
+    results = {}
+    for name, query in SCENARIOS.items():
+        url = f'/api/properties/search?limit={args.limit}&{query}'
+
+        def call():
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200, response.data
+
+        results[name] = time_call(call, args.iterations)
+
+    print_results(f'Property search, {args.rows} rows, limit={args.limit}', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request cost of rate limiting.
+
+Compares POST /auth/validate with the limiter disabled, with the compiled
+per-endpoint policy, and with the old ``before_request`` hook that built a
+``limiter.limit(...)`` decorator on every request. Each request comes from
+a different client address so no limit is reached.
+
+Usage:
+    python -m benchmarks.bench_rate_limits [--iterations 2000]
+"""
+import argparse
+import itertools
+
+from flask import request
+from flask_jwt_extended import create_access_token
+
+import middleware.security_middleware as security_middleware
+from auth.identity import TokenIdentity
+from benchmarks.common import create_benchmark_app, create_landlord, time_call, print_results
+
+
+def legacy_rate_limit_hook(app):
+    """The removed hook: match prefixes and decorate a lambda per request."""
+    limiter = app.limiter
+
+    def apply_rate_limits():
+        if request.endpoint:
+            if request.endpoint.startswith('auth.'):
+                if request.endpoint in ['auth.register', 'auth.login', 'auth.forgot_password']:
+                    limiter.limit("5 per minute")(lambda: None)()
+                else:
+                    limiter.limit("10 per minute")(lambda: None)()
+            elif request.endpoint.startswith('admin.'):
+                limiter.limit("20 per minute")(lambda: None)()
+            elif request.endpoint.startswith('api.'):
+                limiter.limit("100 per minute")(lambda: None)()
+
+    app.before_request(apply_rate_limits)
+
+
+def measure(app, db, iterations):
+    """Time POST /auth/validate from a new address each request."""
+    landlord = create_landlord(app, db)
+    token = create_access_token(identity=TokenIdentity.from_user(landlord))
+    headers = {'Authorization': f'Bearer {token}'}
+    client = app.test_client()
+    addresses = (f'10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}' for n in itertools.count(1))
+
+    def call():
+        response = client.post('/auth/validate', headers=headers,
+                               environ_base={'REMOTE_ADDR': next(addresses)})
+        assert response.status_code == 200, response.data
+
+    return time_call(call, iterations, warmup=20)
+
+
+def build_app(legacy=False):
+    """Create a benchmark app with the limiter on and the chosen policy."""
+    compiled = security_middleware.apply_rate_limit_policy
+    if legacy:
+        security_middleware.apply_rate_limit_policy = legacy_rate_limit_hook
+    try:
+        app, db = create_benchmark_app()
+    finally:
+        security_middleware.apply_rate_limit_policy = compiled
+    app.limiter.enabled = True
+    return app, db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    results = {}
+
+    app, db = build_app()
+    app.limiter.enabled = False
+    results['limiter disabled'] = measure(app, db, args.iterations)
+
+    app, db = build_app()
+    results['compiled policy'] = measure(app, db, args.iterations)
+
+    app, db = build_app(legacy=True)
+    results['per-request limiter.limit (old)'] = measure(app, db, args.iterations)
+
+    # The work the old hook added before any limit was checked
+    with app.test_request_context('/auth/validate', method='POST'):
+        results['old hook: build decorator only'] = time_call(
+            lambda: app.limiter.limit("10 per minute")(lambda: None), args.iterations)
+
+    print_results(f'POST /auth/validate, {args.iterations} requests', results)
+
+
+if __name__ == '__main__':
+    main()
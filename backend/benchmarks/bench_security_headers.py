@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request cost of the security-header middleware.
+
+Serves one small JSON response through an app that has only the header
+middleware: none at all, Flask-Talisman configured as before (a CSP nonce
+per request), and the precomputed SecurityHeaders. The Talisman row is
+skipped when the package is not installed.
+
+Usage:
+    python -m benchmarks.bench_security_headers [--iterations 20000]
+"""
+import argparse
+
+from flask import Flask, jsonify
+
+from benchmarks.common import time_call, print_results
+from middleware.security_headers import SecurityHeaders
+
+CSP = {
+    'default-src': "'self'",
+    'script-src': ["'self'", "'unsafe-inline'", "https://cdn.jsdelivr.net", "https://unpkg.com"],
+    'style-src': ["'self'", "'unsafe-inline'", "https://fonts.googleapis.com"],
+    'font-src': ["'self'", "https://fonts.gstatic.com"],
+    'img-src': ["'self'", "data:", "https:"],
+    'connect-src': ["'self'", "https://api.sentry.io"],
+    'frame-ancestors': "'none'",
+    'base-uri': "'self'",
+    'form-action': "'self'",
+}
+FEATURE_POLICY = {'geolocation': "'none'", 'microphone': "'none'", 'camera': "'none'", 'payment': "'none'"}
+
+
+def create_app(middleware=None):
+    app = Flask(__name__)
+
+    @app.route('/api/ping')
+    def ping():
+        return jsonify({'status': 'ok'})
+
+    if middleware == 'talisman':
+        from flask_talisman import Talisman
+        Talisman(app, force_https=False, content_security_policy=CSP,
+                 content_security_policy_nonce_in=['script-src', 'style-src'],
+                 feature_policy=FEATURE_POLICY)
+    elif middleware == 'precomputed':
+        SecurityHeaders(app, content_security_policy=CSP, nonce_in=['script-src', 'style-src'],
+                        feature_policy=FEATURE_POLICY, permissions_policy={'browsing-topics': '()'})
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    scenarios = {
+        'no header middleware': None,
+        'Flask-Talisman (nonce per request)': 'talisman',
+        'precomputed SecurityHeaders': 'precomputed',
+    }
+    results = {}
+    hooks = {}
+    for name, middleware in scenarios.items():
+        try:
+            app = create_app(middleware)
+        except ImportError:
+            print(f'Skipping {name}: flask_talisman is not installed')
+            continue
+        client = app.test_client()
+
+        def call():
+            response = client.get('/api/ping', headers={'X-Forwarded-Proto': 'https'})
+            assert response.status_code == 200
+
+        results[name] = time_call(call, args.iterations, warmup=100)
+
+        # The middleware's own hooks, without routing and the test client
+        with app.test_request_context('/api/ping', headers={'X-Forwarded-Proto': 'https'}):
+            response = app.make_response(({'status': 'ok'}, 200))
+
+            def run_hooks():
+                app.preprocess_request()
+                app.process_response(response)
+
+            hooks[name] = time_call(run_hooks, args.iterations, warmup=100)
+
+    print_results(f'GET JSON response, {args.iterations} requests', results)
+    print_results('before/after_request hooks only', hooks)
+
+
+if __name__ == '__main__':
+    main()
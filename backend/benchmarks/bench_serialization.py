@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark serializing a large property listing to JSON bytes.
+
+Compares the per-model ``to_dict()`` + ``jsonify`` path with the compiled
+serializers in ``utils.serialization``, both from hydrated ORM objects and
+from plain row tuples.
+
+Usage:
+    python -m benchmarks.bench_serialization [--rows 10000] [--iterations 20]
+"""
+import argparse
+
+from flask import jsonify
+
+from benchmarks.common import create_benchmark_app, create_landlord, seed_properties, time_call, print_results
+from utils.serialization import FAST_JSON, dumps, get_serializer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    app, db = create_benchmark_app()
+    landlord = create_landlord(app, db)
+    seed_properties(app, db, landlord.id, args.rows)
+
+    Property = app.Property
+    serializer = get_serializer(Property)
+
+    def load_objects():
+        # Start from an empty identity map so every run hydrates afresh
+        db.session.expunge_all()
+        return Property.query.all()
+
+    def to_dict_jsonify():
+        jsonify({'properties': [p.to_dict() for p in load_objects()]}).get_data()
+
+    def compiled_objects():
+        dumps({'properties': serializer.serialize_objects(load_objects())})
+
+    def compiled_rows():
+        rows = Property.query.with_entities(*serializer.columns).all()
+        dumps({'properties': serializer.serialize_rows(rows)})
+
+    # Encoding only, with the rows already in memory
+    objects = load_objects()
+    rows = Property.query.with_entities(*serializer.columns).all()
+
+    results = {
+        'query + to_dict() + jsonify': time_call(to_dict_jsonify, args.iterations, warmup=2),
+        'query + compiled (ORM objects)': time_call(compiled_objects, args.iterations, warmup=2),
+        'query + compiled (row tuples)': time_call(compiled_rows, args.iterations, warmup=2),
+        'encode only: to_dict() + jsonify': time_call(
+            lambda: jsonify({'properties': [p.to_dict() for p in objects]}).get_data(),
+            args.iterations, warmup=2),
+        'encode only: compiled rows + dumps': time_call(
+            lambda: dumps({'properties': serializer.serialize_rows(rows)}),
+            args.iterations, warmup=2),
+    }
+
+    encoder = 'orjson' if FAST_JSON else 'stdlib json'
+    print_results(f'Serializing {args.rows} properties ({encoder})', results)
+
+
+if __name__ == '__main__':
+    main()
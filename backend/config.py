@@ -14,6 +14,20 @@ def get_optional_env(key, default=None):
     """Get optional environment variable with default value."""
     return os.environ.get(key, default)
 
+# Accepted bcrypt costs: the commonly recommended floor, and a ceiling past
+# which one hash takes seconds
+MIN_BCRYPT_ROUNDS = 10
+MAX_BCRYPT_ROUNDS = 16
+
+def get_bcrypt_rounds_env(default="12"):
+    """Get BCRYPT_ROUNDS, raise RuntimeError if it is outside the accepted range."""
+    rounds = int(get_optional_env("BCRYPT_ROUNDS", default))
+    if not MIN_BCRYPT_ROUNDS <= rounds <= MAX_BCRYPT_ROUNDS:
+        raise RuntimeError(
+            f"BCRYPT_ROUNDS must be between {MIN_BCRYPT_ROUNDS} and {MAX_BCRYPT_ROUNDS}, got {rounds}"
+        )
+    return rounds
+
 class BaseConfig:
     """Base configuration class with common settings."""
     
@@ -31,14 +45,102 @@ class BaseConfig:
     # JWT configuration
     JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 hour
     JWT_REFRESH_TOKEN_EXPIRES = 2592000  # 30 days
+    # Accept tokens whose subject is the old JSON-encoded identity string
+    JWT_ACCEPT_LEGACY_SUBJECT = get_optional_env("JWT_ACCEPT_LEGACY_SUBJECT", "true").lower() == "true"
     
     # CORS configuration
     CORS_SUPPORTS_CREDENTIALS = True
     
+    # Pagination
+    PROPERTIES_PAGE_SIZE = int(get_optional_env("PROPERTIES_PAGE_SIZE", "20"))
+    PROPERTIES_MAX_PAGE_SIZE = int(get_optional_env("PROPERTIES_MAX_PAGE_SIZE", "100"))
+    PENDING_USERS_PAGE_SIZE = int(get_optional_env("PENDING_USERS_PAGE_SIZE", "50"))
+    PENDING_USERS_MAX_PAGE_SIZE = int(get_optional_env("PENDING_USERS_MAX_PAGE_SIZE", "200"))
+    
+    # Redis (optional): shared response cache when set
+    REDIS_URL = get_optional_env("REDIS_URL")
+    
+    # Response cache for listing endpoints
+    RESPONSE_CACHE_ENABLED = get_optional_env("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_TTL = int(get_optional_env("RESPONSE_CACHE_TTL", "30"))
+    RESPONSE_CACHE_MAX_ENTRIES = int(get_optional_env("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+    
+    # Per-route rate limit overrides, "target=limit" pairs separated by ";"
+    # where target is an endpoint (auth.login) or blueprint (properties);
+    # see DEFAULT_RATE_LIMITS in middleware/security_middleware.py
+    RATE_LIMITS = get_optional_env("RATE_LIMITS", "")
+    
+    # Addresses or CIDR ranges of our proxies; forwarding headers from
+    # anywhere else count as security events. Each event type logs at most
+    # one exemplar per SECURITY_EVENT_LOG_INTERVAL seconds
+    SECURITY_TRUSTED_PROXIES = get_optional_env(
+        "SECURITY_TRUSTED_PROXIES",
+        "127.0.0.0/8,::1/128,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16,fc00::/7"
+    )
+    SECURITY_EVENT_LOG_INTERVAL = float(get_optional_env("SECURITY_EVENT_LOG_INTERVAL", "60"))
+    
+    # Admin event streams (/auth/admin/events). They need an async worker
+    # (WORKER_CLASS=gevent) and are refused under sync gunicorn workers.
+    # Streams end after SSE_MAX_DURATION seconds and clients reconnect.
+    SSE_MAX_CONNECTIONS = int(get_optional_env("SSE_MAX_CONNECTIONS", "100"))
+    SSE_MAX_DURATION = float(get_optional_env("SSE_MAX_DURATION", "25"))
+    SSE_KEEPALIVE_SECONDS = float(get_optional_env("SSE_KEEPALIVE_SECONDS", "15"))
+    
+    # Seconds between background samples of the /healthz checks; 0 runs
+    # them inline on every request
+    HEALTH_SAMPLE_INTERVAL = float(get_optional_env("HEALTH_SAMPLE_INTERVAL", "15"))
+    
+    # Largest id list accepted by /auth/admin/bulk-approval
+    BULK_APPROVAL_MAX_IDS = int(get_optional_env("BULK_APPROVAL_MAX_IDS", "5000"))
+    
+    # Token revocation: Bloom filter sizing, how often a background thread in
+    # each worker adds new revocations from the store, and how often it prunes
+    # expired entries and rebuilds the filter
+    REVOCATION_BLOOM_CAPACITY = int(get_optional_env("REVOCATION_BLOOM_CAPACITY", "100000"))
+    REVOCATION_BLOOM_ERROR_RATE = float(get_optional_env("REVOCATION_BLOOM_ERROR_RATE", "0.001"))
+    REVOCATION_SYNC_SECONDS = float(get_optional_env("REVOCATION_SYNC_SECONDS", "5"))
+    REVOCATION_PRUNE_SECONDS = float(get_optional_env("REVOCATION_PRUNE_SECONDS", "300"))
+    
+    # Authenticated user cache. With REDIS_URL set, approvals and deletions
+    # invalidate it in every worker; otherwise the TTL bounds how long they
+    # take to reach other workers
+    USER_CACHE_TTL = float(get_optional_env("USER_CACHE_TTL", "30"))
+    USER_CACHE_MAX_ENTRIES = int(get_optional_env("USER_CACHE_MAX_ENTRIES", "1024"))
+    
+    # bcrypt cost; with BCRYPT_CALIBRATE the app picks the highest cost that
+    # hashes within BCRYPT_TARGET_MS on this machine, once, and records it in
+    # BCRYPT_CALIBRATION_FILE (instance/bcrypt_rounds by default) for later
+    # startups
+    BCRYPT_ROUNDS = get_bcrypt_rounds_env()
+    BCRYPT_CALIBRATE = get_optional_env("BCRYPT_CALIBRATE", "false").lower() == "true"
+    BCRYPT_TARGET_MS = float(get_optional_env("BCRYPT_TARGET_MS", "100"))
+    BCRYPT_CALIBRATION_FILE = get_optional_env("BCRYPT_CALIBRATION_FILE")
+    
+    # bcrypt worker processes; 0 hashes on the request thread
+    PASSWORD_POOL_WORKERS = int(get_optional_env("PASSWORD_POOL_WORKERS", "2"))
+    PASSWORD_POOL_MAX_QUEUE = int(get_optional_env("PASSWORD_POOL_MAX_QUEUE", "16"))
+    PASSWORD_POOL_TIMEOUT = float(get_optional_env("PASSWORD_POOL_TIMEOUT", "5"))
+    
     # Logging
     LOG_LEVEL = get_optional_env("LOG_LEVEL", "INFO")
     LOG_FORMAT = get_optional_env("LOG_FORMAT", "text")  # text or json
     LOG_FILE = get_optional_env("LOG_FILE", None)
+    # Log lines are written by a background thread in batches; when its
+    # queue is full, "drop" discards lines and "block" waits for space
+    LOG_ASYNC = get_optional_env("LOG_ASYNC", "true").lower() == "true"
+    LOG_QUEUE_SIZE = int(get_optional_env("LOG_QUEUE_SIZE", "10000"))
+    LOG_BATCH_SIZE = int(get_optional_env("LOG_BATCH_SIZE", "512"))
+    LOG_FLUSH_INTERVAL = float(get_optional_env("LOG_FLUSH_INTERVAL", "0.2"))
+    LOG_QUEUE_POLICY = get_optional_env("LOG_QUEUE_POLICY", "drop")
+    LOG_BLOCK_TIMEOUT = float(get_optional_env("LOG_BLOCK_TIMEOUT", "1.0"))
+    # Access records: errors and requests over REQUEST_LOG_SLOW_MS are always
+    # logged, other requests at REQUEST_LOG_SAMPLE_RATE (0-1). Rules override
+    # the rate per endpoint or blueprint ("auth=1.0;properties=0.05"), and
+    # REQUEST_LOG_UNLOGGED routes (health probes) are never logged
+    REQUEST_LOG_SAMPLE_RATE = float(get_optional_env("REQUEST_LOG_SAMPLE_RATE", "1.0"))
+    REQUEST_LOG_SAMPLE_RULES = get_optional_env("REQUEST_LOG_SAMPLE_RULES", "")
+    REQUEST_LOG_SLOW_MS = float(get_optional_env("REQUEST_LOG_SLOW_MS", "1000"))
+    REQUEST_LOG_UNLOGGED = get_optional_env("REQUEST_LOG_UNLOGGED", "health,protected.health_check")
     
     # Security settings
     FORCE_HTTPS = get_optional_env("FORCE_HTTPS", "false").lower() == "true"
@@ -87,6 +189,22 @@ class TestingConfig(BaseConfig):
     # Test database (in-memory SQLite)
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
     
+    # Keep tests on the in-process cache
+    REDIS_URL = None
+    
+    # Hash inline; tests exercise the pool directly
+    PASSWORD_POOL_WORKERS = 0
+    
+    # Check health inline rather than from a background thread
+    HEALTH_SAMPLE_INTERVAL = 0
+    
+    # Sync the revocation filter inline rather than from a background thread
+    REVOCATION_SYNC_SECONDS = 0
+    
+    # Cheapest cost bcrypt accepts, to keep the suite fast
+    BCRYPT_ROUNDS = 4
+    BCRYPT_CALIBRATE = False
+    
     # SQLite-specific engine options for testing (no pooling for in-memory)
     SQLALCHEMY_ENGINE_OPTIONS = {
         "pool_pre_ping": True,
@@ -108,6 +226,9 @@ def create_production_config():
         SESSION_COOKIE_HTTPONLY = True
         SESSION_COOKIE_SAMESITE = 'Lax'
         
+        # Log a tenth of successful requests; errors and slow ones always
+        REQUEST_LOG_SAMPLE_RATE = float(get_optional_env("REQUEST_LOG_SAMPLE_RATE", "0.1"))
+        
     # PostgreSQL connection pooling for production
     SQLALCHEMY_ENGINE_OPTIONS = {
         "pool_size": 10,
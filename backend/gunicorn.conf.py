@@ -10,11 +10,17 @@ backlog = 2048
 
 # Worker processes
 workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
-worker_class = os.environ.get('WORKER_CLASS', 'sync')
+# gevent so admin event streams wait without holding a worker
+worker_class = os.environ.get('WORKER_CLASS', 'gevent')
 worker_connections = int(os.environ.get('WORKER_CONNECTIONS', '1000'))
 max_requests = int(os.environ.get('MAX_REQUESTS', '1000'))
 max_requests_jitter = int(os.environ.get('MAX_REQUESTS_JITTER', '100'))
 
+if worker_class == 'gevent':
+    # Patch before the app is preloaded, so its threads and sockets cooperate
+    from gevent import monkey
+    monkey.patch_all()
+
 # Timeout settings
 timeout = int(os.environ.get('TIMEOUT', '30'))
 keepalive = int(os.environ.get('KEEPALIVE', '2'))
@@ -14,7 +14,8 @@ from flask_migrate import init, migrate, upgrade, downgrade, current, history
 from sqlalchemy import text
 from app import create_app, db
 from models.user import create_user_model, UserRole
-from auth.utils import hash_password
+from auth.refresh_tokens import compact_refresh_tokens as compact_refresh_token_families
+from auth.utils import bcrypt_calibration_path, calibrate_bcrypt_rounds, hash_password, record_calibrated_rounds
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -315,5 +316,34 @@ def delete_user(user_id, email, username, force):
         click.echo(f"❌ Error deleting user: {e}")
         sys.exit(1)
 
+@cli.command()
+@click.option('--target-ms', default=100.0, show_default=True, help='Time budget for one hash')
+@click.option('--save', is_flag=True, help='Record the cost for startups with BCRYPT_CALIBRATE=true')
+@with_appcontext
+def calibrate_bcrypt(target_ms, save):
+    """Print the bcrypt cost that fits the time budget on this machine."""
+    from flask import current_app
+    rounds = calibrate_bcrypt_rounds(target_ms)
+    click.echo(f"🔐 Recommended BCRYPT_ROUNDS for {target_ms:g} ms: {rounds}")
+    if save:
+        path = bcrypt_calibration_path(current_app)
+        record_calibrated_rounds(path, rounds)
+        click.echo(f"   Recorded in {path}")
+    else:
+        click.echo("   Set BCRYPT_ROUNDS, or use --save with BCRYPT_CALIBRATE=true")
+
+@cli.command()
+@click.option('--batch-size', default=1000, show_default=True, help='Rows deleted per statement')
+@with_appcontext
+def compact_refresh_tokens(batch_size):
+    """Delete expired and revoked refresh-token families."""
+    try:
+        deleted = compact_refresh_token_families(batch_size=batch_size)
+        click.echo(f"✅ Removed {deleted} expired or revoked refresh-token families")
+    except Exception as e:
+        logger.error(f"Failed to compact refresh tokens: {e}")
+        click.echo(f"❌ Error compacting refresh tokens: {e}")
+        sys.exit(1)
+
 if __name__ == '__main__':
     cli()
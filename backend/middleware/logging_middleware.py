@@ -1,30 +1,143 @@
 """
 Request/response logging middleware for Flask.
 """
-import time
+import random
+from typing import Dict, Iterable, Mapping, Optional
+
 from flask import g, request, jsonify
-from utils.logger import log_request_start, log_request_end, log_error
+from loguru import logger
+from werkzeug.exceptions import HTTPException
+from utils.logger import log_request_start, log_request_end, log_error, request_duration_ms
+
+# Endpoints or blueprints never given an access record: load balancer and
+# keep-alive probes, and metrics scrapes
+DEFAULT_UNLOGGED = ('health', 'protected.health_check')
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """
+    Parse REQUEST_LOG_SAMPLE_RULES overrides.
+    
+    Args:
+        value: Semicolon-separated ``target=rate`` pairs, e.g.
+               ``auth=1.0;properties.search_properties=0.01``
+    
+    Returns:
+        dict: Sample rates between 0 and 1 keyed by endpoint or blueprint
+    """
+    rates = {}
+    for entry in (value or '').split(';'):
+        if not entry.strip():
+            continue
+        target, separator, rate = entry.partition('=')
+        if not separator or not target.strip():
+            raise ValueError(f"Invalid REQUEST_LOG_SAMPLE_RULES entry: {entry!r}")
+        try:
+            rates[target.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            raise ValueError(f"Invalid REQUEST_LOG_SAMPLE_RULES rate: {entry!r}") from None
+    return rates
+
+
+class RequestLogPolicy:
+    """
+    Decides which requests get an access record, and at what level.
+    
+    Server errors are logged at ERROR, client errors and slow requests at
+    WARNING, always. Other requests are logged at INFO for a sampled share,
+    set per endpoint or blueprint with ``sample_rate`` as the fallback.
+    Unlogged routes get no record at all.
+    
+    Args:
+        sample_rate: Share of successful requests logged by default
+        rules: Sample rates keyed by endpoint or blueprint
+        slow_ms: Duration from which a request counts as slow
+        unlogged: Endpoints or blueprints never logged
+        log_level: Lowest level the logger writes
+    """
+    
+    def __init__(self, sample_rate: float = 1.0, rules: Optional[Mapping[str, float]] = None,
+                 slow_ms: float = 1000, unlogged: Iterable[str] = DEFAULT_UNLOGGED,
+                 log_level: str = 'INFO'):
+        self.sample_rate = sample_rate
+        self.rules = dict(rules or {})
+        self.slow_ms = slow_ms
+        self.unlogged = frozenset(unlogged)
+        min_level = logger.level(log_level.upper()).no
+        self._enabled = {name: logger.level(name).no >= min_level for name in ('INFO', 'WARNING', 'ERROR')}
+        # Resolved per endpoint on first use; endpoints are registered
+        # after this middleware
+        self._rates: Dict[Optional[str], float] = {}
+    
+    def _resolve(self, endpoint: Optional[str]) -> float:
+        blueprint = endpoint.rpartition('.')[0] if endpoint else ''
+        if endpoint in self.unlogged or blueprint in self.unlogged:
+            return -1.0
+        if endpoint in self.rules:
+            return self.rules[endpoint]
+        return self.rules.get(blueprint, self.sample_rate)
+    
+    def level_for(self, endpoint: Optional[str], status_code: int, duration_ms: float) -> Optional[str]:
+        """
+        Return the level to log the request at, or None to skip it.
+        """
+        rate = self._rates.get(endpoint)
+        if rate is None:
+            rate = self._rates[endpoint] = self._resolve(endpoint)
+        if rate < 0:
+            return None
+        if status_code >= 500:
+            level = 'ERROR'
+        elif status_code >= 400 or duration_ms >= self.slow_ms:
+            level = 'WARNING'
+        elif rate >= 1.0 or random.random() < rate:
+            level = 'INFO'
+        else:
+            return None
+        return level if self._enabled[level] else None
+
+
+def create_request_log_policy(config: Mapping) -> RequestLogPolicy:
+    """Build the request log policy described by the app config."""
+    unlogged = [target.strip() for target in config.get('REQUEST_LOG_UNLOGGED', ','.join(DEFAULT_UNLOGGED)).split(',')]
+    return RequestLogPolicy(
+        sample_rate=float(config.get('REQUEST_LOG_SAMPLE_RATE', 1.0)),
+        rules=parse_sample_rates(config.get('REQUEST_LOG_SAMPLE_RULES', '')),
+        slow_ms=float(config.get('REQUEST_LOG_SLOW_MS', 1000)),
+        unlogged=[target for target in unlogged if target],
+        log_level=config.get('LOG_LEVEL', 'INFO'),
+    )
 
 
 def setup_logging_middleware(app):
     """Setup request/response logging middleware."""
+    app.request_log_policy = create_request_log_policy(app.config)
     
     @app.before_request
     def before_request():
-        """Log request start."""
+        """Assign the request id and start the request timer."""
         log_request_start()
     
     @app.after_request
     def after_request(response):
-        """Log request completion."""
+        """Log completion of requests the policy selects."""
         if hasattr(g, "request_start_time"):
-            g.response_status = response.status_code
-            log_request_end()
+            response.headers.setdefault("X-Request-ID", g.request_id)
+            duration_ms = request_duration_ms()
+            level = app.request_log_policy.level_for(request.endpoint, response.status_code, duration_ms)
+            if level:
+                g.response_status = response.status_code
+                log_request_end(level, duration_ms)
         return response
     
     @app.errorhandler(Exception)
     def handle_exception(error):
         """Log unhandled exceptions."""
+        # HTTP errors without their own handler (e.g. 429 from the rate
+        # limiter) keep their status
+        if isinstance(error, HTTPException):
+            return error
+        
         log_error(error, {
             "handler": "global_exception_handler",
         })
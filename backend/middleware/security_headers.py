@@ -0,0 +1,123 @@
+"""
+Security response headers with the header set built once at startup.
+
+This replaces Flask-Talisman, which rebuilt every policy string and drew a
+CSP nonce on each request. Almost every response here is JSON, which never
+runs scripts, so its headers never change. They are serialized once, and
+each response gets them with one ``headers.update``. Only HTML responses
+carry a nonce: it is drawn on first use through ``csp_nonce()`` in
+templates, or when the response goes out.
+"""
+import secrets
+from typing import Dict, Iterable, Mapping, Optional, Union
+
+from flask import Flask, redirect, request
+
+# Placeholder for the per-response nonce in the HTML policy template
+_NONCE = '{nonce}'
+
+Policy = Mapping[str, Union[str, Iterable[str]]]
+
+
+def serialize_policy(policy: Policy, nonce_in: Iterable[str] = ()) -> str:
+    """
+    Serialize a CSP-style policy, e.g. ``default-src 'self'; img-src https:``.
+
+    Args:
+        policy: Sources keyed by directive
+        nonce_in: Directives that get the nonce placeholder appended
+    """
+    nonce_in = set(nonce_in)
+    parts = []
+    for directive, sources in policy.items():
+        value = sources if isinstance(sources, str) else ' '.join(sources)
+        part = f'{directive} {value}'
+        if directive in nonce_in:
+            part += f" 'nonce-{_NONCE}'"
+        parts.append(part)
+    return '; '.join(parts)
+
+
+class SecurityHeaders:
+    """
+    Precomputed security headers for every response.
+
+    Args:
+        app: Flask application
+        content_security_policy: CSP directives
+        nonce_in: Directives that carry a nonce on HTML responses
+        force_https: Redirect plain-HTTP requests, except in debug mode
+        force_https_permanent: Redirect with 301 instead of 302
+        strict_transport_security: Send HSTS on HTTPS requests
+        strict_transport_security_max_age: HSTS max-age in seconds
+        strict_transport_security_include_subdomains: Add includeSubDomains
+        referrer_policy: Referrer-Policy value
+        feature_policy: Feature-Policy directives
+        permissions_policy: Permissions-Policy entries
+        frame_options: X-Frame-Options value
+    """
+
+    def __init__(self, app: Flask, content_security_policy: Policy, nonce_in: Iterable[str] = (),
+                 force_https: bool = False, force_https_permanent: bool = False,
+                 strict_transport_security: bool = True, strict_transport_security_max_age: int = 31536000,
+                 strict_transport_security_include_subdomains: bool = True,
+                 referrer_policy: str = 'strict-origin-when-cross-origin',
+                 feature_policy: Optional[Policy] = None,
+                 permissions_policy: Optional[Mapping[str, str]] = None,
+                 frame_options: str = 'SAMEORIGIN'):
+        headers: Dict[str, str] = {}
+        if feature_policy:
+            headers['Feature-Policy'] = serialize_policy(feature_policy)
+        if permissions_policy:
+            headers['Permissions-Policy'] = ', '.join(f'{key}={value}' for key, value in permissions_policy.items())
+        if frame_options:
+            headers['X-Frame-Options'] = frame_options
+        headers['X-Content-Type-Options'] = 'nosniff'
+        headers['Content-Security-Policy'] = serialize_policy(content_security_policy)
+        headers['Referrer-Policy'] = referrer_policy
+
+        secure_headers = dict(headers)
+        if strict_transport_security:
+            hsts = f'max-age={strict_transport_security_max_age}'
+            if strict_transport_security_include_subdomains:
+                hsts += '; includeSubDomains'
+            secure_headers['Strict-Transport-Security'] = hsts
+
+        # Indexed by whether the request arrived over HTTPS
+        self.api_headers = (headers, secure_headers)
+        self.html_csp = serialize_policy(content_security_policy, nonce_in)
+        self.force_https_permanent = force_https_permanent
+
+        # Set once here rather than on every request
+        if not app.debug:
+            app.config['SESSION_COOKIE_SECURE'] = True
+        app.config['SESSION_COOKIE_HTTPONLY'] = True
+        app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+
+        app.jinja_env.globals['csp_nonce'] = csp_nonce
+        if force_https and not app.debug:
+            app.before_request(self._force_https)
+        app.after_request(self._set_headers)
+
+    @staticmethod
+    def _is_secure() -> bool:
+        return request.is_secure or request.headers.get('X-Forwarded-Proto') == 'https'
+
+    def _force_https(self):
+        if not self._is_secure() and request.url.startswith('http://'):
+            return redirect(request.url.replace('http://', 'https://', 1),
+                            code=301 if self.force_https_permanent else 302)
+
+    def _set_headers(self, response):
+        response.headers.update(self.api_headers[self._is_secure()])
+        if response.mimetype == 'text/html':
+            response.headers['Content-Security-Policy'] = self.html_csp.replace(_NONCE, csp_nonce())
+        return response
+
+
+def csp_nonce() -> str:
+    """The nonce of the current request, drawn on first use."""
+    nonce = getattr(request, 'csp_nonce', None)
+    if nonce is None:
+        nonce = request.csp_nonce = secrets.token_urlsafe(24)
+    return nonce
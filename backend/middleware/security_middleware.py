@@ -2,14 +2,65 @@
 Security middleware configuration for Flask.
 """
 import os
+from typing import Dict, Iterable, Mapping
+
 from flask import Flask, request, jsonify
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from flask_talisman import Talisman
-from utils.logger import get_logger, log_security_event
+from middleware.security_headers import SecurityHeaders
+from utils.logger import get_logger
+from utils.security_events import DEFAULT_TRUSTED_PROXIES, SecurityEventCounter, TrustedProxies
 
 logger = get_logger(__name__)
 
+# User-Agent product tokens of command-line and library HTTP clients
+SCRIPTED_USER_AGENTS = frozenset({'curl', 'wget', 'python-requests'})
+
+# Headers that claim a forwarded client address
+PROXY_HEADERS = ('X-Forwarded-For', 'X-Real-IP', 'X-Originating-IP')
+
+
+# Per-route limits, keyed by endpoint ("auth.login") or blueprint ("auth").
+# The most specific key wins; the limiter's default limits apply on top.
+DEFAULT_RATE_LIMITS = {
+    # Sensitive auth operations
+    'auth.register': '5 per minute',
+    'auth.login': '5 per minute',
+    # Admin review endpoints
+    'auth.get_pending_users': '20 per minute',
+    'auth.approve_user': '20 per minute',
+    'auth.reject_user': '20 per minute',
+    'auth.bulk_approval': '20 per minute',
+    'auth.admin_events': '20 per minute',
+    'protected.admin_dashboard': '20 per minute',
+    # Everything else by blueprint
+    'auth': '10 per minute',
+    'properties': '100 per minute',
+}
+
+
+def parse_rate_limits(value: str) -> Dict[str, str]:
+    """
+    Parse RATE_LIMITS overrides.
+
+    Args:
+        value: Semicolon-separated ``target=limit`` pairs, e.g.
+               ``auth.login=3 per minute;properties=200 per minute``
+
+    Returns:
+        dict: Limit strings keyed by endpoint or blueprint; an empty limit
+              removes that rule, falling back to the blueprint's
+    """
+    rules = {}
+    for entry in (value or '').split(';'):
+        if not entry.strip():
+            continue
+        target, separator, limit = entry.partition('=')
+        if not separator or not target.strip():
+            raise ValueError(f"Invalid RATE_LIMITS entry: {entry!r}")
+        rules[target.strip()] = limit.strip()
+    return rules
+
 
 def setup_rate_limiting(app: Flask) -> None:
     """Setup rate limiting with Redis backend if available."""
@@ -33,36 +84,54 @@ def setup_rate_limiting(app: Flask) -> None:
         limiter.init_app(app)
         logger.warning("Rate limiting configured with in-memory storage (not suitable for production)")
     
-    # Register rate limit decorators
+    # Per-route limits are registered by apply_rate_limit_policy once the
+    # blueprints exist
     app.limiter = limiter
+
+
+def compile_rate_limit_policy(endpoints: Iterable[str], rules: Mapping[str, str]) -> Dict[str, str]:
+    """
+    Resolve ``rules`` into one limit per endpoint.
+
+    Args:
+        endpoints: Registered endpoint names
+        rules: Limits keyed by endpoint or blueprint name
+
+    Returns:
+        dict: Limit string per endpoint that has one
+    """
+    policy = {}
+    for endpoint in endpoints:
+        blueprint = endpoint.rpartition('.')[0]
+        limit = rules.get(endpoint) or rules.get(blueprint)
+        if limit:
+            policy[endpoint] = limit
+    return policy
+
+
+def apply_rate_limit_policy(app: Flask) -> None:
+    """
+    Register the per-route limits with the limiter.
+
+    Runs once after the blueprints are registered. Each view function is
+    wrapped with ``limiter.limit``, so requests only pay for Flask-Limiter's
+    own lookup; nothing is matched or built per request.
+    """
+    rules = dict(DEFAULT_RATE_LIMITS)
+    rules.update(parse_rate_limits(app.config.get('RATE_LIMITS', '')))
+    policy = compile_rate_limit_policy(app.view_functions, rules)
     
-    # Apply rate limits to specific routes
-    app.before_request(lambda: apply_rate_limits(app, limiter))
-
-
-def apply_rate_limits(app: Flask, limiter: Limiter) -> None:
-    """Apply rate limits based on route patterns."""
-    if request.endpoint:
-        # Authentication endpoints
-        if request.endpoint.startswith('auth.'):
-            if request.endpoint in ['auth.register', 'auth.login', 'auth.forgot_password']:
-                # Stricter limits for sensitive auth operations
-                limiter.limit("5 per minute")(lambda: None)()
-            else:
-                # Standard limits for other auth endpoints
-                limiter.limit("10 per minute")(lambda: None)()
-        
-        # Admin endpoints
-        elif request.endpoint.startswith('admin.'):
-            limiter.limit("20 per minute")(lambda: None)()
-        
-        # API endpoints
-        elif request.endpoint.startswith('api.'):
-            limiter.limit("100 per minute")(lambda: None)()
+    for endpoint, limit in policy.items():
+        app.view_functions[endpoint] = app.limiter.limit(limit, override_defaults=False)(
+            app.view_functions[endpoint]
+        )
+    
+    app.rate_limit_policy = policy
+    logger.info(f"Rate limits applied to {len(policy)} endpoints")
 
 
 def setup_security_headers(app: Flask) -> None:
-    """Setup security headers using Flask-Talisman."""
+    """Setup security headers, precomputed for JSON API responses."""
     
     # Content Security Policy
     csp = {
@@ -96,26 +165,27 @@ def setup_security_headers(app: Flask) -> None:
         'form-action': "'self'"
     }
     
-    # Initialize Talisman with security headers
-    Talisman(
+    # Headers are built once; only HTML responses get a per-request nonce
+    SecurityHeaders(
         app,
+        content_security_policy=csp,
+        nonce_in=['script-src', 'style-src'],
         force_https=app.config.get('FORCE_HTTPS', False),
         force_https_permanent=app.config.get('FORCE_HTTPS_PERMANENT', False),
         strict_transport_security=app.config.get('STRICT_TRANSPORT_SECURITY', True),
         strict_transport_security_max_age=app.config.get('STRICT_TRANSPORT_SECURITY_MAX_AGE', 31536000),
         strict_transport_security_include_subdomains=app.config.get('STRICT_TRANSPORT_SECURITY_INCLUDE_SUBDOMAINS', True),
-        content_security_policy=csp,
-        content_security_policy_nonce_in=['script-src', 'style-src'],
         referrer_policy=app.config.get('REFERRER_POLICY', 'strict-origin-when-cross-origin'),
         feature_policy={
             'geolocation': "'none'",
             'microphone': "'none'",
             'camera': "'none'",
             'payment': "'none'"
-        }
+        },
+        permissions_policy={'browsing-topics': '()'}
     )
     
-    logger.info("Security headers configured with Flask-Talisman")
+    logger.info("Security headers configured")
 
 
 def setup_csrf_protection(app: Flask) -> None:
@@ -168,34 +238,46 @@ def setup_security_middleware(app: Flask) -> None:
 
 
 def setup_security_logging(app: Flask) -> None:
-    """Setup security event logging."""
+    """
+    Setup security event counting.
+    
+    Events are aggregated in ``app.security_events`` and logged as
+    rate-limited exemplars; forwarding headers are only an event when they
+    come from outside SECURITY_TRUSTED_PROXIES.
+    """
+    events = SecurityEventCounter(app.config.get('SECURITY_EVENT_LOG_INTERVAL', 60.0))
+    trusted = TrustedProxies(app.config.get('SECURITY_TRUSTED_PROXIES', DEFAULT_TRUSTED_PROXIES).split(','))
+    app.security_events = events
     
     @app.before_request
-    def log_security_events():
-        """Log potential security events."""
-        # Log suspicious requests
-        if request.headers.get('User-Agent', '').lower() in ['curl', 'wget', 'python-requests']:
-            log_security_event('suspicious_user_agent', {
-                'user_agent': request.headers.get('User-Agent'),
+    def detect_security_events():
+        """Count potential security events."""
+        headers = request.headers
+        
+        # Scripted clients, by the product token of the User-Agent
+        agent = headers.get('User-Agent', '')
+        if agent.partition('/')[0].lower() in SCRIPTED_USER_AGENTS:
+            events.record('suspicious_user_agent', {
+                'user_agent': agent,
                 'path': request.path
             })
         
-        # Log requests with unusual headers
-        suspicious_headers = ['X-Forwarded-For', 'X-Real-IP', 'X-Originating-IP']
-        for header in suspicious_headers:
-            if header in request.headers:
-                log_security_event('proxy_header_detected', {
-                    'header': header,
-                    'value': request.headers[header],
-                    'path': request.path
-                })
+        # Forwarding headers are normal from our own proxies
+        if not trusted.is_trusted(request.remote_addr):
+            for header in PROXY_HEADERS:
+                if header in headers:
+                    events.record('untrusted_proxy_header', {
+                        'header': header,
+                        'value': headers[header],
+                        'path': request.path
+                    })
+                    break
     
     @app.after_request
-    def log_security_responses(response):
-        """Log security-related responses."""
-        # Log 4xx and 5xx responses
+    def count_error_responses(response):
+        """Count 4xx and 5xx responses by status code."""
         if response.status_code >= 400:
-            log_security_event('error_response', {
+            events.record(f'error_response:{response.status_code}', {
                 'status_code': response.status_code,
                 'path': request.path,
                 'method': request.method
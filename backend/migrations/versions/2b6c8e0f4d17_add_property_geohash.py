@@ -0,0 +1,73 @@
+"""Add geohash column and index to properties for spatial queries
+
+Revision ID: 2b6c8e0f4d17
+Revises: 9d47f1a6e2b8
+Create Date: 2026-10-16 13:41:19.250637
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b6c8e0f4d17'
+down_revision = '9d47f1a6e2b8'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the encoder at this revision, so replaying the migration
+# never depends on later changes to the app's geo helpers
+GEOHASH_PRECISION = 9
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # geohash interleaves bits starting with longitude
+
+    while len(chars) < precision:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def upgrade():
+    with op.batch_alter_table('properties', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('geohash', sa.String(length=12), nullable=True))
+        batch_op.create_index('ix_properties_geohash', ['geohash'], unique=False,
+                              postgresql_ops={'geohash': 'text_pattern_ops'})
+
+    # Backfill existing rows that have coordinates
+    connection = op.get_bind()
+    rows = connection.execute(sa.text(
+        "SELECT id, latitude, longitude FROM properties "
+        "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+    )).fetchall()
+    for row in rows:
+        connection.execute(
+            sa.text("UPDATE properties SET geohash = :geohash WHERE id = :id"),
+            {'geohash': encode_geohash(row.latitude, row.longitude), 'id': row.id}
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('properties', schema=None) as batch_op:
+        batch_op.drop_index('ix_properties_geohash')
+        batch_op.drop_column('geohash')
@@ -0,0 +1,28 @@
+"""Add collection_versions counters for listing ETags
+
+Revision ID: 3c8d2a6f9e14
+Revises: 7f3a1c9d5b20
+Create Date: 2026-10-16 16:10:52.604117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c8d2a6f9e14'
+down_revision = '7f3a1c9d5b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('collection_versions',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('collection_versions')
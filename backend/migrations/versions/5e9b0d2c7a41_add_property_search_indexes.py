@@ -0,0 +1,29 @@
+"""Add composite indexes for property search filters and sorts
+
+Revision ID: 5e9b0d2c7a41
+Revises: c1a2e7b3d904
+Create Date: 2026-10-16 10:03:55.402311
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9b0d2c7a41'
+down_revision = 'c1a2e7b3d904'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('properties', schema=None) as batch_op:
+        batch_op.create_index('ix_properties_available_price_id', ['available', 'price', 'id'], unique=False)
+        batch_op.create_index('ix_properties_available_square_feet_id', ['available', 'square_feet', 'id'], unique=False)
+        batch_op.create_index('ix_properties_available_type_price_id', ['available', 'property_type', 'price', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('properties', schema=None) as batch_op:
+        batch_op.drop_index('ix_properties_available_type_price_id')
+        batch_op.drop_index('ix_properties_available_square_feet_id')
+        batch_op.drop_index('ix_properties_available_price_id')
@@ -0,0 +1,108 @@
+"""Move property amenities and images from JSON text columns into tables
+
+Revision ID: 7f3a1c9d5b20
+Revises: 2b6c8e0f4d17
+Create Date: 2026-10-16 15:02:47.318204
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7f3a1c9d5b20'
+down_revision = '2b6c8e0f4d17'
+branch_labels = None
+depends_on = None
+
+
+def _load_list(value):
+    """Decode a legacy JSON list column, treating bad data as empty."""
+    try:
+        items = json.loads(value) if value else []
+    except ValueError:
+        return []
+    return items if isinstance(items, list) else []
+
+
+def _drop_properties_column(name):
+    # SQLite batch mode rebuilds the table, which would drop the FTS
+    # triggers; SQLite 3.35+ can drop a plain column in place
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(f'ALTER TABLE properties DROP COLUMN {name}')
+    else:
+        op.drop_column('properties', name)
+
+
+def upgrade():
+    op.create_table('property_amenities',
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('amenity', sa.String(length=100), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('property_id', 'amenity')
+    )
+    op.create_index('ix_property_amenities_amenity_property_id', 'property_amenities',
+                    ['amenity', 'property_id'], unique=False)
+    op.create_table('property_images',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('url', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('property_id', 'position', name='uq_property_images_property_id_position')
+    )
+
+    # Copy the JSON arrays into the new tables
+    connection = op.get_bind()
+    rows = connection.execute(sa.text(
+        "SELECT id, amenities, images FROM properties "
+        "WHERE amenities IS NOT NULL OR images IS NOT NULL"
+    )).fetchall()
+    for row in rows:
+        amenities = []
+        for amenity in _load_list(row.amenities):
+            amenity = str(amenity).strip()
+            if amenity and amenity not in amenities:
+                amenities.append(amenity)
+        for position, amenity in enumerate(amenities):
+            connection.execute(
+                sa.text("INSERT INTO property_amenities (property_id, amenity, position) "
+                        "VALUES (:property_id, :amenity, :position)"),
+                {'property_id': row.id, 'amenity': amenity, 'position': position}
+            )
+        for position, url in enumerate(url for url in _load_list(row.images) if url):
+            connection.execute(
+                sa.text("INSERT INTO property_images (property_id, position, url) "
+                        "VALUES (:property_id, :position, :url)"),
+                {'property_id': row.id, 'position': position, 'url': str(url)}
+            )
+
+    _drop_properties_column('amenities')
+    _drop_properties_column('images')
+
+
+def downgrade():
+    op.add_column('properties', sa.Column('amenities', sa.Text(), nullable=True))
+    op.add_column('properties', sa.Column('images', sa.Text(), nullable=True))
+
+    connection = op.get_bind()
+    for column, source, value in (('amenities', 'property_amenities', 'amenity'),
+                                  ('images', 'property_images', 'url')):
+        values = {}
+        for row in connection.execute(sa.text(
+            f"SELECT property_id, {value} AS value FROM {source} ORDER BY property_id, position"
+        )):
+            values.setdefault(row.property_id, []).append(row.value)
+        for property_id, items in values.items():
+            connection.execute(
+                sa.text(f"UPDATE properties SET {column} = :items WHERE id = :id"),
+                {'items': json.dumps(items), 'id': property_id}
+            )
+
+    op.drop_table('property_images')
+    op.drop_index('ix_property_amenities_amenity_property_id', table_name='property_amenities')
+    op.drop_table('property_amenities')
@@ -0,0 +1,71 @@
+"""Add trigram (PostgreSQL) or FTS5 (SQLite) text search on properties
+
+Revision ID: 9d47f1a6e2b8
+Revises: 5e9b0d2c7a41
+Create Date: 2026-10-16 11:26:08.733915
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9d47f1a6e2b8'
+down_revision = '5e9b0d2c7a41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_properties_name_trgm ON properties USING gin (name gin_trgm_ops)")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_properties_location_trgm ON properties USING gin (location gin_trgm_ops)")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_properties_description_trgm ON properties USING gin (description gin_trgm_ops)")
+
+    elif dialect == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS properties_fts USING fts5(
+                name, location, description,
+                content='properties', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS properties_fts_ai AFTER INSERT ON properties BEGIN
+                INSERT INTO properties_fts(rowid, name, location, description)
+                VALUES (new.id, new.name, new.location, new.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS properties_fts_ad AFTER DELETE ON properties BEGIN
+                INSERT INTO properties_fts(properties_fts, rowid, name, location, description)
+                VALUES ('delete', old.id, old.name, old.location, old.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS properties_fts_au AFTER UPDATE OF name, location, description ON properties BEGIN
+                INSERT INTO properties_fts(properties_fts, rowid, name, location, description)
+                VALUES ('delete', old.id, old.name, old.location, old.description);
+                INSERT INTO properties_fts(rowid, name, location, description)
+                VALUES (new.id, new.name, new.location, new.description);
+            END
+        """)
+        # Index the rows that already exist
+        op.execute("INSERT INTO properties_fts(properties_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_properties_description_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_properties_location_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_properties_name_trgm")
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS properties_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS properties_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS properties_fts_ai")
+        op.execute("DROP TABLE IF EXISTS properties_fts")
@@ -0,0 +1,40 @@
+"""Add refresh_token_families for refresh-token rotation
+
+Revision ID: b6e2f9a4d318
+Revises: 8a5d3e1f7c62
+Create Date: 2026-10-17 00:21:36.270514
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e2f9a4d318'
+down_revision = '8a5d3e1f7c62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('refresh_token_families',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('current_jti', sa.String(length=36), nullable=False),
+    sa.Column('generation', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_refresh_token_families_current_jti'), 'refresh_token_families', ['current_jti'], unique=True)
+    op.create_index(op.f('ix_refresh_token_families_user_id'), 'refresh_token_families', ['user_id'], unique=False)
+    op.create_index(op.f('ix_refresh_token_families_expires_at'), 'refresh_token_families', ['expires_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_refresh_token_families_expires_at'), table_name='refresh_token_families')
+    op.drop_index(op.f('ix_refresh_token_families_user_id'), table_name='refresh_token_families')
+    op.drop_index(op.f('ix_refresh_token_families_current_jti'), table_name='refresh_token_families')
+    op.drop_table('refresh_token_families')
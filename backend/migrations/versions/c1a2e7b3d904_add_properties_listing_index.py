@@ -0,0 +1,25 @@
+"""Add composite index for keyset pagination of property listings
+
+Revision ID: c1a2e7b3d904
+Revises: a3f8ea840be5
+Create Date: 2026-10-16 09:12:40.118204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c1a2e7b3d904'
+down_revision = 'a3f8ea840be5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('properties', schema=None) as batch_op:
+        batch_op.create_index('ix_properties_available_created_at_id', ['available', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('properties', schema=None) as batch_op:
+        batch_op.drop_index('ix_properties_available_created_at_id')
@@ -0,0 +1,25 @@
+"""Add composite index for the pending-user approval queue
+
+Revision ID: d4c7a1e8b592
+Revises: b6e2f9a4d318
+Create Date: 2026-10-17 01:04:18.552930
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4c7a1e8b592'
+down_revision = 'b6e2f9a4d318'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_approval_status_created_at_id', ['approval_status', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_approval_status_created_at_id')
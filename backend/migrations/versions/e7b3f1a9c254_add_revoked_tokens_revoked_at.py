@@ -0,0 +1,30 @@
+"""Add revoked_at to revoked_tokens for incremental revocation sync
+
+Revision ID: e7b3f1a9c254
+Revises: d4c7a1e8b592
+Create Date: 2026-10-17 02:41:36.207815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3f1a9c254'
+down_revision = 'd4c7a1e8b592'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows count as revoked now; the next sync of every worker
+    # picks them up again, which is harmless
+    with op.batch_alter_table('revoked_tokens', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False))
+        batch_op.create_index(batch_op.f('ix_revoked_tokens_revoked_at'), ['revoked_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('revoked_tokens', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_revoked_tokens_revoked_at'))
+        batch_op.drop_column('revoked_at')
@@ -0,0 +1,27 @@
+# Global variable to store the CollectionVersion model
+_collection_version_model = None
+
+def create_collection_version_model(db):
+    """Create the CollectionVersion model dynamically to avoid circular imports."""
+    global _collection_version_model
+    
+    if _collection_version_model is not None:
+        return _collection_version_model
+    
+    class CollectionVersion(db.Model):
+        """Counter bumped in the same transaction as every write to a collection."""
+        __tablename__ = 'collection_versions'
+        
+        name = db.Column(db.String(100), primary_key=True)
+        version = db.Column(db.BigInteger, nullable=False, default=0)
+        
+        def __repr__(self):
+            return f'<CollectionVersion {self.name}: {self.version}>'
+    
+    _collection_version_model = CollectionVersion
+    return CollectionVersion
+
+# Create a placeholder class for imports
+class CollectionVersion:
+    """Placeholder CollectionVersion class for imports."""
+    pass
@@ -53,6 +53,13 @@ def create_lease_model(db):
             if self.updated_at is None:
                 self.updated_at = datetime.now(timezone.utc)
         
+        # Field plan for utils.serialization; keep in step with to_dict()
+        serialize_fields = (
+            'id', 'property_id', 'tenant_id', 'landlord_id', 'monthly_rent', 'security_deposit',
+            'start_date', 'end_date', 'lease_duration_months', 'status', 'pet_deposit',
+            'utilities_included', 'parking_included', 'created_at', 'updated_at', 'signed_at'
+        )
+        
         def to_dict(self):
             """Convert lease to dictionary for JSON response."""
             return {
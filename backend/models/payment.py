@@ -61,6 +61,13 @@ def create_payment_model(db):
             if self.updated_at is None:
                 self.updated_at = datetime.now(timezone.utc)
         
+        # Field plan for utils.serialization; keep in step with to_dict()
+        serialize_fields = (
+            'id', 'lease_id', 'tenant_id', 'landlord_id', 'amount', 'payment_method', 'status',
+            'payment_month', 'payment_year', 'due_date', 'paid_date', 'transaction_id',
+            'reference_number', 'notes', 'created_at', 'updated_at'
+        )
+        
         def to_dict(self):
             """Convert payment to dictionary for JSON response."""
             return {
@@ -1,6 +1,12 @@
 from datetime import datetime, timezone
 from sqlalchemy.sql import func
-import json
+from models.collection_version import create_collection_version_model
+from models.property_amenity import create_property_amenity_model
+from models.property_image import create_property_image_model
+from utils.conditional import PROPERTIES_COLLECTION, landlord_properties_collection, track_collection_versions
+from utils.geo import geohash_for
+from utils.serialization import ScalarCollection
+from utils.text_search import register_text_search_ddl
 
 # Global variable to store the Property model
 _property_model = None
@@ -12,8 +18,22 @@ def create_property_model(db):
     if _property_model is not None:
         return _property_model
     
+    PropertyAmenity = create_property_amenity_model(db)
+    PropertyImage = create_property_image_model(db)
+    CollectionVersion = create_collection_version_model(db)
+    
     class Property(db.Model):
         __tablename__ = 'properties'
+        __table_args__ = (
+            # Backs keyset pagination of the public listing (newest first)
+            db.Index('ix_properties_available_created_at_id', 'available', 'created_at', 'id'),
+            # Back the search endpoint's price/size sorts and its common filters
+            db.Index('ix_properties_available_price_id', 'available', 'price', 'id'),
+            db.Index('ix_properties_available_square_feet_id', 'available', 'square_feet', 'id'),
+            db.Index('ix_properties_available_type_price_id', 'available', 'property_type', 'price', 'id'),
+            # Prefix scans for radius and bounding-box queries
+            db.Index('ix_properties_geohash', 'geohash', postgresql_ops={'geohash': 'text_pattern_ops'}),
+        )
         
         id = db.Column(db.Integer, primary_key=True, autoincrement=True)
         name = db.Column(db.String(200), nullable=False)
@@ -29,16 +49,24 @@ def create_property_model(db):
         created_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), nullable=False)
         updated_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
         
-        # Amenities as JSON string
-        amenities = db.Column(db.Text, nullable=True)  # JSON string of amenities
-        
-        # Images as JSON string
-        images = db.Column(db.Text, nullable=True)  # JSON string of image URLs
+        # Amenities and images live in their own tables; selectin loading
+        # fetches them for a whole page of properties in one query each
+        amenity_rows = db.relationship(
+            PropertyAmenity, order_by=PropertyAmenity.position, lazy='selectin',
+            cascade='all, delete-orphan'
+        )
+        image_rows = db.relationship(
+            PropertyImage, order_by=PropertyImage.position, lazy='selectin',
+            cascade='all, delete-orphan'
+        )
         
         # Location coordinates
         latitude = db.Column(db.Float, nullable=True)
         longitude = db.Column(db.Float, nullable=True)
         
+        # Geohash of (latitude, longitude), maintained on every write
+        geohash = db.Column(db.String(12), nullable=True)
+        
         def __init__(self, **kwargs):
             super(Property, self).__init__(**kwargs)
             if self.created_at is None:
@@ -46,6 +74,17 @@ def create_property_model(db):
             if self.updated_at is None:
                 self.updated_at = datetime.now(timezone.utc)
         
+        # Field plan for utils.serialization; keep in step with to_dict()
+        serialize_fields = (
+            'id', 'name', 'description', 'location', 'price', 'property_type',
+            'bedrooms', 'bathrooms', 'square_feet', 'available', 'landlord_id',
+            'created_at', 'updated_at', 'latitude', 'longitude'
+        )
+        serialize_collections = (
+            ScalarCollection('amenities', 'amenity_rows', 'amenity', 'position'),
+            ScalarCollection('images', 'image_rows', 'url', 'position'),
+        )
+        
         def to_dict(self):
             """Convert property to dictionary for JSON response."""
             return {
@@ -62,31 +101,69 @@ def create_property_model(db):
                 'landlord_id': self.landlord_id,
                 'created_at': self.created_at.isoformat() if self.created_at else None,
                 'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-                'amenities': json.loads(self.amenities) if self.amenities else [],
-                'images': json.loads(self.images) if self.images else [],
+                'amenities': self.get_amenities(),
+                'images': self.get_images(),
                 'latitude': self.latitude,
                 'longitude': self.longitude
             }
         
         def set_amenities(self, amenities_list):
             """Set amenities from a list."""
-            self.amenities = json.dumps(amenities_list) if amenities_list else None
+            existing = {row.amenity: row for row in self.amenity_rows}
+            rows = []
+            for amenity in amenities_list or []:
+                amenity = str(amenity).strip()
+                if not amenity or any(row.amenity == amenity for row in rows):
+                    continue
+                # Reuse rows for amenities we keep so the flush updates them
+                # in place instead of deleting and re-inserting the same key
+                row = existing.get(amenity) or PropertyAmenity(amenity=amenity)
+                row.position = len(rows)
+                rows.append(row)
+            self.amenity_rows = rows
+            # Child-row changes count as a change to the listing
+            self.updated_at = datetime.now(timezone.utc)
         
         def get_amenities(self):
             """Get amenities as a list."""
-            return json.loads(self.amenities) if self.amenities else []
+            return [row.amenity for row in self.amenity_rows]
         
         def set_images(self, images_list):
             """Set images from a list."""
-            self.images = json.dumps(images_list) if images_list else None
+            urls = [url for url in (images_list or []) if url]
+            rows = list(self.image_rows[:len(urls)])
+            # Update rows position by position so (property_id, position)
+            # stays unique throughout the flush
+            for position, url in enumerate(urls):
+                if position < len(rows):
+                    rows[position].url = url
+                else:
+                    rows.append(PropertyImage(position=position, url=url))
+            self.image_rows = rows
+            self.updated_at = datetime.now(timezone.utc)
         
         def get_images(self):
             """Get images as a list."""
-            return json.loads(self.images) if self.images else []
+            return [row.url for row in self.image_rows]
         
         def __repr__(self):
             return f'<Property {self.name}>'
     
+    @db.event.listens_for(Property, 'before_insert')
+    @db.event.listens_for(Property, 'before_update')
+    def update_geohash(mapper, connection, target):
+        """Keep the geohash in step with the coordinates."""
+        target.geohash = geohash_for(target.latitude, target.longitude)
+    
+    # Trigram indexes on PostgreSQL, an FTS5 mirror table on SQLite
+    register_text_search_ddl(Property.__table__)
+    
+    # Version counters behind the listing ETags
+    track_collection_versions(
+        Property, CollectionVersion.__table__,
+        lambda prop: (PROPERTIES_COLLECTION, landlord_properties_collection(prop.landlord_id))
+    )
+    
     _property_model = Property
     return Property
 
@@ -0,0 +1,31 @@
+# Global variable to store the PropertyAmenity model
+_property_amenity_model = None
+
+def create_property_amenity_model(db):
+    """Create the PropertyAmenity model dynamically to avoid circular imports."""
+    global _property_amenity_model
+    
+    if _property_amenity_model is not None:
+        return _property_amenity_model
+    
+    class PropertyAmenity(db.Model):
+        __tablename__ = 'property_amenities'
+        __table_args__ = (
+            # Amenity filters look up properties by amenity name
+            db.Index('ix_property_amenities_amenity_property_id', 'amenity', 'property_id'),
+        )
+        
+        property_id = db.Column(db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), primary_key=True)
+        amenity = db.Column(db.String(100), primary_key=True)
+        position = db.Column(db.Integer, nullable=False, default=0)
+        
+        def __repr__(self):
+            return f'<PropertyAmenity {self.property_id}: {self.amenity}>'
+    
+    _property_amenity_model = PropertyAmenity
+    return PropertyAmenity
+
+# Create a placeholder class for imports
+class PropertyAmenity:
+    """Placeholder PropertyAmenity class for imports."""
+    pass
@@ -0,0 +1,31 @@
+# Global variable to store the PropertyImage model
+_property_image_model = None
+
+def create_property_image_model(db):
+    """Create the PropertyImage model dynamically to avoid circular imports."""
+    global _property_image_model
+    
+    if _property_image_model is not None:
+        return _property_image_model
+    
+    class PropertyImage(db.Model):
+        __tablename__ = 'property_images'
+        __table_args__ = (
+            db.UniqueConstraint('property_id', 'position', name='uq_property_images_property_id_position'),
+        )
+        
+        id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+        property_id = db.Column(db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), nullable=False)
+        position = db.Column(db.Integer, nullable=False, default=0)
+        url = db.Column(db.Text, nullable=False)
+        
+        def __repr__(self):
+            return f'<PropertyImage {self.property_id}#{self.position}>'
+    
+    _property_image_model = PropertyImage
+    return PropertyImage
+
+# Create a placeholder class for imports
+class PropertyImage:
+    """Placeholder PropertyImage class for imports."""
+    pass
@@ -0,0 +1,37 @@
+# Global variable to store the RefreshTokenFamily model
+_refresh_token_family_model = None
+
+def create_refresh_token_family_model(db):
+    """Create the RefreshTokenFamily model dynamically to avoid circular imports."""
+    global _refresh_token_family_model
+    
+    if _refresh_token_family_model is not None:
+        return _refresh_token_family_model
+    
+    class RefreshTokenFamily(db.Model):
+        """
+        One login session's chain of rotated refresh tokens.
+        
+        Only the newest token's jti is kept: any other token carrying this
+        family's id has already been retired, so presenting it is reuse.
+        """
+        __tablename__ = 'refresh_token_families'
+        
+        id = db.Column(db.String(36), primary_key=True)  # jti of the first token
+        user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+        current_jti = db.Column(db.String(36), nullable=False, unique=True, index=True)
+        generation = db.Column(db.Integer, nullable=False, default=0)
+        expires_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+        revoked_at = db.Column(db.DateTime(timezone=True), nullable=True)
+        created_at = db.Column(db.DateTime(timezone=True), nullable=False)
+        
+        def __repr__(self):
+            return f'<RefreshTokenFamily {self.id} user={self.user_id} gen={self.generation}>'
+    
+    _refresh_token_family_model = RefreshTokenFamily
+    return RefreshTokenFamily
+
+# Create a placeholder class for imports
+class RefreshTokenFamily:
+    """Placeholder RefreshTokenFamily class for imports."""
+    pass
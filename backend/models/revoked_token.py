@@ -0,0 +1,31 @@
+from sqlalchemy.sql import func
+
+# Global variable to store the RevokedToken model
+_revoked_token_model = None
+
+def create_revoked_token_model(db):
+    """Create the RevokedToken model dynamically to avoid circular imports."""
+    global _revoked_token_model
+    
+    if _revoked_token_model is not None:
+        return _revoked_token_model
+    
+    class RevokedToken(db.Model):
+        """A token revoked before its expiry, kept until ``expires_at`` passes."""
+        __tablename__ = 'revoked_tokens'
+        
+        jti = db.Column(db.String(64), primary_key=True)
+        expires_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+        # Lets workers fetch only the revocations made since their last sync
+        revoked_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+        
+        def __repr__(self):
+            return f'<RevokedToken {self.jti}>'
+    
+    _revoked_token_model = RevokedToken
+    return RevokedToken
+
+# Create a placeholder class for imports
+class RevokedToken:
+    """Placeholder RevokedToken class for imports."""
+    pass
@@ -24,6 +24,10 @@ def create_user_model(db):
     
     class User(db.Model):
         __tablename__ = 'users'
+        __table_args__ = (
+            # Backs keyset pagination of the admin approval queue
+            db.Index('ix_users_approval_status_created_at_id', 'approval_status', 'created_at', 'id'),
+        )
 
         id = db.Column(db.Integer, primary_key=True, autoincrement=True)
         username = db.Column(db.String(80), unique=True, nullable=False, index=True)
@@ -48,6 +52,9 @@ def create_user_model(db):
         def __repr__(self):
             return f'<User {self.username}>'
 
+        # Field plan for utils.serialization; keep in step with to_dict()
+        serialize_fields = ('id', 'username', 'email', 'phone', 'role', 'approval_status', 'created_at')
+        
         def to_dict(self):
             return {
                 'id': self.id,
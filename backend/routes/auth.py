@@ -2,24 +2,73 @@
 Authentication routes for user registration, login, logout, and profile.
 """
 
+import re
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import (
     create_access_token, 
-    create_refresh_token, 
     jwt_required, 
-    get_jwt_identity,
-    get_jwt
+    get_jwt,
+    decode_token,
+    current_user
 )
 from werkzeug.security import generate_password_hash
-from datetime import timedelta
-import json
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta, timezone
 
 from models.user import UserRole, ApprovalStatus
-from auth.utils import hash_password, verify_password
+from auth.current_user import invalidate_user
+from auth.identity import TokenIdentity, get_current_identity, identity_from_claims
+from auth.password_pool import PasswordPoolBusyError, busy_response
+from auth.refresh_tokens import (
+    FAMILY_CLAIM, RefreshTokenError, RefreshTokenReuseError, issue_refresh_token, revoke_family,
+    rotate_refresh_token
+)
+from auth.revocation import revoke_token
+from auth.utils import hash_password, needs_rehash, verify_password
+from utils.counting import COUNT_MODES, count_rows
+from utils.event_stream import StreamLimitError, blocks_worker, event_stream
+from utils.logger import get_logger
+from utils.pagination import InvalidCursorError, paginate_keyset, parse_limit
+from utils.serialization import FieldSelectionError, get_serializer, json_response, parse_fields
+
+logger = get_logger(__name__)
 
 # Create Blueprint
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
+# Column named by SQLite's unique-constraint message
+_SQLITE_UNIQUE_COLUMN = re.compile(r'UNIQUE constraint failed: users\.(email|username)\b')
+
+def _duplicate_user_field(error: IntegrityError):
+    """
+    Name the unique user column an INSERT collided with.
+    
+    Args:
+        error: IntegrityError raised by the INSERT
+        
+    Returns:
+        str: 'username' or 'email', or None for any other integrity error
+    """
+    # Only the constraint or column name: the rest of the message quotes the
+    # submitted values, which may themselves contain "email" or "username"
+    diag = getattr(error.orig, 'diag', None)
+    constraint = getattr(diag, 'constraint_name', None)
+    if constraint:
+        # PostgreSQL, e.g. ix_users_email or users_username_key
+        names = constraint.lower().split('_')
+        return next((field for field in ('email', 'username') if field in names), None)
+    # SQLite, e.g. "UNIQUE constraint failed: users.email"
+    match = _SQLITE_UNIQUE_COLUMN.search(str(error.orig))
+    return match.group(1) if match else None
+
+def _publish_admin_event(event: str, data: dict) -> None:
+    """Notify admin event streams; never fails the request that changed data."""
+    try:
+        current_app.event_broker.publish(event, data)
+    except Exception as e:
+        logger.warning(f"Failed to publish {event} event: {e}")
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     """
@@ -78,14 +127,7 @@ def register():
         except ValueError:
             return jsonify({'error': f'Invalid role. Must be one of: {[r.value for r in UserRole]}'}), 400
         
-        # Check if username already exists
         User = current_app.User
-        if User.query.filter_by(username=username).first():
-            return jsonify({'error': 'Username already exists'}), 409
-        
-        # Check if email already exists
-        if User.query.filter_by(email=email).first():
-            return jsonify({'error': 'Email already exists'}), 409
         
         # Hash password
         hashed_password = hash_password(password)
@@ -99,30 +141,36 @@ def register():
             role=role
         )
         
-        # Save to database
+        # Save to database; the unique indexes on username and email reject
+        # duplicates in the same round trip, including concurrent signups
         current_app.db.session.add(new_user)
-        current_app.db.session.commit()
+        try:
+            current_app.db.session.commit()
+        except IntegrityError as e:
+            current_app.db.session.rollback()
+            field = _duplicate_user_field(e)
+            if field is None:
+                raise
+            return jsonify({'error': f'{field.capitalize()} already exists'}), 409
+        
+        if new_user.approval_status == ApprovalStatus.PENDING:
+            _publish_admin_event('user_registered', {
+                'user': get_serializer(User).serialize_objects([new_user])[0]
+            })
         
         # Generate tokens
-        token_identity = json.dumps({
-            'user_id': new_user.id,
-            'username': new_user.username,
-            'role': new_user.role.value
-        })
+        token_identity = TokenIdentity.from_user(new_user)
         
         access_token = create_access_token(
             identity=token_identity,
             expires_delta=timedelta(hours=1)
         )
         
-        refresh_token = create_refresh_token(
-            identity=token_identity,
-            expires_delta=timedelta(days=30)
-        )
-        
         # Check if user needs approval
         if new_user.role == UserRole.ADMIN:
-            # Admins get immediate access
+            # Admins get immediate access; the refresh token starts a
+            # rotation family
+            refresh_token = issue_refresh_token(token_identity, expires_delta=timedelta(days=30))
             return jsonify({
                 'message': 'Admin user registered successfully',
                 'user': {
@@ -153,6 +201,9 @@ def register():
                 'requires_approval': True
             }), 201
         
+    except PasswordPoolBusyError as e:
+        current_app.db.session.rollback()
+        return busy_response(e)
     except Exception as e:
         current_app.db.session.rollback()
         return jsonify({'error': 'Registration failed', 'details': str(e)}), 500
@@ -199,6 +250,16 @@ def login():
         if not verify_password(password, user.password):
             return jsonify({'error': 'Invalid credentials'}), 401
         
+        # Upgrade a hash made below the configured cost while we hold the
+        # plain password; a busy pool just defers it
+        if needs_rehash(user.password):
+            try:
+                user.password = hash_password(password)
+                current_app.db.session.commit()
+            except PasswordPoolBusyError:
+                current_app.db.session.rollback()
+                logger.info(f"Deferred password rehash for user {user.id}: pool busy")
+        
         # Check approval status
         if user.approval_status != ApprovalStatus.APPROVED:
             if user.approval_status == ApprovalStatus.PENDING:
@@ -207,21 +268,15 @@ def login():
                 return jsonify({'error': 'Your account has been rejected. Please contact support.'}), 403
         
         # Generate tokens
-        token_identity = json.dumps({
-            'user_id': user.id,
-            'username': user.username,
-            'role': user.role.value
-        })
+        token_identity = TokenIdentity.from_user(user)
         
         access_token = create_access_token(
             identity=token_identity,
             expires_delta=timedelta(hours=1)
         )
         
-        refresh_token = create_refresh_token(
-            identity=token_identity,
-            expires_delta=timedelta(days=30)
-        )
+        # First token of a new rotation family
+        refresh_token = issue_refresh_token(token_identity, expires_delta=timedelta(days=30))
         
         return jsonify({
             'message': 'Login successful',
@@ -238,6 +293,8 @@ def login():
             }
         }), 200
         
+    except PasswordPoolBusyError as e:
+        return busy_response(e)
     except Exception as e:
         return jsonify({'error': 'Login failed', 'details': str(e)}), 500
 
@@ -245,25 +302,43 @@ def login():
 @jwt_required()
 def logout():
     """
-    Logout user (token invalidation).
-    Note: This is a basic implementation. For production, consider using a token blacklist.
+    Logout user by revoking their tokens.
+    
+    The access token used for the request is revoked; a refresh token sent
+    as {"refresh_token": "..."} is revoked as well so it cannot mint new
+    access tokens.
     """
     try:
         # Get current token identity
-        current_user = get_jwt_identity()
+        identity = get_current_identity()
         
-        if current_user:
-            # Parse user info from token
-            user_info = json.loads(current_user)
-            username = user_info.get('username', 'Unknown')
-            
-            return jsonify({
-                'message': f'User {username} logged out successfully'
-            }), 200
-        else:
+        if not identity:
             return jsonify({'error': 'No valid token found'}), 401
+        
+        revoke_token(get_jwt())
+        
+        data = request.get_json(silent=True) or {}
+        if data.get('refresh_token'):
+            try:
+                refresh_claims = decode_token(data['refresh_token'])
+            except Exception:
+                return jsonify({'error': 'Invalid refresh token'}), 400
+            refresh_identity = identity_from_claims(refresh_claims)
+            if (refresh_claims.get('type') != 'refresh' or refresh_identity is None
+                    or refresh_identity.user_id != identity.user_id):
+                return jsonify({'error': 'Refresh token does not belong to this session'}), 400
+            revoke_token(refresh_claims)
+            if refresh_claims.get(FAMILY_CLAIM):
+                revoke_family(refresh_claims[FAMILY_CLAIM])
+        current_app.db.session.commit()
+        
+        username = identity.username or 'Unknown'
+        return jsonify({
+            'message': f'User {username} logged out successfully'
+        }), 200
             
     except Exception as e:
+        current_app.db.session.rollback()
         return jsonify({'error': 'Logout failed', 'details': str(e)}), 500
 
 @auth_bp.route('/delete-account', methods=['DELETE'])
@@ -274,27 +349,12 @@ def delete_account():
     Requires valid JWT token in Authorization header.
     """
     try:
-        # Get current user from token
-        current_user = get_jwt_identity()
-        
-        if not current_user:
-            return jsonify({'error': 'No valid token found'}), 401
-        
-        # Parse user info from token
-        user_info = json.loads(current_user)
-        username = user_info.get('username')
-        user_id = user_info.get('user_id')
-        
-        if not username or not user_id:
-            return jsonify({'error': 'Invalid user information'}), 400
-        
-        # Get User model from app context
-        User = current_app.User
-        
-        # Find the user in database
-        user = User.query.get(user_id)
+        # User loaded when the token was verified
+        user = current_user
         if not user:
             return jsonify({'error': 'User not found'}), 404
+        user_id = user.id
+        was_pending = user.approval_status == ApprovalStatus.PENDING
         
         # Store user info for response
         deleted_username = user.username
@@ -309,6 +369,9 @@ def delete_account():
         # Delete the user
         current_app.db.session.delete(user)
         current_app.db.session.commit()
+        invalidate_user(user_id)
+        if was_pending:
+            _publish_admin_event('user_deleted', {'user_ids': [user_id]})
         
         return jsonify({
             'message': f'Account for {deleted_username} ({deleted_email}) has been deleted successfully'
@@ -324,25 +387,23 @@ def get_profile():
     """
     Get current user's profile information.
     Requires valid JWT token in Authorization header.
+    Accepts fields= to choose which user fields are returned.
     """
     try:
-        # Get current user from token
-        current_user = get_jwt_identity()
-        
-        if not current_user:
-            return jsonify({'error': 'No valid token found'}), 401
-        
-        # Parse user info from token
-        user_info = json.loads(current_user)
-        user_id = user_info.get('user_id')
-        
-        # Get user from database using Session.get() for SQLAlchemy 2.0
-        from app import db
-        user = db.session.get(User, user_id)
-        
+        # User loaded when the token was verified
+        user = current_user
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
+        User = current_app.User
+        try:
+            fields = parse_fields(User, request.args.get('fields'))
+        except FieldSelectionError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if fields is not None:
+            return json_response({'user': get_serializer(User, fields).serialize_objects([user])[0]})
+        
         return jsonify({
             'user': {
                 'id': user.id,
@@ -360,27 +421,39 @@ def get_profile():
 @jwt_required(refresh=True)
 def refresh():
     """
-    Refresh access token using refresh token.
+    Exchange a refresh token for a new access token and refresh token.
+    
+    The presented refresh token is retired; presenting it again revokes
+    every token descended from the same login.
     """
     try:
         # Get current user from refresh token
-        current_user = get_jwt_identity()
+        identity = get_current_identity()
         
-        if not current_user:
+        if not identity:
             return jsonify({'error': 'No valid refresh token found'}), 401
         
+        try:
+            new_refresh_token = rotate_refresh_token(get_jwt())
+        except RefreshTokenReuseError:
+            return jsonify({'error': 'Refresh token reuse detected, please log in again'}), 401
+        except RefreshTokenError as e:
+            return jsonify({'error': str(e)}), 401
+        
         # Generate new access token
         new_access_token = create_access_token(
-            identity=current_user,
+            identity=identity,
             expires_delta=timedelta(hours=1)
         )
         
         return jsonify({
             'message': 'Token refreshed successfully',
-            'access_token': new_access_token
+            'access_token': new_access_token,
+            'refresh_token': new_refresh_token
         }), 200
         
     except Exception as e:
+        current_app.db.session.rollback()
         return jsonify({'error': 'Token refresh failed', 'details': str(e)}), 500
 
 @auth_bp.route('/validate', methods=['POST'])
@@ -390,17 +463,14 @@ def validate_token():
     Validate current access token and return user info.
     """
     try:
-        current_user = get_jwt_identity()
+        identity = get_current_identity()
         
-        if not current_user:
+        if not identity:
             return jsonify({'error': 'No valid token found'}), 401
         
-        # Parse user info from token
-        user_info = json.loads(current_user)
-        
         return jsonify({
             'valid': True,
-            'user': user_info
+            'user': identity.as_dict()
         }), 200
         
     except Exception as e:
@@ -410,30 +480,96 @@ def validate_token():
 @jwt_required()
 def get_pending_users():
     """
-    Get list of users pending approval.
+    Get one page of the users pending approval, oldest signup first.
     Requires admin role.
+    
+    Query parameters:
+        limit: Page size (default PENDING_USERS_PAGE_SIZE)
+        cursor: next_cursor from the previous page
+        sort: "oldest" (default) or "newest"
+        role: One or more comma-separated roles
+        created_after, created_before: ISO 8601 signup date bounds
+        count: "none" (default), "exact" or "estimate" for a total
+        fields: Which user fields are returned
     """
     try:
         # Get current user from token
-        current_user = get_jwt_identity()
-        if not current_user:
+        identity = get_current_identity()
+        if not identity:
             return jsonify({'error': 'No valid token found'}), 401
         
-        # Parse user info from token
-        user_info = json.loads(current_user)
-        user_role = user_info.get('role')
-        
         # Check if user is admin
-        if user_role != 'admin':
+        if identity.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         
-        # Get pending users
         User = current_app.User
-        pending_users = User.query.filter_by(approval_status=ApprovalStatus.PENDING).all()
+        args = request.args
+        try:
+            serializer = get_serializer(User, parse_fields(User, args.get('fields')))
+        except FieldSelectionError as e:
+            return jsonify({'error': str(e)}), 400
         
-        return jsonify({
-            'pending_users': [user.to_dict() for user in pending_users]
-        }), 200
+        try:
+            limit = parse_limit(
+                args.get('limit'),
+                default=current_app.config.get('PENDING_USERS_PAGE_SIZE', 50),
+                maximum=current_app.config.get('PENDING_USERS_MAX_PAGE_SIZE', 200)
+            )
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        
+        sort = args.get('sort') or 'oldest'
+        count_mode = args.get('count') or 'none'
+        if sort not in ('oldest', 'newest'):
+            return jsonify({'error': 'sort must be one of: oldest, newest'}), 400
+        if count_mode not in COUNT_MODES:
+            return jsonify({'error': f'count must be one of: {", ".join(COUNT_MODES)}'}), 400
+        
+        # Served by the (approval_status, created_at, id) index
+        query = User.query.filter(User.approval_status == ApprovalStatus.PENDING)
+        
+        roles = [role.strip().lower() for role in (args.get('role') or '').split(',') if role.strip()]
+        try:
+            roles = [UserRole(role) for role in roles]
+        except ValueError:
+            return jsonify({'error': f'role must be among: {[r.value for r in UserRole]}'}), 400
+        if roles:
+            query = query.filter(User.role.in_(roles))
+        
+        for name, compare in (('created_after', '__ge__'), ('created_before', '__lt__')):
+            value = args.get(name)
+            if not value:
+                continue
+            try:
+                bound = datetime.fromisoformat(value)
+            except ValueError:
+                return jsonify({'error': f'{name} must be an ISO 8601 date'}), 400
+            # Naive bounds are UTC; others are converted, since SQLite keeps
+            # the UTC wall time and ignores any offset on the bound
+            if bound.tzinfo is None:
+                bound = bound.replace(tzinfo=timezone.utc)
+            else:
+                bound = bound.astimezone(timezone.utc)
+            query = query.filter(getattr(User.created_at, compare)(bound))
+        
+        # Plain rows projected onto the fieldset, plus the cursor key
+        try:
+            page = paginate_keyset(serializer.select(query, User.created_at), User.created_at, User.id,
+                                   limit, args.get('cursor'), descending=(sort == 'newest'))
+        except InvalidCursorError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        payload = {
+            'pending_users': serializer.serialize_rows(page['items']),
+            'count': len(page['items']),
+            'limit': limit,
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more']
+        }
+        if count_mode != 'none':
+            payload['total'], payload['total_is_estimate'] = count_rows(query, count_mode)
+        
+        return json_response(payload)
         
     except Exception as e:
         return jsonify({'error': 'Failed to get pending users', 'details': str(e)}), 500
@@ -447,16 +583,12 @@ def approve_user(user_id):
     """
     try:
         # Get current user from token
-        current_user = get_jwt_identity()
-        if not current_user:
+        identity = get_current_identity()
+        if not identity:
             return jsonify({'error': 'No valid token found'}), 401
         
-        # Parse user info from token
-        user_info = json.loads(current_user)
-        user_role = user_info.get('role')
-        
         # Check if user is admin
-        if user_role != 'admin':
+        if identity.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         
         # Find the user to approve
@@ -471,6 +603,10 @@ def approve_user(user_id):
         # Approve the user
         user.approval_status = ApprovalStatus.APPROVED
         current_app.db.session.commit()
+        invalidate_user(user.id)
+        _publish_admin_event('approval_changed', {
+            'user_ids': [user.id], 'approval_status': ApprovalStatus.APPROVED.value
+        })
         
         return jsonify({
             'message': f'User {user.username} has been approved successfully',
@@ -490,16 +626,12 @@ def reject_user(user_id):
     """
     try:
         # Get current user from token
-        current_user = get_jwt_identity()
-        if not current_user:
+        identity = get_current_identity()
+        if not identity:
             return jsonify({'error': 'No valid token found'}), 401
         
-        # Parse user info from token
-        user_info = json.loads(current_user)
-        user_role = user_info.get('role')
-        
         # Check if user is admin
-        if user_role != 'admin':
+        if identity.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         
         # Find the user to reject
@@ -514,6 +646,10 @@ def reject_user(user_id):
         # Reject the user
         user.approval_status = ApprovalStatus.REJECTED
         current_app.db.session.commit()
+        invalidate_user(user.id)
+        _publish_admin_event('approval_changed', {
+            'user_ids': [user.id], 'approval_status': ApprovalStatus.REJECTED.value
+        })
         
         return jsonify({
             'message': f'User {user.username} has been rejected',
@@ -523,3 +659,164 @@ def reject_user(user_id):
     except Exception as e:
         current_app.db.session.rollback()
         return jsonify({'error': 'Failed to reject user', 'details': str(e)}), 500
+
+# action -> status set by the bulk approval endpoint
+BULK_APPROVAL_ACTIONS = {
+    'approve': ApprovalStatus.APPROVED,
+    'reject': ApprovalStatus.REJECTED,
+}
+
+# Ids bound per UPDATE statement; keeps each IN list under SQLite's
+# bound-parameter limit
+BULK_APPROVAL_CHUNK_SIZE = 500
+
+@auth_bp.route('/admin/bulk-approval', methods=['POST'])
+@jwt_required()
+def bulk_approval():
+    """
+    Approve or reject many pending users in one transaction.
+    Requires admin role.
+    
+    Expected JSON payload:
+    {
+        "user_ids": [1, 2, 3],
+        "action": "approve|reject"
+    }
+    
+    Each id is reported as "approved"/"rejected", "not_pending" (with its
+    current approval_status) or "not_found".
+    """
+    try:
+        # Get current user from token
+        identity = get_current_identity()
+        if not identity:
+            return jsonify({'error': 'No valid token found'}), 401
+        
+        # Check if user is admin
+        if identity.role != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+        
+        data = request.get_json(silent=True) or {}
+        action = data.get('action')
+        if action not in BULK_APPROVAL_ACTIONS:
+            return jsonify({'error': f'action must be one of: {list(BULK_APPROVAL_ACTIONS)}'}), 400
+        
+        user_ids = data.get('user_ids')
+        if (not isinstance(user_ids, list) or not user_ids
+                or not all(isinstance(user_id, int) and not isinstance(user_id, bool) for user_id in user_ids)):
+            return jsonify({'error': 'user_ids must be a non-empty list of integers'}), 400
+        max_ids = current_app.config.get('BULK_APPROVAL_MAX_IDS', 5000)
+        if len(user_ids) > max_ids:
+            return jsonify({'error': f'At most {max_ids} user_ids per request'}), 400
+        
+        User = current_app.User
+        db = current_app.db
+        target = BULK_APPROVAL_ACTIONS[action]
+        user_ids = list(dict.fromkeys(user_ids))
+        
+        # Only rows still pending change, so a concurrent review of the
+        # same user is never overwritten
+        updated = set()
+        for start in range(0, len(user_ids), BULK_APPROVAL_CHUNK_SIZE):
+            chunk = user_ids[start:start + BULK_APPROVAL_CHUNK_SIZE]
+            result = db.session.execute(
+                update(User)
+                .where(User.id.in_(chunk), User.approval_status == ApprovalStatus.PENDING)
+                .values(approval_status=target)
+                .returning(User.id)
+            )
+            updated.update(result.scalars().all())
+        
+        # One lookup explains every id that did not change
+        current_status = {}
+        unchanged = [user_id for user_id in user_ids if user_id not in updated]
+        for start in range(0, len(unchanged), BULK_APPROVAL_CHUNK_SIZE):
+            chunk = unchanged[start:start + BULK_APPROVAL_CHUNK_SIZE]
+            current_status.update(db.session.execute(
+                select(User.id, User.approval_status).where(User.id.in_(chunk))
+            ).all())
+        
+        db.session.commit()
+        for user_id in updated:
+            invalidate_user(user_id)
+        if updated:
+            _publish_admin_event('approval_changed', {
+                'user_ids': sorted(updated), 'approval_status': target.value
+            })
+        
+        results = []
+        for user_id in user_ids:
+            if user_id in updated:
+                results.append({'id': user_id, 'status': target.value})
+            elif user_id in current_status:
+                results.append({
+                    'id': user_id,
+                    'status': 'not_pending',
+                    'approval_status': current_status[user_id].value
+                })
+            else:
+                results.append({'id': user_id, 'status': 'not_found'})
+        
+        return jsonify({
+            'message': f'{len(updated)} user(s) {target.value}',
+            'updated': len(updated),
+            'results': results
+        }), 200
+        
+    except Exception as e:
+        current_app.db.session.rollback()
+        return jsonify({'error': 'Failed to update users', 'details': str(e)}), 500
+
+@auth_bp.route('/admin/events', methods=['GET'])
+@jwt_required()
+def admin_events():
+    """
+    Server-sent event stream of changes to the approval queue.
+    Requires admin role.
+    
+    Events:
+        user_registered: {"user": {...}} for each new pending signup
+        approval_changed: {"user_ids": [...], "approval_status": "..."}
+        user_deleted: {"user_ids": [...]} for pending users who left
+    
+    The stream ends after SSE_MAX_DURATION seconds; clients reconnect.
+    """
+    try:
+        # Get current user from token
+        identity = get_current_identity()
+        if not identity:
+            return jsonify({'error': 'No valid token found'}), 401
+        
+        # Check if user is admin
+        if identity.role != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+        
+        # A sync worker would be pinned for the whole stream; clients poll instead
+        if blocks_worker(request.environ):
+            response = jsonify({'error': 'Event streams require an async worker (WORKER_CLASS=gevent)'})
+            response.status_code = 503
+            response.headers['Retry-After'] = '30'
+            return response
+        
+        broker = current_app.event_broker
+        try:
+            subscriber = broker.subscribe()
+        except StreamLimitError as e:
+            response = jsonify({'error': str(e)})
+            response.status_code = 503
+            response.headers['Retry-After'] = '30'
+            return response
+        
+        stream = event_stream(
+            broker, subscriber,
+            keepalive=current_app.config.get('SSE_KEEPALIVE_SECONDS', 15),
+            max_duration=current_app.config.get('SSE_MAX_DURATION', 25)
+        )
+        return current_app.response_class(stream, mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            # Stop nginx-style proxies from buffering the stream
+            'X-Accel-Buffering': 'no'
+        })
+        
+    except Exception as e:
+        return jsonify({'error': 'Failed to open event stream', 'details': str(e)}), 500
@@ -6,7 +6,9 @@ import os
 import psutil
 from datetime import datetime, timezone
 from flask import Blueprint, jsonify, current_app
-from utils.logger import get_logger
+from utils.health_sampler import HealthSampler
+from utils.logger import get_log_pipeline, get_logger
+from utils.redis_client import get_redis_client
 
 logger = get_logger(__name__)
 
@@ -63,26 +65,15 @@ def check_database_health():
 def check_redis_health():
     """Check Redis connectivity and return health status."""
     try:
-        import redis
-        from urllib.parse import urlparse
-        
-        redis_url = os.environ.get('REDIS_URL')
+        redis_url = current_app.config.get('REDIS_URL')
         if not redis_url:
             return {
                 "status": "not_configured",
                 "message": "Redis not configured"
             }
         
-        # Parse Redis URL
-        parsed_url = urlparse(redis_url)
-        redis_client = redis.Redis(
-            host=parsed_url.hostname or 'localhost',
-            port=parsed_url.port or 6379,
-            password=parsed_url.password,
-            db=int(parsed_url.path.lstrip('/')) if parsed_url.path else 0,
-            socket_timeout=5,
-            socket_connect_timeout=5
-        )
+        # Shared client, so samples reuse the connection pool
+        redis_client = get_redis_client(redis_url)
         
         # Test Redis connection
         redis_client.ping()
@@ -110,8 +101,8 @@ def check_redis_health():
 def get_system_metrics():
     """Get system resource metrics."""
     try:
-        # CPU usage
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # CPU usage since the previous sample, without blocking
+        cpu_percent = psutil.cpu_percent(interval=None)
         
         # Memory usage
         memory = psutil.virtual_memory()
@@ -144,6 +135,22 @@ def get_system_metrics():
         }
 
 
+def init_health_sampler(app):
+    """
+    Attach the background health sampler as ``app.health_sampler``.
+    
+    Args:
+        app: Flask application
+    """
+    # Start the CPU measurement window; the first sample reports from here
+    psutil.cpu_percent(interval=None)
+    app.health_sampler = HealthSampler(app, {
+        "database": check_database_health,
+        "redis": check_redis_health,
+        "system": get_system_metrics,
+    }, interval=app.config.get('HEALTH_SAMPLE_INTERVAL', 15.0))
+
+
 @health_bp.route('/healthz', methods=['GET'])
 def healthz():
     """Comprehensive health check endpoint with service info, uptime, and component status."""
@@ -160,18 +167,17 @@ def healthz():
             }
         }
         
-        # Check database health
-        db_health = check_database_health()
-        
-        # Check Redis health
-        redis_health = check_redis_health()
+        # Latest background sample of the component checks
+        sample = current_app.health_sampler.snapshot()
+        db_health = sample["database"]
+        redis_health = sample["redis"]
         
         # Determine overall status
         overall_status = "healthy"
         if db_health["status"] != "ok":
             overall_status = "unhealthy"
-        elif redis_health["status"] == "error":
-            overall_status = "degraded"  # Redis error but not critical
+        elif redis_health["status"] == "error" or sample["snapshot"]["stale"]:
+            overall_status = "degraded"  # Redis error or sampler behind, but not critical
         
         # Build response
         response = {
@@ -184,16 +190,13 @@ def healthz():
             "components": {
                 "database": db_health,
                 "redis": redis_health
-            }
+            },
+            "snapshot": sample["snapshot"]
         }
         
         # Add system metrics if available
-        try:
-            system_metrics = get_system_metrics()
-            if "error" not in system_metrics:
-                response["system"] = system_metrics
-        except Exception:
-            pass  # System metrics are optional
+        if "error" not in sample["system"]:
+            response["system"] = sample["system"]
         
         # Determine HTTP status code
         status_code = 200
@@ -274,14 +277,10 @@ def liveness_check():
 def metrics():
     """Detailed metrics endpoint for monitoring systems."""
     try:
-        # Get system metrics
-        system_metrics = get_system_metrics()
-        
-        # Get database health
-        db_health = check_database_health()
+        # Latest background sample of system and component checks
+        sample = current_app.health_sampler.snapshot()
         
-        # Get Redis health
-        redis_health = check_redis_health()
+        pipeline = get_log_pipeline()
         
         # Get application metrics
         app_metrics = {
@@ -302,11 +301,20 @@ def metrics():
             "service": "renteasy-backend",
             "version": "1.0.0",
             "application": app_metrics,
-            "system": system_metrics,
+            "response_cache": current_app.response_cache.stats(),
+            "password_hashing": current_app.password_pool.stats(),
+            "user_cache": current_app.user_cache.stats(),
+            "token_revocation": current_app.revocation_store.stats(),
+            "event_streams": current_app.event_broker.stats(),
+            "logging": pipeline.stats() if pipeline else None,
+            "security_events": current_app.security_events.stats(),
+            "health_sampler": current_app.health_sampler.stats(),
+            "system": sample["system"],
             "components": {
-                "database": db_health,
-                "redis": redis_health
-            }
+                "database": sample["database"],
+                "redis": sample["redis"]
+            },
+            "snapshot": sample["snapshot"]
         }
         
         return jsonify(response), 200
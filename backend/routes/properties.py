@@ -3,51 +3,222 @@ Property routes for CRUD operations on properties.
 """
 
 from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from auth.current_user import load_user
+from auth.identity import get_current_identity
 from auth.utils import role_required
+from utils.pagination import InvalidCursorError, paginate_by_created_at, paginate_keyset, paginate_offset, parse_limit
+from utils.property_search import SearchParameterError, build_property_search
+from utils.conditional import (
+    PROPERTIES_COLLECTION, collection_etag, etag_matches, get_collection_version,
+    landlord_properties_collection, not_modified_response, not_modified_since, with_validators
+)
+from utils.geo import haversine_km
+from utils.response_cache import LISTING_TAG, landlord_tag, listing_cache_key
+from utils.serialization import FieldSelectionError, get_serializer, json_response, parse_fields
 from datetime import datetime, timezone
-import json
+from sqlalchemy import select
 
 # Create Blueprint
 properties_bp = Blueprint('properties', __name__, url_prefix='/api')
 
 
+def _property_serializer():
+    """
+    Return the Property serializer for the request's ``fields=`` parameter.
+    
+    Raises:
+        FieldSelectionError: If fields= names an unknown field
+    """
+    Property = current_app.Property
+    return get_serializer(Property, parse_fields(Property, request.args.get('fields')))
+
+
+def _cached_listing(cache_key):
+    """Return the cached JSON response for ``cache_key``, or None on a miss."""
+    body = current_app.response_cache.get(cache_key)
+    if body is None:
+        return None
+    return current_app.response_class(body, mimetype='application/json')
+
+
+def _cache_listing(cache_key, response, *tags):
+    """Store a successful listing response under ``cache_key`` and return it."""
+    current_app.response_cache.set(cache_key, response.get_data(), tags)
+    return response
+
+
+def _invalidate_listings(landlord_id):
+    """Drop cached listings a write to one of ``landlord_id``'s properties affects."""
+    current_app.response_cache.invalidate(LISTING_TAG, landlord_tag(landlord_id))
+
+
 @properties_bp.route('/properties', methods=['GET'])
 @jwt_required()
 def get_all_properties():
-    """Get all available properties."""
+    """
+    Get available properties, newest first, one page at a time.
+    
+    Query parameters:
+        limit: Page size (defaults to PROPERTIES_PAGE_SIZE)
+        cursor: The next_cursor value returned with the previous page
+        unpaged: "true" returns every available property in the legacy
+                 unpaginated shape (kept until the frontend migrates)
+        fields: Comma-separated sparse fieldset; id is always included
+    
+    Responses carry an ETag; a matching If-None-Match gets a 304 without
+    running the listing query. Bodies are shared through the response cache.
+    """
     try:
-        Property = current_app.Property
-        properties = Property.query.filter_by(available=True).all()
+        version = get_collection_version(PROPERTIES_COLLECTION)
+        etag = collection_etag(version)
+        if etag_matches(etag):
+            return not_modified_response(etag)
         
-        return jsonify({
-            'properties': [property.to_dict() for property in properties],
-            'count': len(properties)
-        }), 200
+        cache_key = listing_cache_key('properties', version, request.args)
+        cached = _cached_listing(cache_key)
+        if cached is not None:
+            return with_validators(cached, etag)
+        
+        Property = current_app.Property
+        try:
+            serializer = _property_serializer()
+        except FieldSelectionError as e:
+            return jsonify({'error': str(e)}), 400
+        # Select plain columns; rows are serialized without building models
+        query = serializer.select(Property.query.filter_by(available=True), Property.created_at)
+        
+        if request.args.get('unpaged', '').lower() in ('1', 'true', 'yes'):
+            properties = serializer.serialize_rows(query.all())
+            return with_validators(_cache_listing(cache_key, json_response({
+                'properties': properties,
+                'count': len(properties)
+            }), LISTING_TAG), etag)
+        
+        try:
+            limit = parse_limit(
+                request.args.get('limit'),
+                default=current_app.config.get('PROPERTIES_PAGE_SIZE', 20),
+                maximum=current_app.config.get('PROPERTIES_MAX_PAGE_SIZE', 100)
+            )
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        
+        try:
+            page = paginate_by_created_at(query, Property, limit, request.args.get('cursor'))
+        except InvalidCursorError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        return with_validators(_cache_listing(cache_key, json_response({
+            'properties': serializer.serialize_rows(page['items']),
+            'count': len(page['items']),
+            'limit': limit,
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more']
+        }), LISTING_TAG), etag)
         
     except Exception as e:
         return jsonify({'error': 'Failed to fetch properties', 'details': str(e)}), 500
 
+@properties_bp.route('/properties/search', methods=['GET'])
+@jwt_required()
+def search_properties():
+    """
+    Search available properties with composable filters and sorting.
+    
+    Filters and sort options are documented on build_property_search; they
+    compile into a single query that is paginated with limit/cursor exactly
+    like GET /api/properties. With q= and no explicit sort, results are
+    ranked by text relevance; near= and bbox= searches are ordered by
+    distance and include distance_km. Bodies are shared through the
+    response cache.
+    """
+    try:
+        Property = current_app.Property
+        
+        cache_key = listing_cache_key('properties/search', get_collection_version(PROPERTIES_COLLECTION),
+                                      request.args)
+        cached = _cached_listing(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            search = build_property_search(Property, request.args)
+            serializer = _property_serializer()
+            limit = parse_limit(
+                request.args.get('limit'),
+                default=current_app.config.get('PROPERTIES_PAGE_SIZE', 20),
+                maximum=current_app.config.get('PROPERTIES_MAX_PAGE_SIZE', 100)
+            )
+        except (SearchParameterError, FieldSelectionError) as e:
+            return jsonify({'error': str(e)}), 400
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        
+        extra_columns = []
+        if not search.ranked:
+            extra_columns.append(search.sort_column)
+        if search.origin:
+            extra_columns.extend([Property.latitude, Property.longitude])
+        query = serializer.select(search.query, *extra_columns)
+        try:
+            if search.ranked:
+                page = paginate_offset(query, limit, request.args.get('cursor'))
+            else:
+                page = paginate_keyset(query, search.sort_column, Property.id, limit,
+                                       request.args.get('cursor'), descending=search.descending)
+        except InvalidCursorError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        properties = serializer.serialize_rows(page['items'])
+        if search.origin:
+            # Exact great-circle distance for the rows on this page only
+            for item, row in zip(properties, page['items']):
+                item['distance_km'] = round(haversine_km(
+                    search.origin[0], search.origin[1], row.latitude, row.longitude
+                ), 3)
+        
+        return _cache_listing(cache_key, json_response({
+            'properties': properties,
+            'count': len(page['items']),
+            'limit': limit,
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more']
+        }), LISTING_TAG)
+        
+    except Exception as e:
+        return jsonify({'error': 'Failed to search properties', 'details': str(e)}), 500
+
 @properties_bp.route('/landlord/properties', methods=['GET'])
 @jwt_required()
 @role_required(['landlord', 'admin'])
 def get_landlord_properties():
-    """Get properties for the current landlord."""
+    """Get properties for the current landlord, with ETag revalidation."""
     try:
-        # Get user info from JWT token
-        user_info = get_jwt_identity()
-        if isinstance(user_info, str):
-            user_info = json.loads(user_info)
-        
-        landlord_id = user_info.get('user_id')
+        landlord_id = get_current_identity().user_id
         Property = current_app.Property
         
-        properties = Property.query.filter_by(landlord_id=landlord_id).all()
-        
-        return jsonify({
-            'properties': [property.to_dict() for property in properties],
+        version = get_collection_version(landlord_properties_collection(landlord_id))
+        etag = collection_etag(version)
+        if etag_matches(etag):
+            return not_modified_response(etag)
+        
+        cache_key = listing_cache_key(f'landlord/{landlord_id}/properties', version, request.args)
+        cached = _cached_listing(cache_key)
+        if cached is not None:
+            return with_validators(cached, etag)
+        
+        try:
+            serializer = _property_serializer()
+        except FieldSelectionError as e:
+            return jsonify({'error': str(e)}), 400
+        rows = serializer.select(Property.query.filter_by(landlord_id=landlord_id)).all()
+        properties = serializer.serialize_rows(rows)
+        
+        return with_validators(_cache_listing(cache_key, json_response({
+            'properties': properties,
             'count': len(properties)
-        }), 200
+        }), landlord_tag(landlord_id)), etag)
         
     except Exception as e:
         return jsonify({'error': 'Failed to fetch landlord properties', 'details': str(e)}), 500
@@ -58,12 +229,7 @@ def get_landlord_properties():
 def create_property():
     """Create a new property."""
     try:
-        # Get user info from JWT token
-        user_info = get_jwt_identity()
-        if isinstance(user_info, str):
-            user_info = json.loads(user_info)
-        
-        landlord_id = user_info.get('user_id')
+        landlord_id = get_current_identity().user_id
         
         # Get data from request
         data = request.get_json()
@@ -105,6 +271,7 @@ def create_property():
         # Save to database
         current_app.db.session.add(new_property)
         current_app.db.session.commit()
+        _invalidate_listings(landlord_id)
         
         return jsonify({
             'message': 'Property created successfully',
@@ -121,12 +288,7 @@ def create_property():
 def update_property(property_id):
     """Update a property."""
     try:
-        # Get user info from JWT token
-        user_info = get_jwt_identity()
-        if isinstance(user_info, str):
-            user_info = json.loads(user_info)
-        
-        landlord_id = user_info.get('user_id')
+        landlord_id = get_current_identity().user_id
         Property = current_app.Property
         
         # Find property
@@ -176,6 +338,7 @@ def update_property(property_id):
         
         # Save to database
         current_app.db.session.commit()
+        _invalidate_listings(landlord_id)
         
         return jsonify({
             'message': 'Property updated successfully',
@@ -192,12 +355,7 @@ def update_property(property_id):
 def delete_property(property_id):
     """Delete a property."""
     try:
-        # Get user info from JWT token
-        user_info = get_jwt_identity()
-        if isinstance(user_info, str):
-            user_info = json.loads(user_info)
-        
-        landlord_id = user_info.get('user_id')
+        landlord_id = get_current_identity().user_id
         Property = current_app.Property
         
         # Find property
@@ -208,6 +366,7 @@ def delete_property(property_id):
         # Delete property
         current_app.db.session.delete(property)
         current_app.db.session.commit()
+        _invalidate_listings(landlord_id)
         
         return jsonify({'message': 'Property deleted successfully'}), 200
         
@@ -218,15 +377,39 @@ def delete_property(property_id):
 @properties_bp.route('/properties/<int:property_id>', methods=['GET'])
 @jwt_required()
 def get_property(property_id):
-    """Get a specific property by ID."""
+    """
+    Get a specific property by ID, optionally narrowed with fields=.
+    
+    Honors If-Modified-Since against the property's updated_at.
+    """
     try:
         Property = current_app.Property
-        property = Property.query.get(property_id)
+        try:
+            fields = parse_fields(Property, request.args.get('fields'))
+        except FieldSelectionError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Check freshness with a single-column lookup before loading the row
+        updated_at = current_app.db.session.execute(
+            select(Property.updated_at).where(Property.id == property_id)
+        ).scalar()
+        if updated_at is None:
+            return jsonify({'error': 'Property not found'}), 404
+        if not_modified_since(updated_at):
+            return not_modified_response(last_modified=updated_at)
         
+        if fields is None:
+            property = Property.query.get(property_id)
+            if not property:
+                return jsonify({'error': 'Property not found'}), 404
+            return with_validators(jsonify({'property': property.to_dict()}), last_modified=updated_at), 200
+        
+        serializer = get_serializer(Property, fields)
+        property = Property.query.options(*serializer.load_options()).filter_by(id=property_id).first()
         if not property:
             return jsonify({'error': 'Property not found'}), 404
-        
-        return jsonify({'property': property.to_dict()}), 200
+        return with_validators(json_response({'property': serializer.serialize_objects([property])[0]}),
+                               last_modified=updated_at)
         
     except Exception as e:
         return jsonify({'error': 'Failed to fetch property', 'details': str(e)}), 500
@@ -237,15 +420,14 @@ def get_property_landlord(property_id):
     """Get landlord details for a specific property."""
     try:
         Property = current_app.Property
-        User = current_app.User
         
         # Get the property
         property = Property.query.get(property_id)
         if not property:
             return jsonify({'error': 'Property not found'}), 404
         
-        # Get the landlord
-        landlord = User.query.get(property.landlord_id)
+        # Get the landlord (memoized/cached; often the caller themselves)
+        landlord = load_user(property.landlord_id)
         if not landlord:
             return jsonify({'error': 'Landlord not found'}), 404
         
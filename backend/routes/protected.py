@@ -3,9 +3,10 @@ Protected routes with role-based access control.
 """
 
 from flask import Blueprint, jsonify, request, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from functools import wraps
-import json
+
+from auth.identity import get_current_identity
 
 from models.user import User
 
@@ -24,14 +25,13 @@ def role_required(allowed_roles):
         def decorated_function(*args, **kwargs):
             try:
                 # Get current user from JWT token
-                current_user = get_jwt_identity()
+                identity = get_current_identity()
                 
-                if not current_user:
+                if not identity:
                     return jsonify({'error': 'No valid token found'}), 401
                 
-                # Parse user info from token
-                user_info = json.loads(current_user)
-                user_role = user_info.get('role')
+                user_info = identity.as_dict()
+                user_role = identity.role
                 
                 if not user_role:
                     return jsonify({'error': 'No role information in token'}), 401
@@ -54,8 +54,6 @@ def role_required(allowed_roles):
                 
                 return f(*args, **kwargs)
                 
-            except json.JSONDecodeError:
-                return jsonify({'error': 'Invalid token format'}), 401
             except Exception as e:
                 return jsonify({'error': 'Role verification failed', 'details': str(e)}), 500
         
@@ -201,12 +199,12 @@ def user_profile():
     User profile - accessible by any authenticated user.
     """
     try:
-        current_user = get_jwt_identity()
+        identity = get_current_identity()
         
-        if not current_user:
+        if not identity:
             return jsonify({'error': 'No valid token found'}), 401
         
-        user_info = json.loads(current_user)
+        user_info = identity.as_dict()
         
         return jsonify({
             'message': 'User profile retrieved successfully',
@@ -218,8 +216,6 @@ def user_profile():
             }
         }), 200
         
-    except json.JSONDecodeError:
-        return jsonify({'error': 'Invalid token format'}), 401
     except Exception as e:
         return jsonify({'error': 'Failed to retrieve profile', 'details': str(e)}), 500
 
@@ -230,12 +226,12 @@ def user_settings():
     User settings - accessible by any authenticated user.
     """
     try:
-        current_user = get_jwt_identity()
+        identity = get_current_identity()
         
-        if not current_user:
+        if not identity:
             return jsonify({'error': 'No valid token found'}), 401
         
-        user_info = json.loads(current_user)
+        user_info = identity.as_dict()
         
         if request.method == 'GET':
             return jsonify({
@@ -267,8 +263,6 @@ def user_settings():
                 'updated_settings': data
             }), 200
         
-    except json.JSONDecodeError:
-        return jsonify({'error': 'Invalid token format'}), 401
     except Exception as e:
         return jsonify({'error': 'Failed to handle settings', 'details': str(e)}), 500
 
@@ -318,12 +312,12 @@ def health_check():
     Health check endpoint - accessible by any authenticated user.
     """
     try:
-        current_user = get_jwt_identity()
+        identity = get_current_identity()
         
-        if not current_user:
+        if not identity:
             return jsonify({'error': 'No valid token found'}), 401
         
-        user_info = json.loads(current_user)
+        user_info = identity.as_dict()
         
         return jsonify({
             'status': 'healthy',
@@ -336,7 +330,5 @@ def health_check():
             'timestamp': '2025-08-27T14:00:00Z'
         }), 200
         
-    except json.JSONDecodeError:
-        return jsonify({'error': 'Invalid token format'}), 401
     except Exception as e:
         return jsonify({'error': 'Health check failed', 'details': str(e)}), 500
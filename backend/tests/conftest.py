@@ -1,8 +1,12 @@
 import pytest
 import tempfile
 import os
+import json
+from flask_jwt_extended import create_access_token
 from app import create_app, db
+from auth.identity import TokenIdentity
 from config import TestingConfig
+from models.user import UserRole, ApprovalStatus
 
 def create_test_app():
     """Create a test app with TestingConfig."""
@@ -40,3 +44,31 @@ def app_context(app):
     """Application context for testing."""
     with app.app_context():
         yield app
+
+def create_landlord(app, username='landlord1'):
+    """Create an approved landlord and return (user, auth headers)."""
+    user = app.User(
+        username=username,
+        email=f'{username}@example.com',
+        phone='0712345678',
+        password='not-a-real-hash',
+        role=UserRole.LANDLORD,
+        approval_status=ApprovalStatus.APPROVED
+    )
+    db.session.add(user)
+    db.session.commit()
+
+    token = create_access_token(identity=json.dumps({
+        'user_id': user.id,
+        'username': user.username,
+        'role': user.role.value
+    }))
+    return user, {'Authorization': f'Bearer {token}'}
+
+@pytest.fixture
+def admin_headers(app):
+    """Auth headers for an approved admin named admin1."""
+    admin, _ = create_landlord(app, 'admin1')
+    admin.role = UserRole.ADMIN
+    db.session.commit()
+    return {'Authorization': f'Bearer {create_access_token(identity=TokenIdentity.from_user(admin))}'}
@@ -482,3 +482,48 @@ def test_login_no_data(client):
     
     assert response.status_code == 400
     assert 'Content-Type must be application/json' in response.data.decode()
+
+@pytest.mark.unit
+def test_register_duplicates_rejected_by_single_insert(app, client):
+    """Test that duplicates map to 409 without SELECTs before the INSERT."""
+    from sqlalchemy import event
+    from app import db
+    
+    base = {'phone': '0712345678', 'password': 'password123'}
+    assert client.post('/auth/register', json={**base, 'username': 'unique1', 'email': 'unique1@example.com'}).status_code == 201
+    
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        same_username = client.post('/auth/register', json={**base, 'username': 'unique1', 'email': 'other@example.com'})
+        same_email = client.post('/auth/register', json={**base, 'username': 'unique2', 'email': 'unique1@example.com'})
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    
+    assert same_username.status_code == 409
+    assert 'Username already exists' in same_username.get_json()['error']
+    assert same_email.status_code == 409
+    assert 'Email already exists' in same_email.get_json()['error']
+    assert not [s for s in statements if s.lstrip().upper().startswith('SELECT')]
+
+@pytest.mark.unit
+def test_duplicate_field_ignores_submitted_values():
+    """Test that the duplicate column comes from the constraint, not the quoted values."""
+    from types import SimpleNamespace
+    from sqlalchemy.exc import IntegrityError
+    from routes.auth import _duplicate_user_field
+    
+    class PostgresError(Exception):
+        diag = SimpleNamespace(constraint_name='ix_users_username')
+    
+    postgres = IntegrityError('INSERT', {}, PostgresError(
+        'duplicate key value violates unique constraint "ix_users_username"\n'
+        'DETAIL:  Key (username)=(email_fan) already exists.'))
+    sqlite = IntegrityError('INSERT', {}, Exception('UNIQUE constraint failed: users.username'))
+    other = IntegrityError('INSERT', {}, Exception('NOT NULL constraint failed: users.email_note'))
+    
+    assert _duplicate_user_field(postgres) == 'username'
+    assert _duplicate_user_field(sqlite) == 'username'
+    assert _duplicate_user_field(other) is None
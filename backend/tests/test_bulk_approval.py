@@ -0,0 +1,47 @@
+import pytest
+from app import db
+from models.user import ApprovalStatus
+from tests.conftest import create_landlord
+
+
+@pytest.mark.unit
+def test_bulk_approval_reports_each_id(app, client, admin_headers):
+    """Test that pending users change in one call and the rest are explained."""
+    pending = []
+    for i in range(3):
+        user, _ = create_landlord(app, f'pending{i}')
+        user.approval_status = ApprovalStatus.PENDING
+        pending.append(user)
+    approved, _ = create_landlord(app, 'already')
+    db.session.commit()
+    ids = [user.id for user in pending]
+
+    response = client.post('/auth/admin/bulk-approval', headers=admin_headers, json={
+        'action': 'approve', 'user_ids': ids + [approved.id, 9999, ids[0]]
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['updated'] == 3
+    assert body['results'] == [
+        *({'id': user_id, 'status': 'approved'} for user_id in ids),
+        {'id': approved.id, 'status': 'not_pending', 'approval_status': 'approved'},
+        {'id': 9999, 'status': 'not_found'},
+    ]
+    db.session.expire_all()
+    assert {user.approval_status for user in pending} == {ApprovalStatus.APPROVED}
+
+
+@pytest.mark.unit
+def test_bulk_approval_validation(app, client, admin_headers):
+    """Test admin-only access and payload validation."""
+    landlord, landlord_headers = create_landlord(app, 'landlord1')
+
+    assert client.post('/auth/admin/bulk-approval', headers=landlord_headers,
+                       json={'action': 'reject', 'user_ids': [1]}).status_code == 403
+    assert client.post('/auth/admin/bulk-approval', headers=admin_headers,
+                       json={'action': 'ban', 'user_ids': [1]}).status_code == 400
+    assert client.post('/auth/admin/bulk-approval', headers=admin_headers,
+                       json={'action': 'reject', 'user_ids': ['1']}).status_code == 400
+    assert client.post('/auth/admin/bulk-approval', headers=admin_headers,
+                       json={'action': 'reject', 'user_ids': []}).status_code == 400
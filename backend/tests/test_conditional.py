@@ -0,0 +1,63 @@
+import pytest
+from app import db
+from tests.conftest import create_landlord
+from tests.test_properties import create_properties
+
+
+@pytest.mark.unit
+def test_listing_etag_304_until_collection_changes(app, client):
+    """Test that If-None-Match gets a 304 until a property is written."""
+    landlord, headers = create_landlord(app)
+    prop, = create_properties(app, landlord, 1)
+
+    first = client.get('/api/properties?limit=5', headers=headers)
+    etag = first.headers['ETag']
+    cached = client.get('/api/properties?limit=5', headers={**headers, 'If-None-Match': etag})
+    other_query = client.get('/api/properties?limit=6', headers={**headers, 'If-None-Match': etag})
+
+    assert cached.status_code == 304
+    assert cached.data == b''
+    assert other_query.status_code == 200
+
+    prop.set_amenities(['Gym'])
+    db.session.commit()
+    changed = client.get('/api/properties?limit=5', headers={**headers, 'If-None-Match': etag})
+
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+
+@pytest.mark.unit
+def test_landlord_listing_etag_is_per_landlord(app, client):
+    """Test that one landlord's writes do not invalidate another's listing."""
+    landlord, headers = create_landlord(app)
+    other, _ = create_landlord(app, 'landlord2')
+    create_properties(app, landlord, 1)
+
+    etag = client.get('/api/landlord/properties', headers=headers).headers['ETag']
+    create_properties(app, other, 1)
+    cached = client.get('/api/landlord/properties', headers={**headers, 'If-None-Match': etag})
+    create_properties(app, landlord, 1)
+    changed = client.get('/api/landlord/properties', headers={**headers, 'If-None-Match': etag})
+
+    assert cached.status_code == 304
+    assert changed.status_code == 200
+    assert changed.get_json()['count'] == 2
+
+
+@pytest.mark.unit
+def test_property_if_modified_since(app, client):
+    """Test that a single property honours If-Modified-Since."""
+    landlord, headers = create_landlord(app)
+    prop, = create_properties(app, landlord, 1)
+
+    first = client.get(f'/api/properties/{prop.id}', headers=headers)
+    last_modified = first.headers['Last-Modified']
+    cached = client.get(f'/api/properties/{prop.id}',
+                        headers={**headers, 'If-Modified-Since': last_modified})
+    stale = client.get(f'/api/properties/{prop.id}',
+                       headers={**headers, 'If-Modified-Since': 'Sat, 01 Jan 2000 00:00:00 GMT'})
+
+    assert cached.status_code == 304
+    assert stale.status_code == 200
+    assert client.get('/api/properties/999999', headers=headers).status_code == 404
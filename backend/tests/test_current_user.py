@@ -0,0 +1,119 @@
+import queue
+import time
+
+import pytest
+from flask_jwt_extended import create_access_token
+from app import db
+from auth.current_user import RedisUserCache, UserCache
+from auth.identity import TokenIdentity
+from models.user import ApprovalStatus, UserRole
+from tests.conftest import create_landlord
+
+
+@pytest.mark.unit
+def test_current_user_served_from_cache_across_requests(app, client):
+    """Test that repeat requests re-attach the cached user without a lookup."""
+    landlord, headers = create_landlord(app)
+
+    first = client.get('/auth/me', headers=headers)
+    db.session.expunge_all()
+    second = client.get('/auth/me?fields=username,email', headers=headers)
+
+    assert first.status_code == 200
+    assert second.get_json()['user'] == {'id': landlord.id, 'username': 'landlord1',
+                                         'email': 'landlord1@example.com'}
+    stats = app.user_cache.stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+
+
+@pytest.mark.unit
+def test_user_cache_invalidated_on_approve_and_delete(app, client):
+    """Test that approving or deleting a user drops its cached row."""
+    admin, _ = create_landlord(app, 'admin1')
+    admin.role = UserRole.ADMIN
+    admin_token = create_access_token(identity=TokenIdentity.from_user(admin))
+    admin_headers = {'Authorization': f'Bearer {admin_token}'}
+    pending, pending_headers = create_landlord(app, 'pending1')
+    pending.approval_status = ApprovalStatus.PENDING
+    db.session.commit()
+
+    client.get('/auth/me', headers=pending_headers)
+    approved = client.post(f'/auth/admin/approve-user/{pending.id}', headers=admin_headers)
+    assert approved.status_code == 200
+    assert app.user_cache.stats()['invalidations'] == 1
+
+    client.get('/auth/me', headers=pending_headers)
+    deleted = client.delete('/auth/delete-account', headers=pending_headers)
+    assert deleted.status_code == 200
+    assert app.user_cache.stats()['invalidations'] == 2
+
+    # Tokens of deleted users no longer authenticate
+    assert client.get('/auth/me', headers=pending_headers).status_code == 401
+
+
+@pytest.mark.unit
+def test_user_cache_expires_and_evicts(monkeypatch):
+    """Test the TTL and LRU bounds of the user cache."""
+    now = [1000.0]
+    monkeypatch.setattr('auth.current_user.time.monotonic', lambda: now[0])
+    cache = UserCache(max_entries=2, ttl=30)
+
+    cache.set(1, {'id': 1})
+    cache.set(2, {'id': 2})
+    assert cache.get(1) == {'id': 1}
+    cache.set(3, {'id': 3})  # evicts 2, the least recently used
+    assert cache.get(2) is None
+    now[0] += 31
+    assert cache.get(1) is None
+    assert cache.stats()['evictions'] == 1
+
+
+class _FakeRedis:
+    """In-process stand-in for Redis publish/subscribe."""
+
+    def __init__(self):
+        self.channels = {}
+
+    def publish(self, channel, message):
+        for subscriber in self.channels.get(channel, []):
+            subscriber.put({'data': message.encode('utf-8')})
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        redis = self
+
+        class PubSub:
+            def subscribe(self, channel):
+                self.queue = queue.Queue()
+                redis.channels.setdefault(channel, []).append(self.queue)
+
+            def get_message(self, timeout):
+                try:
+                    return self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    return None
+
+        return PubSub()
+
+
+@pytest.mark.unit
+def test_user_cache_invalidation_reaches_other_workers(monkeypatch):
+    """Test that an invalidation in one worker drops the entry in another."""
+    redis = _FakeRedis()
+    monkeypatch.setattr('auth.current_user.get_redis_client', lambda url: redis)
+    this_worker = RedisUserCache('redis://test', max_entries=10, ttl=60)
+    other_worker = RedisUserCache('redis://test', max_entries=10, ttl=60)
+
+    # Nothing is served until the listener has subscribed
+    assert other_worker.get(1) is None
+    deadline = time.monotonic() + 2
+    while not other_worker._subscribed.is_set() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    other_worker.set(1, {'id': 1, 'approval_status': 'pending'})
+    assert other_worker.get(1) is not None
+
+    this_worker.invalidate(1)
+    deadline = time.monotonic() + 2
+    while other_worker.stats()['invalidations'] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert other_worker.get(1) is None
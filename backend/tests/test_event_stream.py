@@ -0,0 +1,92 @@
+import pytest
+from models.user import ApprovalStatus
+from tests.conftest import create_landlord
+from utils.event_stream import SUBSCRIBER_QUEUE_SIZE, EventBroker, StreamLimitError, blocks_worker, event_stream
+
+
+@pytest.mark.unit
+def test_broker_fans_out_and_drops_slow_streams():
+    """Test that events reach every stream and an overflowing one is closed."""
+    broker = EventBroker(max_connections=2)
+    fast = broker.subscribe()
+    slow = broker.subscribe()
+    with pytest.raises(StreamLimitError):
+        broker.subscribe()
+
+    broker.publish('approval_changed', {'user_ids': [1]})
+    assert fast.get_nowait() == {'event': 'approval_changed', 'data': {'user_ids': [1]}}
+
+    for _ in range(SUBSCRIBER_QUEUE_SIZE + 1):
+        broker.publish('tick', {})
+        if not fast.empty():
+            fast.get_nowait()
+    assert broker.stats()['connections'] == 1
+    assert broker.stats()['dropped_streams'] == 1
+    frames = list(event_stream(broker, slow, keepalive=1, max_duration=1))
+    assert frames[0] == 'retry: 3000\n\n'
+    assert len(frames) == SUBSCRIBER_QUEUE_SIZE
+
+
+@pytest.mark.unit
+def test_event_stream_sends_keepalives_until_deadline():
+    """Test that an idle stream sends comments and unsubscribes when it ends."""
+    broker = EventBroker()
+    subscriber = broker.subscribe()
+    broker.publish('user_registered', {'user': {'id': 7}})
+
+    frames = list(event_stream(broker, subscriber, keepalive=0.01, max_duration=0.05))
+
+    assert frames[1] == 'event: user_registered\ndata: {"user":{"id":7}}\n\n'
+    assert ': keepalive\n\n' in frames
+    assert broker.stats()['connections'] == 0
+
+
+@pytest.mark.unit
+def test_admin_events_requires_admin(app, client, admin_headers):
+    """Test that only admins may open the event stream."""
+    _, headers = create_landlord(app)
+
+    assert client.get('/auth/admin/events').status_code == 401
+    assert client.get('/auth/admin/events', headers=headers).status_code == 403
+
+    app.config['SSE_MAX_DURATION'] = 0
+    response = client.get('/auth/admin/events', headers=admin_headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    assert response.get_data(as_text=True) == 'retry: 3000\n\n'
+
+
+@pytest.mark.unit
+def test_admin_events_refused_on_sync_workers(app, client, admin_headers):
+    """Test that streams are refused when they would hold a sync worker."""
+    response = client.get('/auth/admin/events', headers=admin_headers,
+                          environ_base={'SERVER_SOFTWARE': 'gunicorn/23.0.0'})
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '30'
+    assert blocks_worker({'SERVER_SOFTWARE': 'gunicorn/23.0.0'})
+    assert not blocks_worker({'SERVER_SOFTWARE': 'Werkzeug/2.3.7'})
+
+
+@pytest.mark.unit
+def test_review_actions_publish_events(app, client, admin_headers):
+    """Test that signups and approvals are pushed to open streams."""
+    subscriber = app.event_broker.subscribe()
+
+    registered = client.post('/auth/register', json={
+        'username': 'newtenant', 'email': 'newtenant@example.com',
+        'phone': '5551234567', 'password': 'password123', 'role': 'tenant',
+    })
+    assert registered.status_code == 201
+    event = subscriber.get_nowait()
+    assert event['event'] == 'user_registered'
+    user_id = event['data']['user']['id']
+    assert event['data']['user']['username'] == 'newtenant'
+    assert 'password' not in event['data']['user']
+
+    client.post(f'/auth/admin/approve-user/{user_id}', headers=admin_headers)
+    assert subscriber.get_nowait() == {
+        'event': 'approval_changed',
+        'data': {'user_ids': [user_id], 'approval_status': ApprovalStatus.APPROVED.value},
+    }
+    app.event_broker.unsubscribe(subscriber)
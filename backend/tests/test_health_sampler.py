@@ -0,0 +1,70 @@
+import time
+
+import pytest
+from utils.health_sampler import HealthSampler
+
+
+@pytest.mark.unit
+def test_inline_sampler_runs_checks_per_read(app):
+    """Test that an interval of 0 samples on every read and never goes stale."""
+    calls = []
+    sampler = HealthSampler(app, {'database': lambda: calls.append(1) or {'status': 'ok'}}, interval=0)
+
+    sampler.snapshot()
+    snapshot = sampler.snapshot()
+
+    assert len(calls) == 2
+    assert snapshot['database'] == {'status': 'ok'}
+    assert snapshot['snapshot']['stale'] is False
+
+
+@pytest.mark.unit
+def test_background_sampler_serves_cached_snapshot(app):
+    """Test that reads return the last sample while the thread refreshes it."""
+    calls = []
+
+    def failing():
+        raise RuntimeError('down')
+
+    sampler = HealthSampler(app, {
+        'database': lambda: calls.append(1) or {'status': 'ok', 'sample': len(calls)},
+        'redis': failing,
+    }, interval=0.05)
+
+    try:
+        first = sampler.snapshot()
+        assert first['database']['sample'] == 1
+        assert first['redis'] == {'status': 'error', 'error': 'down'}
+        assert sampler.snapshot()['database']['sample'] == 1
+
+        deadline = time.monotonic() + 2
+        while len(calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        snapshot = sampler.snapshot()
+        assert snapshot['database']['sample'] >= 2
+        assert snapshot['snapshot']['age_seconds'] < 1
+        assert sampler.stats()['running'] is True
+    finally:
+        sampler.close()
+    assert sampler.stats()['running'] is False
+
+
+@pytest.mark.unit
+def test_stale_snapshot_degrades_healthz(app, client):
+    """Test that /healthz serves the snapshot and reports a stale one as degraded."""
+    sampler = HealthSampler(app, {
+        'database': lambda: {'status': 'ok'},
+        'redis': lambda: {'status': 'not_configured'},
+        'system': lambda: {'cpu': {'usage_percent': 1.0}},
+    }, interval=60, stale_after=0)
+    app.health_sampler = sampler
+
+    try:
+        response = client.get('/healthz')
+    finally:
+        sampler.close()
+
+    assert response.status_code == 200
+    assert response.json['status'] == 'degraded'
+    assert response.json['snapshot']['stale'] is True
+    assert response.json['system'] == {'cpu': {'usage_percent': 1.0}}
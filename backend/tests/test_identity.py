@@ -0,0 +1,53 @@
+import pytest
+from flask_jwt_extended import decode_token
+from tests.conftest import create_landlord
+
+
+@pytest.mark.unit
+def test_issued_tokens_carry_structured_claims(app, client):
+    """Test that sub is the user id and role/username are top-level claims."""
+    response = client.post('/auth/register', json={
+        'username': 'claims',
+        'email': 'claims@example.com',
+        'phone': '0712345678',
+        'password': 'password123',
+        'role': 'admin'
+    })
+    user_id = response.get_json()['user']['id']
+    tokens = response.get_json()['tokens']
+
+    with app.app_context():
+        claims = decode_token(tokens['access_token'])
+        refresh_claims = decode_token(tokens['refresh_token'])
+
+    assert claims['sub'] == str(user_id)
+    assert claims['role'] == 'admin'
+    assert claims['username'] == 'claims'
+    assert refresh_claims['sub'] == str(user_id)
+
+    refreshed = client.post('/auth/refresh', headers={
+        'Authorization': f'Bearer {tokens["refresh_token"]}'
+    })
+    with app.app_context():
+        refreshed_claims = decode_token(refreshed.get_json()['access_token'])
+    assert refreshed_claims['role'] == 'admin'
+
+    validate = client.post('/auth/validate', headers={
+        'Authorization': f'Bearer {tokens["access_token"]}'
+    })
+    assert validate.get_json()['user'] == {'user_id': user_id, 'username': 'claims', 'role': 'admin'}
+
+
+@pytest.mark.unit
+def test_legacy_subject_tokens(app, client):
+    """Test that JSON-string subjects verify only while legacy support is on."""
+    with app.app_context():
+        landlord, headers = create_landlord(app)
+
+    accepted = client.post('/auth/validate', headers=headers)
+    assert accepted.status_code == 200
+    assert accepted.get_json()['user']['user_id'] == landlord.id
+
+    app.config['JWT_ACCEPT_LEGACY_SUBJECT'] = False
+    rejected = client.post('/auth/validate', headers=headers)
+    assert rejected.status_code == 401
@@ -0,0 +1,92 @@
+import threading
+import zipfile
+import pytest
+from loguru import logger
+from utils.log_pipeline import LogPipeline, RotatingFileOutput
+
+
+class BlockingOutput:
+    """Collects batches, holding the writer on the first until released."""
+
+    def __init__(self):
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, lines):
+        self.started.set()
+        self.release.wait(5)
+        self.batches.append(list(lines))
+
+    def close(self):
+        pass
+
+
+@pytest.mark.unit
+def test_pipeline_batches_lines():
+    """Test that queued lines are written in batches and flushed on close."""
+    output = BlockingOutput()
+    output.release.set()
+    pipeline = LogPipeline({'console': output}, batch_size=100, flush_interval=0.05)
+
+    for n in range(10):
+        pipeline.put('console', f'line {n}\n')
+    pipeline.close()
+
+    assert [line for batch in output.batches for line in batch] == [f'line {n}\n' for n in range(10)]
+    assert len(output.batches) < 10
+    assert pipeline.stats()['written'] == 10
+
+
+@pytest.mark.unit
+def test_pipeline_full_queue_policies():
+    """Test that a full queue drops info lines and holds errors briefly."""
+    output = BlockingOutput()
+    pipeline = LogPipeline({'console': output}, max_queue=2, flush_interval=0,
+                           policy='drop', block_timeout=0.05)
+
+    pipeline.put('console', 'first\n')
+    assert output.started.wait(5)
+    pipeline.put('console', 'second\n')
+    pipeline.put('console', 'third\n')
+    pipeline.put('console', 'dropped\n')
+    pipeline.put('console', 'error that timed out\n', level=40)
+    output.release.set()
+    pipeline.close()
+
+    written = [line for batch in output.batches for line in batch]
+    assert written == ['first\n', 'second\n', 'third\n']
+    assert pipeline.stats()['dropped'] == 2
+
+
+@pytest.mark.unit
+def test_rotating_file_output_compresses(tmp_path):
+    """Test that the log file is rotated into a zip archive."""
+    path = tmp_path / 'logs' / 'app.log'
+    output = RotatingFileOutput(str(path), max_bytes=64)
+
+    output.write(['x' * 40 + '\n', 'y' * 40 + '\n'])
+    output.write(['after rotation\n'])
+    output.close()
+
+    archives = list((tmp_path / 'logs').glob('app.*.log.zip'))
+    assert len(archives) == 1
+    with zipfile.ZipFile(archives[0]) as archive:
+        assert archive.read(archive.namelist()[0]).decode().count('\n') == 2
+    assert path.read_text() == 'after rotation\n'
+
+
+@pytest.mark.unit
+def test_one_access_record_per_request(app, client):
+    """Test that a request logs a single combined access record."""
+    messages = []
+    handler_id = logger.add(lambda message: messages.append(message.record), level='INFO')
+    try:
+        client.get('/auth/me')
+    finally:
+        logger.remove(handler_id)
+
+    access = [record for record in messages if record['message'].startswith('GET /auth/me')]
+    assert len(access) == 1
+    assert access[0]['message'] == f"GET /auth/me 401 {access[0]['extra']['extra']['duration_ms']}ms"
+    assert not any(record['message'] == 'Request started' for record in messages)
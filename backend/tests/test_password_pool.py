@@ -0,0 +1,165 @@
+import pytest
+import threading
+import time
+from app import db
+from auth.password_pool import PasswordPool, PasswordPoolBusyError
+from auth.utils import hash_password, verify_password
+from models.user import UserRole, ApprovalStatus
+
+
+@pytest.mark.unit
+def test_pool_hashes_in_worker_process():
+    """Test that hashing and verification round-trip through worker processes."""
+    import auth.password_pool as password_pool
+
+    pool = PasswordPool(workers=1, max_queue=2, timeout=30)
+    previous, password_pool._pool = password_pool._pool, pool
+    try:
+        hashed = hash_password('correct horse')
+        assert verify_password('correct horse', hashed)
+        assert not verify_password('wrong horse', hashed)
+        stats = pool.stats()
+        assert stats['completed'] == 3
+        assert stats['latency_ms']['p50'] > 0
+    finally:
+        password_pool._pool = previous
+        pool.shutdown()
+
+
+@pytest.mark.unit
+def test_pool_rejects_when_queue_full():
+    """Test that calls beyond workers + max_queue are rejected immediately."""
+    pool = PasswordPool(workers=0, max_queue=0, timeout=5)
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.3)
+
+    worker = threading.Thread(target=pool.run, args=(slow,))
+    worker.start()
+    started.wait()
+    try:
+        with pytest.raises(PasswordPoolBusyError) as excinfo:
+            pool.run(time.sleep, 0)
+        assert excinfo.value.retry_after >= 1
+        assert pool.stats()['in_flight'] == 1
+    finally:
+        worker.join()
+    assert pool.stats()['rejected'] == 1
+
+
+@pytest.mark.unit
+def test_login_returns_503_when_pool_busy(app, client, monkeypatch):
+    """Test that a saturated pool surfaces as 503 with Retry-After."""
+    import auth.password_pool as password_pool
+
+    user = app.User(username='busy', email='busy@example.com', phone='0712345678',
+                    password=hash_password('password123'), role=UserRole.TENANT,
+                    approval_status=ApprovalStatus.APPROVED)
+    db.session.add(user)
+    db.session.commit()
+
+    saturated = PasswordPool(workers=0, max_queue=0, timeout=5)
+    saturated._slots.acquire()
+    monkeypatch.setattr(password_pool, '_pool', saturated)
+
+    response = client.post('/auth/login', json={'email': 'busy@example.com', 'password': 'password123'})
+
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) >= 1
+
+
+@pytest.mark.unit
+def test_bcrypt_cost_helpers(app):
+    """Test cost parsing, the rehash check and calibration bounds."""
+    from auth.utils import calibrate_bcrypt_rounds, get_hash_rounds, needs_rehash
+
+    hashed = hash_password('password123', rounds=5)
+
+    assert get_hash_rounds(hashed) == 5
+    assert get_hash_rounds('not-a-hash') is None
+    assert not needs_rehash(hashed)           # test config targets cost 4
+    assert not needs_rehash(hashed, rounds=5)
+    assert needs_rehash(hashed, rounds=6)
+    assert needs_rehash('not-a-hash')
+    assert calibrate_bcrypt_rounds(target_ms=0, min_rounds=4, max_rounds=6) == 4
+    assert calibrate_bcrypt_rounds(target_ms=10_000, min_rounds=4, max_rounds=6) == 6
+
+
+@pytest.mark.unit
+def test_login_rehashes_to_target_cost(app, client):
+    """Test that a successful login raises a hash below the target cost, and never lowers one."""
+    from auth.utils import get_hash_rounds
+
+    user = app.User(username='rehash', email='rehash@example.com', phone='0712345678',
+                    password=hash_password('password123', rounds=4), role=UserRole.TENANT,
+                    approval_status=ApprovalStatus.APPROVED)
+    db.session.add(user)
+    db.session.commit()
+    app.config['BCRYPT_ROUNDS'] = 5
+
+    wrong = client.post('/auth/login', json={'email': 'rehash@example.com', 'password': 'nope123'})
+    assert wrong.status_code == 401
+    assert get_hash_rounds(db.session.get(app.User, user.id).password) == 4
+
+    response = client.post('/auth/login', json={'email': 'rehash@example.com', 'password': 'password123'})
+    assert response.status_code == 200
+
+    stored = db.session.get(app.User, user.id).password
+    assert get_hash_rounds(stored) == 5
+    assert verify_password('password123', stored)
+
+    # Another instance with a lower target leaves the stronger hash alone
+    app.config['BCRYPT_ROUNDS'] = 4
+    assert client.post('/auth/login', json={'email': 'rehash@example.com', 'password': 'password123'}).status_code == 200
+    assert db.session.get(app.User, user.id).password == stored
+
+
+@pytest.mark.unit
+def test_calibrated_cost_is_recorded_once(tmp_path, monkeypatch):
+    """Test that calibration runs once and later startups read the recorded cost."""
+    from auth import utils
+
+    calls = []
+    monkeypatch.setattr(utils, 'calibrate_bcrypt_rounds', lambda target_ms: calls.append(target_ms) or 11)
+    path = str(tmp_path / 'instance' / 'bcrypt_rounds')
+
+    assert utils.load_calibrated_rounds(path, 100) == 11
+    assert utils.load_calibrated_rounds(path, 100) == 11
+    assert calls == [100]
+
+
+@pytest.mark.unit
+def test_bcrypt_rounds_env_is_range_checked(monkeypatch):
+    """Test that BCRYPT_ROUNDS outside the accepted range is rejected."""
+    from config import get_bcrypt_rounds_env
+
+    monkeypatch.setenv('BCRYPT_ROUNDS', '13')
+    assert get_bcrypt_rounds_env() == 13
+    for value in ('4', '31'):
+        monkeypatch.setenv('BCRYPT_ROUNDS', value)
+        with pytest.raises(RuntimeError):
+            get_bcrypt_rounds_env()
+
+
+@pytest.mark.unit
+def test_timed_out_call_keeps_its_slot_until_done():
+    """Test that a call the caller gave up on still counts against the cap."""
+    pool = PasswordPool(workers=1, max_queue=0, timeout=0.05)
+    try:
+        with pytest.raises(PasswordPoolBusyError, match='timed out'):
+            pool.run(time.sleep, 1.0)
+        # The sleep still occupies the only worker, so new work is refused
+        with pytest.raises(PasswordPoolBusyError, match='full'):
+            pool.run(time.sleep, 0)
+        assert pool.stats()['in_flight'] == 1
+
+        deadline = time.monotonic() + 10
+        while pool.stats()['in_flight'] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        pool.timeout = 30
+        assert pool.run(abs, -3) == 3
+        assert pool.stats()['rejected'] == 1
+    finally:
+        pool.shutdown()
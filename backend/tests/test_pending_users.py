@@ -0,0 +1,61 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from app import db
+from models.user import ApprovalStatus, UserRole
+
+
+def create_pending(app, count, role=UserRole.LANDLORD, start=datetime(2025, 1, 1, tzinfo=timezone.utc)):
+    users = []
+    for i in range(count):
+        user = app.User(
+            username=f'{role.value}{i}', email=f'{role.value}{i}@example.com', password='x',
+            role=role, approval_status=ApprovalStatus.PENDING, created_at=start + timedelta(days=i)
+        )
+        db.session.add(user)
+        users.append(user)
+    db.session.commit()
+    return users
+
+
+@pytest.mark.unit
+def test_pending_users_paginate_oldest_first(app, client, admin_headers):
+    """Test that the queue pages by cursor, oldest signup first, with a total."""
+    landlords = create_pending(app, 5)
+
+    first = client.get('/auth/admin/pending-users?limit=2&count=exact&fields=username', headers=admin_headers).get_json()
+    second = client.get(f'/auth/admin/pending-users?limit=2&cursor={first["next_cursor"]}', headers=admin_headers).get_json()
+
+    assert [u['id'] for u in first['pending_users']] == [landlords[0].id, landlords[1].id]
+    assert set(first['pending_users'][0]) == {'id', 'username'}
+    assert first['total'] == 5 and first['total_is_estimate'] is False
+    assert [u['id'] for u in second['pending_users']] == [landlords[2].id, landlords[3].id]
+    assert 'total' not in second
+
+
+@pytest.mark.unit
+def test_pending_users_filters(app, client, admin_headers):
+    """Test role and signup date filters."""
+    create_pending(app, 3)
+    tenants = create_pending(app, 3, role=UserRole.TENANT)
+
+    response = client.get('/auth/admin/pending-users?role=tenant&created_after=2025-01-02'
+                          '&created_before=2025-01-03&count=estimate', headers=admin_headers)
+
+    body = response.get_json()
+    assert [u['id'] for u in body['pending_users']] == [tenants[1].id]
+    assert body['total'] == 1
+    assert client.get('/auth/admin/pending-users?role=owner', headers=admin_headers).status_code == 400
+    assert client.get('/auth/admin/pending-users?created_after=soon', headers=admin_headers).status_code == 400
+
+
+@pytest.mark.unit
+def test_pending_users_date_filters_convert_offsets(app, client, admin_headers):
+    """Test that bounds with a UTC offset are compared in UTC."""
+    tenants = create_pending(app, 3, role=UserRole.TENANT)
+
+    # 05:00+05:00 is midnight UTC, the same bounds as 2025-01-02..2025-01-03
+    response = client.get('/auth/admin/pending-users', headers=admin_headers, query_string={
+        'created_after': '2025-01-02T05:00:00+05:00', 'created_before': '2025-01-03T05:00:00+05:00'
+    })
+
+    assert [u['id'] for u in response.get_json()['pending_users']] == [tenants[1].id]
@@ -0,0 +1,336 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from app import db
+from tests.conftest import create_landlord
+
+
+def create_properties(app, landlord, count, **overrides):
+    """Create ``count`` properties with strictly increasing created_at."""
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    properties = []
+    for i in range(count):
+        fields = {
+            'name': f'Property {i}',
+            'description': f'Description {i}',
+            'location': 'Nairobi',
+            'price': 1000.0 + i,
+            'property_type': 'apartment',
+            'bedrooms': 1 + i % 4,
+            'bathrooms': 1,
+            'landlord_id': landlord.id,
+            'created_at': base + timedelta(minutes=i),
+        }
+        fields.update(overrides)
+        properties.append(app.Property(**fields))
+    db.session.add_all(properties)
+    db.session.commit()
+    return properties
+
+
+@pytest.mark.unit
+def test_properties_first_page(app, client):
+    """Test that the listing returns the newest page and a cursor."""
+    landlord, headers = create_landlord(app)
+    create_properties(app, landlord, 5)
+
+    response = client.get('/api/properties?limit=2', headers=headers)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [p['name'] for p in data['properties']] == ['Property 4', 'Property 3']
+    assert data['count'] == 2
+    assert data['has_more'] is True
+    assert data['next_cursor']
+
+
+@pytest.mark.unit
+def test_properties_cursor_walks_every_row_once(app, client):
+    """Test that following next_cursor visits each property exactly once."""
+    landlord, headers = create_landlord(app)
+    create_properties(app, landlord, 7)
+
+    seen = []
+    cursor = None
+    while True:
+        url = '/api/properties?limit=3' + (f'&cursor={cursor}' if cursor else '')
+        data = client.get(url, headers=headers).get_json()
+        seen.extend(p['name'] for p in data['properties'])
+        cursor = data['next_cursor']
+        if not data['has_more']:
+            break
+
+    assert seen == [f'Property {i}' for i in range(6, -1, -1)]
+    assert cursor is None
+
+
+@pytest.mark.unit
+def test_properties_same_timestamp_tiebreak_on_id(app, client):
+    """Test that rows sharing created_at are split across pages by id."""
+    landlord, headers = create_landlord(app)
+    same_time = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    created = create_properties(app, landlord, 4, created_at=same_time)
+
+    first = client.get('/api/properties?limit=2', headers=headers).get_json()
+    second = client.get(f"/api/properties?limit=2&cursor={first['next_cursor']}", headers=headers).get_json()
+
+    ids = [p['id'] for p in first['properties'] + second['properties']]
+    assert ids == sorted((p.id for p in created), reverse=True)
+
+
+@pytest.mark.unit
+def test_properties_unpaged_flag_keeps_legacy_shape(app, client):
+    """Test that unpaged=true returns every available property."""
+    landlord, headers = create_landlord(app)
+    create_properties(app, landlord, 3)
+    create_properties(app, landlord, 1, available=False)
+
+    data = client.get('/api/properties?unpaged=true', headers=headers).get_json()
+
+    assert data['count'] == 3
+    assert 'next_cursor' not in data
+
+
+@pytest.mark.unit
+def test_properties_invalid_cursor(app, client):
+    """Test that a tampered cursor is rejected."""
+    _, headers = create_landlord(app)
+
+    response = client.get('/api/properties?cursor=not-a-cursor', headers=headers)
+
+    assert response.status_code == 400
+
+
+@pytest.mark.unit
+def test_search_filters_compose(app, client):
+    """Test that price, bedroom, type and amenity filters combine."""
+    landlord, headers = create_landlord(app)
+    props = create_properties(app, landlord, 8)
+    props[5].set_amenities(['Wi-Fi', 'Parking'])
+    props[6].set_amenities(['Parking'])
+    props[6].property_type = 'house'
+    db.session.commit()
+
+    response = client.get(
+        '/api/properties/search?min_price=1002&max_price=1006&min_bedrooms=2'
+        '&property_type=apartment&amenities=Parking',
+        headers=headers
+    )
+
+    assert response.status_code == 200
+    assert [p['name'] for p in response.get_json()['properties']] == ['Property 5']
+
+
+@pytest.mark.unit
+def test_search_sort_by_price_pages_with_cursor(app, client):
+    """Test that price sorting paginates in price order."""
+    landlord, headers = create_landlord(app)
+    props = create_properties(app, landlord, 5)
+    for prop, price in zip(props, [300, 100, 500, 200, 400]):
+        prop.price = price
+    db.session.commit()
+
+    first = client.get('/api/properties/search?sort=price_asc&limit=3', headers=headers).get_json()
+    second = client.get(
+        f"/api/properties/search?sort=price_asc&limit=3&cursor={first['next_cursor']}",
+        headers=headers
+    ).get_json()
+
+    prices = [p['price'] for p in first['properties'] + second['properties']]
+    assert prices == [100, 200, 300, 400, 500]
+    assert second['has_more'] is False
+
+
+@pytest.mark.unit
+def test_search_size_sort_skips_unknown_size(app, client):
+    """Test that sorting by size only ranks listings with square footage."""
+    landlord, headers = create_landlord(app)
+    create_properties(app, landlord, 1, square_feet=900.0, name='Big')
+    create_properties(app, landlord, 1, square_feet=None, name='Unknown')
+
+    data = client.get('/api/properties/search?sort=size_desc', headers=headers).get_json()
+
+    assert [p['name'] for p in data['properties']] == ['Big']
+
+
+@pytest.mark.unit
+def test_search_rejects_bad_parameters(app, client):
+    """Test that malformed filters and sorts return 400."""
+    _, headers = create_landlord(app)
+
+    assert client.get('/api/properties/search?min_price=cheap', headers=headers).status_code == 400
+    assert client.get('/api/properties/search?sort=random', headers=headers).status_code == 400
+
+
+@pytest.mark.unit
+def test_text_search_matches_any_column(app, client):
+    """Test that q= matches name, location and description."""
+    landlord, headers = create_landlord(app)
+    create_properties(app, landlord, 1, name='Downtown Loft', location='Nairobi')
+    create_properties(app, landlord, 1, name='Garden Flat', location='Downtown Nairobi')
+    create_properties(app, landlord, 1, name='Quiet Cottage', description='Ten minutes from downtown')
+    create_properties(app, landlord, 1, name='Farm House', location='Naivasha')
+
+    data = client.get('/api/properties/search?q=downtown', headers=headers).get_json()
+
+    # Name hits outrank location hits, which outrank description hits
+    assert [p['name'] for p in data['properties']] == ['Downtown Loft', 'Garden Flat', 'Quiet Cottage']
+
+
+@pytest.mark.unit
+def test_text_search_follows_updates_and_deletes(app, client):
+    """Test that the search index tracks edits and deletions."""
+    landlord, headers = create_landlord(app)
+    prop, gone = create_properties(app, landlord, 2, name='Riverside Studio')
+    prop.name = 'Hilltop Studio'
+    db.session.delete(gone)
+    db.session.commit()
+
+    riverside = client.get('/api/properties/search?q=riverside', headers=headers).get_json()
+    hilltop = client.get('/api/properties/search?q=hill', headers=headers).get_json()
+
+    assert riverside['properties'] == []
+    assert [p['id'] for p in hilltop['properties']] == [prop.id]
+
+
+@pytest.mark.unit
+def test_text_search_combines_with_filters_and_pages(app, client):
+    """Test that q= composes with filters and paginates by relevance."""
+    landlord, headers = create_landlord(app)
+    create_properties(app, landlord, 5, name='Sunny Apartment')
+    create_properties(app, landlord, 1, name='Sunny Villa', property_type='villa')
+
+    first = client.get('/api/properties/search?q=sunny&property_type=apartment&limit=3',
+                       headers=headers).get_json()
+    second = client.get(f"/api/properties/search?q=sunny&property_type=apartment&limit=3"
+                        f"&cursor={first['next_cursor']}", headers=headers).get_json()
+
+    ids = [p['id'] for p in first['properties'] + second['properties']]
+    assert len(ids) == len(set(ids)) == 5
+    assert second['has_more'] is False
+
+
+@pytest.mark.unit
+def test_text_search_with_explicit_sort(app, client):
+    """Test that an explicit sort overrides relevance ranking."""
+    landlord, headers = create_landlord(app)
+    create_properties(app, landlord, 3, name='Sunny Apartment')
+
+    data = client.get('/api/properties/search?q=sunny&sort=price_desc', headers=headers).get_json()
+
+    assert [p['price'] for p in data['properties']] == [1002.0, 1001.0, 1000.0]
+
+
+@pytest.mark.unit
+def test_text_search_terms_span_columns(app, client, monkeypatch):
+    """Test that every word of q= must match, in any column, on both backends."""
+    from sqlalchemy.dialects import postgresql
+    from utils.text_search import apply_text_search
+
+    landlord, headers = create_landlord(app)
+    create_properties(app, landlord, 1, name='Spacious Apartment', location='Kilimani')
+    create_properties(app, landlord, 1, name='Spacious Apartment', location='Westlands')
+
+    data = client.get('/api/properties/search?q=Kilimani%20apartment', headers=headers).get_json()
+    assert [p['location'] for p in data['properties']] == ['Kilimani']
+
+    with app.app_context():
+        query = app.Property.query
+        monkeypatch.setattr(query.session, 'get_bind',
+                            lambda *args, **kwargs: type('Bind', (), {'dialect': postgresql.dialect()}))
+        query, _ = apply_text_search(query, app.Property, 'Kilimani apartment', ranked=False)
+        sql = str(query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+    assert sql.count('ILIKE') == 6
+    assert "'%%Kilimani%%'" in sql and "'%%apartment%%'" in sql
+
+
+@pytest.mark.unit
+def test_geohash_encoding_and_cover():
+    """Test geohash encoding against a known value and bbox covering."""
+    from utils.geo import encode_geohash, cover_bbox
+
+    assert encode_geohash(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+
+    cells = cover_bbox(-1.30, 36.80, -1.27, 36.84)
+    assert 0 < len(cells) <= 16
+    assert any(encode_geohash(-1.285, 36.82).startswith(cell) for cell in cells)
+
+
+@pytest.mark.unit
+def test_geohash_maintained_on_write(app):
+    """Test that the geohash follows coordinate changes."""
+    landlord, _ = create_landlord(app)
+    prop, = create_properties(app, landlord, 1, latitude=-1.2921, longitude=36.8219)
+    assert prop.geohash.startswith('kzf0')
+
+    prop.latitude = None
+    db.session.commit()
+    assert prop.geohash is None
+
+
+@pytest.mark.unit
+def test_near_search_orders_by_distance(app, client):
+    """Test that near= returns only listings inside the radius, nearest first."""
+    landlord, headers = create_landlord(app)
+    create_properties(app, landlord, 1, name='1 km', latitude=-1.2831, longitude=36.8219)
+    create_properties(app, landlord, 1, name='Centre', latitude=-1.2921, longitude=36.8219)
+    create_properties(app, landlord, 1, name='3 km', latitude=-1.2921, longitude=36.8489)
+    create_properties(app, landlord, 1, name='20 km', latitude=-1.1121, longitude=36.8219)
+    create_properties(app, landlord, 1, name='No coordinates')
+
+    data = client.get('/api/properties/search?near=-1.2921,36.8219&radius=5', headers=headers).get_json()
+
+    assert [p['name'] for p in data['properties']] == ['Centre', '1 km', '3 km']
+    assert data['properties'][0]['distance_km'] == 0
+    assert data['properties'][1]['distance_km'] == pytest.approx(1.0, abs=0.01)
+
+
+@pytest.mark.unit
+def test_bbox_search_and_validation(app, client):
+    """Test that bbox= returns listings in the viewport and rejects bad boxes."""
+    landlord, headers = create_landlord(app)
+    create_properties(app, landlord, 1, name='Inside', latitude=-1.28, longitude=36.82)
+    create_properties(app, landlord, 1, name='Outside', latitude=-1.40, longitude=36.82)
+
+    data = client.get('/api/properties/search?bbox=36.80,-1.30,36.84,-1.27', headers=headers).get_json()
+
+    assert [p['name'] for p in data['properties']] == ['Inside']
+    assert client.get('/api/properties/search?bbox=1,2,3', headers=headers).status_code == 400
+    assert client.get('/api/properties/search?near=-1.29,36.82&radius=500', headers=headers).status_code == 400
+    # A circle over the antimeridian would lose its far side if clamped
+    response = client.get('/api/properties/search?near=-17.7,179.9&radius=50', headers=headers)
+    assert response.status_code == 400
+    assert 'antimeridian' in response.get_json()['error']
+
+
+@pytest.mark.unit
+def test_amenities_and_images_round_trip(app):
+    """Test that amenity and image lists keep order and drop duplicates."""
+    landlord, _ = create_landlord(app)
+    prop, = create_properties(app, landlord, 1)
+    prop.set_amenities(['Parking', 'Wi-Fi', 'Parking', ''])
+    prop.set_images(['a.jpg', 'b.jpg'])
+    db.session.commit()
+
+    prop.set_amenities(['Wi-Fi', 'Gym'])
+    prop.set_images(['c.jpg'])
+    db.session.commit()
+    db.session.expire_all()
+
+    data = db.session.get(app.Property, prop.id).to_dict()
+    assert data['amenities'] == ['Wi-Fi', 'Gym']
+    assert data['images'] == ['c.jpg']
+    assert app.PropertyImage.query.count() == 1
+
+
+@pytest.mark.unit
+def test_search_amenities_require_all(app, client):
+    """Test that every requested amenity must be present."""
+    landlord, headers = create_landlord(app)
+    both, only_gym, _ = create_properties(app, landlord, 3)
+    both.set_amenities(['Gym', 'Pool'])
+    only_gym.set_amenities(['Gym'])
+    db.session.commit()
+
+    data = client.get('/api/properties/search?amenities=Gym,Pool', headers=headers).get_json()
+
+    assert [p['id'] for p in data['properties']] == [both.id]
@@ -0,0 +1,42 @@
+import pytest
+from middleware.security_middleware import (
+    DEFAULT_RATE_LIMITS, compile_rate_limit_policy, parse_rate_limits
+)
+
+
+@pytest.mark.unit
+def test_policy_resolves_endpoint_before_blueprint():
+    """Test that endpoint rules win over blueprint rules."""
+    policy = compile_rate_limit_policy(
+        ['auth.login', 'auth.me', 'properties.search_properties', 'health.health_check', 'static'],
+        DEFAULT_RATE_LIMITS
+    )
+
+    assert policy == {
+        'auth.login': '5 per minute',
+        'auth.me': '10 per minute',
+        'properties.search_properties': '100 per minute',
+    }
+
+
+@pytest.mark.unit
+def test_parse_rate_limit_overrides():
+    """Test parsing of the RATE_LIMITS setting."""
+    assert parse_rate_limits('') == {}
+    assert parse_rate_limits('auth.login=3 per minute; properties=200 per minute;') == {
+        'auth.login': '3 per minute', 'properties': '200 per minute'
+    }
+    with pytest.raises(ValueError):
+        parse_rate_limits('auth.login')
+
+
+@pytest.mark.unit
+def test_policy_registered_on_real_endpoints(app, client):
+    """Test that the compiled limits apply to the app's blueprints."""
+    assert app.rate_limit_policy['auth.login'] == '5 per minute'
+    assert app.rate_limit_policy['auth.bulk_approval'] == '20 per minute'
+    assert app.rate_limit_policy['properties.get_all_properties'] == '100 per minute'
+
+    statuses = [client.post('/auth/login', json={}).status_code for _ in range(6)]
+    assert statuses[:5] == [400] * 5
+    assert statuses[5] == 429
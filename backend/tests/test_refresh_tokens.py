@@ -0,0 +1,52 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from app import db
+from auth.identity import TokenIdentity
+from auth.refresh_tokens import compact_refresh_tokens, issue_refresh_token
+from tests.conftest import create_landlord
+
+
+def refresh(client, token):
+    return client.post('/auth/refresh', headers={'Authorization': f'Bearer {token}'})
+
+
+@pytest.mark.unit
+def test_refresh_rotates_and_reuse_revokes_family(app, client):
+    """Test that each refresh retires the token and replaying one kills the family."""
+    landlord, _ = create_landlord(app)
+    first = issue_refresh_token(TokenIdentity.from_user(landlord))
+
+    rotated = refresh(client, first)
+    assert rotated.status_code == 200
+    second = rotated.get_json()['refresh_token']
+    assert second != first
+
+    # Replaying the retired token revokes the family ...
+    replay = refresh(client, first)
+    assert replay.status_code == 401
+    assert 'reuse' in replay.get_json()['error']
+    # ... so the legitimate successor stops working too
+    assert refresh(client, second).status_code == 401
+
+    family = db.session.query(app.RefreshTokenFamily).one()
+    assert family.generation == 1
+    assert family.revoked_at is not None
+
+
+@pytest.mark.unit
+def test_compaction_keeps_only_live_families(app):
+    """Test that expired and revoked families are deleted in batches."""
+    landlord, _ = create_landlord(app)
+    identity = TokenIdentity.from_user(landlord)
+    for _ in range(3):
+        issue_refresh_token(identity)
+    issue_refresh_token(identity, expires_delta=timedelta(seconds=1))
+    Family = app.RefreshTokenFamily
+    revoked = db.session.query(Family).first()
+    revoked.revoked_at = datetime.now(timezone.utc)
+    db.session.commit()
+
+    deleted = compact_refresh_tokens(batch_size=1, now=datetime.now(timezone.utc) + timedelta(minutes=1))
+
+    assert deleted == 2
+    assert db.session.query(Family).count() == 2
@@ -0,0 +1,78 @@
+import pytest
+from loguru import logger
+from middleware.logging_middleware import RequestLogPolicy, parse_sample_rates
+from utils.logger import next_request_id
+
+
+def _access_records(app, client, path, **kwargs):
+    """Return the access records logged for a request to ``path``."""
+    records = []
+    handler_id = logger.add(lambda message: records.append(message.record), level='DEBUG')
+    try:
+        response = client.get(path, **kwargs)
+    finally:
+        logger.remove(handler_id)
+    return response, [record for record in records if record['message'].startswith(f'GET {path} ')]
+
+
+@pytest.mark.unit
+def test_policy_levels_and_sampling():
+    """Test that errors and slow requests always log and successes are sampled."""
+    policy = RequestLogPolicy(sample_rate=0.0, rules={'auth': 1.0, 'auth.refresh': 0.0}, slow_ms=500)
+
+    assert policy.level_for('properties.get_all_properties', 200, 10) is None
+    assert policy.level_for('properties.get_all_properties', 200, 800) == 'WARNING'
+    assert policy.level_for('properties.get_all_properties', 404, 10) == 'WARNING'
+    assert policy.level_for('properties.get_all_properties', 503, 10) == 'ERROR'
+    assert policy.level_for('auth.get_profile', 200, 10) == 'INFO'
+    assert policy.level_for('auth.refresh', 200, 10) is None
+    assert policy.level_for(None, 404, 1) == 'WARNING'
+    # Health probes are never logged, even when they fail
+    assert policy.level_for('health.health_live', 503, 10) is None
+    assert policy.level_for('protected.health_check', 200, 10) is None
+
+
+@pytest.mark.unit
+def test_policy_respects_log_level():
+    """Test that records below the configured level are skipped."""
+    policy = RequestLogPolicy(sample_rate=1.0, log_level='WARNING')
+
+    assert policy.level_for('auth.get_profile', 200, 10) is None
+    assert policy.level_for('auth.get_profile', 401, 10) == 'WARNING'
+
+
+@pytest.mark.unit
+def test_parse_sample_rates():
+    """Test parsing of REQUEST_LOG_SAMPLE_RULES."""
+    assert parse_sample_rates('auth=1; properties.search_properties=0.05;') == {
+        'auth': 1.0, 'properties.search_properties': 0.05
+    }
+    assert parse_sample_rates('auth=2') == {'auth': 1.0}
+    with pytest.raises(ValueError):
+        parse_sample_rates('auth=often')
+
+
+@pytest.mark.unit
+def test_request_ids():
+    """Test counter-based ids and reuse of valid incoming ids."""
+    first, second = next_request_id(), next_request_id()
+    assert first != second
+    assert first.split('-')[0] == second.split('-')[0]
+    assert next_request_id('lb-1234abcd') == 'lb-1234abcd'
+    assert next_request_id('not a valid id\n') != 'not a valid id\n'
+
+
+@pytest.mark.unit
+def test_middleware_skips_probes_and_samples(app, client):
+    """Test that probes are not logged and sampled-out successes are skipped."""
+    response, records = _access_records(app, client, '/health/live')
+    assert response.status_code == 200
+    assert records == []
+
+    app.request_log_policy = RequestLogPolicy(sample_rate=0.0)
+    _, records = _access_records(app, client, '/auth/me')
+    assert [record['level'].name for record in records] == ['WARNING']
+
+    response, records = _access_records(app, client, '/auth/me', headers={'X-Request-ID': 'edge-42'})
+    assert response.headers['X-Request-ID'] == 'edge-42'
+    assert records[0]['extra']['request_id'] == 'edge-42'
@@ -0,0 +1,64 @@
+import pytest
+from utils.response_cache import MemoryCacheBackend, ResponseCache
+from tests.conftest import create_landlord
+from tests.test_properties import create_properties
+
+
+@pytest.mark.unit
+def test_memory_backend_lru_ttl_and_tags(monkeypatch):
+    """Test LRU eviction, expiry and tag invalidation in the memory backend."""
+    import utils.response_cache as response_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, 'monotonic', lambda: now[0])
+    cache = ResponseCache(MemoryCacheBackend(max_entries=2), ttl=10)
+
+    cache.set('a', b'1', ['properties'])
+    cache.set('b', b'2', ['landlord:1'])
+    assert cache.get('a') == b'1'          # a is now most recently used
+    cache.set('c', b'3', ['properties'])   # evicts b
+    assert cache.get('b') is None
+
+    cache.invalidate('properties')
+    assert cache.get('a') is None and cache.get('c') is None
+
+    cache.set('d', b'4', [])
+    now[0] += 11
+    assert cache.get('d') is None
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['evictions'], stats['invalidations']) == (1, 1, 2)
+    assert stats['entries'] == 0
+
+
+@pytest.mark.unit
+def test_listing_served_from_cache_and_invalidated_on_write(app, client):
+    """Test that equivalent listing queries share an entry until a write."""
+    _, headers = create_landlord(app)
+    cache = app.response_cache
+
+    first = client.get('/api/properties?limit=5&fields=name', headers=headers)
+    second = client.get('/api/properties?fields=name&limit=5&cursor=', headers=headers)
+    assert second.data == first.data
+    assert cache.stats()['hits'] == 1
+
+    created = client.post('/api/landlord/properties', headers=headers, json={
+        'name': 'New Flat', 'location': 'Westlands', 'price': 900, 'property_type': 'apartment', 'bedrooms': 1
+    })
+    assert created.status_code == 201
+    assert cache.stats()['invalidations'] >= 1
+
+    after = client.get('/api/properties?limit=5&fields=name', headers=headers).get_json()
+    assert [p['name'] for p in after['properties']] == ['New Flat']
+
+
+@pytest.mark.unit
+def test_cache_never_serves_rows_older_than_a_commit(app, client):
+    """Test that writes outside the routes still bypass stale entries."""
+    landlord, headers = create_landlord(app)
+    client.get('/api/properties/search?q=loft', headers=headers)
+
+    create_properties(app, landlord, 1, name='Canal Loft')
+    data = client.get('/api/properties/search?q=loft', headers=headers).get_json()
+
+    assert [p['name'] for p in data['properties']] == ['Canal Loft']
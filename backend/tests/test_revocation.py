@@ -0,0 +1,144 @@
+import time
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from flask_jwt_extended import create_refresh_token
+from app import db
+from auth.identity import TokenIdentity
+from auth.revocation import BloomFilter, DatabaseRevocationBackend, RevocationStore
+from tests.conftest import create_landlord
+
+
+@pytest.mark.unit
+def test_logout_revokes_access_and_refresh_tokens(app, client):
+    """Test that tokens presented at logout stop working."""
+    landlord, headers = create_landlord(app)
+    refresh_token = create_refresh_token(identity=TokenIdentity.from_user(landlord))
+    refresh_headers = {'Authorization': f'Bearer {refresh_token}'}
+
+    response = client.post('/auth/logout', json={'refresh_token': refresh_token}, headers=headers)
+    assert response.status_code == 200
+
+    assert client.get('/auth/me', headers=headers).status_code == 401
+    assert client.post('/auth/refresh', headers=refresh_headers).status_code == 401
+    assert db.session.query(app.RevokedToken).count() == 2
+
+
+@pytest.mark.unit
+def test_unrevoked_tokens_skip_the_store(app, client):
+    """Test that the Bloom filter answers for tokens that were never revoked."""
+    landlord, headers = create_landlord(app)
+
+    for _ in range(3):
+        assert client.get('/auth/me', headers=headers).status_code == 200
+
+    stats = app.revocation_store.stats()
+    assert stats['checks'] == 3
+    assert stats['filter_negatives'] == 3
+    assert stats['store_lookups'] == 0
+
+
+@pytest.mark.unit
+def test_revocations_reach_other_workers_and_expire(app):
+    """Test sync from the shared store and pruning past exp."""
+    backend = DatabaseRevocationBackend(db, app.RevokedToken)
+    this_worker = RevocationStore(backend, bloom_capacity=100, sync_interval=0)
+    other_worker = RevocationStore(backend, bloom_capacity=100, sync_interval=0, prune_interval=0)
+    now = datetime.now(timezone.utc)
+
+    assert other_worker.is_revoked('live') is False
+    this_worker.revoke('live', now + timedelta(hours=1))
+    this_worker.revoke('stale', now - timedelta(seconds=1))
+    db.session.commit()
+
+    assert other_worker.is_revoked('live') is True
+    assert other_worker.is_revoked('stale') is False
+    assert other_worker.stats()['pruned'] == 1
+    assert db.session.query(app.RevokedToken).count() == 1
+
+
+@pytest.mark.unit
+def test_bloom_filter_has_no_false_negatives():
+    """Test that every added key is reported present and the filter stays sparse."""
+    bloom = BloomFilter(1000, 0.01)
+    keys = [f'jti-{i}' for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+class _CountingBackend:
+    """In-memory backend that counts rebuild queries."""
+
+    name = 'memory'
+    log_retention = None
+
+    def __init__(self):
+        self.revoked = {}
+        self.revoked_at = {}
+        self.rebuilds = 0
+        self.syncs = 0
+
+    def revoke(self, jti, expires_at):
+        self.revoked[jti] = expires_at
+        self.revoked_at[jti] = datetime.now(timezone.utc)
+
+    def is_revoked(self, jti):
+        return jti in self.revoked
+
+    def active_ids(self, now):
+        self.rebuilds += 1
+        return [jti for jti, expires_at in self.revoked.items() if expires_at > now]
+
+    def revoked_since(self, since, now):
+        self.syncs += 1
+        return [jti for jti, revoked_at in self.revoked_at.items() if revoked_at > since]
+
+    def prune(self, now):
+        return 0
+
+
+@pytest.mark.unit
+def test_background_sync_keeps_rebuilds_off_checks():
+    """Test that checks reuse the filter while the sync thread refreshes it."""
+    backend = _CountingBackend()
+    store = RevocationStore(backend, bloom_capacity=100, sync_interval=0.05)
+    try:
+        assert store.is_revoked('a') is False
+        assert store.is_revoked('b') is False
+        assert backend.rebuilds == 1
+
+        # Revoked by another worker, straight in the shared store
+        backend.revoke('a', datetime.now(timezone.utc) + timedelta(hours=1))
+        deadline = time.monotonic() + 2
+        while backend.syncs < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.is_revoked('a') is True
+        # Picked up by an incremental sync, not a rebuild
+        assert backend.rebuilds == 1
+    finally:
+        store.close()
+
+
+@pytest.mark.unit
+def test_sync_reads_only_new_revocations(app):
+    """Test that syncs after the first rebuild query only rows revoked since."""
+    backend = DatabaseRevocationBackend(db, app.RevokedToken)
+    store = RevocationStore(backend, bloom_capacity=100, sync_interval=0)
+    now = datetime.now(timezone.utc)
+    db.session.add(app.RevokedToken(jti='old', expires_at=now + timedelta(hours=1),
+                                    revoked_at=now - timedelta(hours=1)))
+    db.session.commit()
+
+    assert store.is_revoked('old') is True
+    db.session.add(app.RevokedToken(jti='new', expires_at=now + timedelta(hours=1)))
+    db.session.commit()
+
+    assert list(backend.revoked_since(now - timedelta(minutes=1), now)) == ['new']
+    assert store.is_revoked('new') is True
+    stats = store.stats()
+    assert stats['rebuilds'] == 1
+    assert stats['syncs'] == 1
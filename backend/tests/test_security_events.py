@@ -0,0 +1,57 @@
+import pytest
+from utils import security_events
+from utils.security_events import SecurityEventCounter, TrustedProxies
+
+
+@pytest.mark.unit
+def test_counter_logs_one_exemplar_per_interval(monkeypatch):
+    """Test that repeated events are counted but logged once per interval."""
+    logged = []
+    now = [100.0]
+    monkeypatch.setattr(security_events, 'log_security_event', lambda event, details: logged.append((event, details)))
+    monkeypatch.setattr(security_events.time, 'monotonic', lambda: now[0])
+    counter = SecurityEventCounter(exemplar_interval=60)
+
+    assert counter.record('error_response:404', {'path': '/a'}) is True
+    assert counter.record('error_response:404') is False
+    assert counter.record('error_response:404') is False
+    assert counter.record('error_response:500') is True
+    now[0] += 61
+    assert counter.record('error_response:404') is True
+
+    assert [event for event, _ in logged] == ['error_response', 'error_response', 'error_response']
+    assert logged[0][1] == {'path': '/a', 'total': 1, 'suppressed_since_last': 0}
+    assert logged[2][1] == {'total': 4, 'suppressed_since_last': 2}
+    assert counter.stats()['counts'] == {'error_response:404': 4, 'error_response:500': 1}
+    assert counter.stats()['total'] == 5
+
+
+@pytest.mark.unit
+def test_trusted_proxies():
+    """Test the proxy allowlist."""
+    trusted = TrustedProxies(['10.0.0.0/8', ' 127.0.0.1 ', '::1/128', ''])
+
+    assert trusted.is_trusted('10.1.2.3')
+    assert trusted.is_trusted('127.0.0.1')
+    assert trusted.is_trusted('::1')
+    assert not trusted.is_trusted('203.0.113.5')
+    assert not trusted.is_trusted('not-an-ip')
+    assert not trusted.is_trusted(None)
+
+
+@pytest.mark.unit
+def test_middleware_counts_events(app, client):
+    """Test that proxy headers count only from untrusted peers."""
+    events = app.security_events
+
+    client.get('/health/live', headers={'X-Forwarded-For': '1.2.3.4'})
+    assert 'untrusted_proxy_header' not in events.stats()['counts']
+
+    client.get('/health/live', headers={'X-Forwarded-For': '1.2.3.4', 'X-Real-IP': '1.2.3.4',
+                                        'User-Agent': 'curl/8.4.0'},
+               environ_base={'REMOTE_ADDR': '203.0.113.5'})
+    client.get('/auth/me')
+    counts = events.stats()['counts']
+    assert counts['untrusted_proxy_header'] == 1
+    assert counts['suspicious_user_agent'] == 1
+    assert counts['error_response:401'] == 1
@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.mark.unit
+def test_api_responses_get_static_headers(client):
+    """Test that JSON responses carry the precomputed headers without a nonce."""
+    first = client.get('/health/live')
+    second = client.get('/health/live', headers={'X-Forwarded-Proto': 'https'})
+
+    csp = first.headers['Content-Security-Policy']
+    assert "default-src 'self'" in csp
+    assert 'nonce-' not in csp
+    assert second.headers['Content-Security-Policy'] == csp
+    assert first.headers['X-Frame-Options'] == 'SAMEORIGIN'
+    assert first.headers['X-Content-Type-Options'] == 'nosniff'
+    assert first.headers['Referrer-Policy'] == 'strict-origin-when-cross-origin'
+    assert first.headers['Permissions-Policy'] == 'browsing-topics=()'
+    # HSTS only over HTTPS
+    assert 'Strict-Transport-Security' not in first.headers
+    assert second.headers['Strict-Transport-Security'] == 'max-age=31536000; includeSubDomains'
+
+
+@pytest.mark.unit
+def test_html_responses_get_fresh_nonce(client):
+    """Test that HTML responses get a nonce in script-src and style-src."""
+    # Werkzeug renders 405 errors as HTML
+    first = client.get('/auth/login')
+    second = client.get('/auth/login')
+
+    assert first.mimetype == 'text/html'
+    csp = first.headers['Content-Security-Policy']
+    nonce = csp.split("'nonce-")[1].split("'")[0]
+    assert csp.count(f"'nonce-{nonce}'") == 2
+    assert nonce not in second.headers['Content-Security-Policy']
@@ -0,0 +1,122 @@
+import pytest
+import json
+from itertools import combinations
+from app import db
+from utils.serialization import SERIALIZER_CACHE_SIZE, dumps, get_serializer
+from tests.conftest import create_landlord
+from tests.test_properties import create_properties
+
+
+def encode(value):
+    """Round-trip through the compiled encoder."""
+    return json.loads(dumps(value))
+
+
+@pytest.mark.unit
+def test_user_serializer_matches_to_dict(app):
+    """Test that the compiled user plan encodes enums and dates like to_dict."""
+    landlord, _ = create_landlord(app)
+
+    serializer = get_serializer(app.User)
+    row = app.User.query.with_entities(*serializer.columns).one()
+
+    assert encode(serializer.serialize_objects([landlord])) == [landlord.to_dict()]
+    assert encode(serializer.serialize_rows([row])) == [landlord.to_dict()]
+
+
+@pytest.mark.unit
+def test_property_rows_include_collections(app):
+    """Test that row serialization batches amenities and images per property."""
+    landlord, _ = create_landlord(app)
+    first, second = create_properties(app, landlord, 2, latitude=-1.29, longitude=36.82)
+    first.set_amenities(['Pool', 'Gym'])
+    first.set_images(['a.jpg', 'b.jpg'])
+    db.session.commit()
+
+    serializer = get_serializer(app.Property)
+    rows = app.Property.query.order_by(app.Property.id).with_entities(*serializer.columns).all()
+
+    assert encode(serializer.serialize_rows(rows)) == [first.to_dict(), second.to_dict()]
+    assert serializer.serialize_rows([]) == []
+
+
+@pytest.mark.unit
+def test_listing_response_matches_to_dict(app, client):
+    """Test that the listing endpoint's fast path returns the to_dict shape."""
+    landlord, headers = create_landlord(app)
+    prop, = create_properties(app, landlord, 1)
+    prop.set_amenities(['Wi-Fi'])
+    db.session.commit()
+
+    response = client.get('/api/properties', headers=headers)
+
+    assert response.mimetype == 'application/json'
+    assert response.get_json()['properties'] == [prop.to_dict()]
+
+
+@pytest.mark.unit
+def test_listing_fields_projects_select(app, client):
+    """Test that fields= narrows both the response and the SQL SELECT."""
+    from sqlalchemy import event
+
+    landlord, headers = create_landlord(app)
+    create_properties(app, landlord, 3)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        data = client.get('/api/properties?limit=2&fields=name,price', headers=headers).get_json()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert [sorted(p) for p in data['properties']] == [['id', 'name', 'price']] * 2
+    assert data['next_cursor']
+    listing_sql = [s for s in statements if 'FROM properties' in s]
+    assert listing_sql and all('description' not in s for s in listing_sql)
+
+
+@pytest.mark.unit
+def test_search_fields_keep_sort_and_distance(app, client):
+    """Test that a fieldset without the sort key or coordinates still pages."""
+    landlord, headers = create_landlord(app)
+    create_properties(app, landlord, 3, latitude=-1.2921, longitude=36.8219)
+
+    first = client.get('/api/properties/search?sort=price_asc&limit=2&fields=name',
+                       headers=headers).get_json()
+    second = client.get(f"/api/properties/search?sort=price_asc&limit=2&fields=name"
+                        f"&cursor={first['next_cursor']}", headers=headers).get_json()
+    near = client.get('/api/properties/search?near=-1.2921,36.8219&fields=name,images',
+                      headers=headers).get_json()
+
+    assert [p['name'] for p in first['properties'] + second['properties']] == \
+        ['Property 0', 'Property 1', 'Property 2']
+    assert sorted(near['properties'][0]) == ['distance_km', 'id', 'images', 'name']
+
+
+@pytest.mark.unit
+def test_single_reads_accept_fields(app, client):
+    """Test fields= on a single property and the profile, and unknown fields."""
+    landlord, headers = create_landlord(app)
+    prop, = create_properties(app, landlord, 1)
+    prop.set_images(['a.jpg'])
+    db.session.commit()
+
+    prop_data = client.get(f'/api/properties/{prop.id}?fields=name,images', headers=headers).get_json()
+    me = client.get('/auth/me?fields=username,role', headers=headers).get_json()
+
+    assert prop_data['property'] == {'id': prop.id, 'name': 'Property 0', 'images': ['a.jpg']}
+    assert me['user'] == {'id': landlord.id, 'username': 'landlord1', 'role': 'landlord'}
+    assert client.get('/api/properties?fields=password', headers=headers).status_code == 400
+
+
+@pytest.mark.unit
+def test_serializer_cache_is_bounded(app):
+    """Test that client-chosen fieldsets cannot grow the serializer cache without limit."""
+    fields = sorted(app.Property.serialize_fields)
+    fieldsets = list(combinations(fields, 3))[:SERIALIZER_CACHE_SIZE + 10]
+    assert len(fieldsets) > SERIALIZER_CACHE_SIZE
+    for fieldset in fieldsets:
+        get_serializer(app.Property, fieldset)
+
+    assert get_serializer.cache_info().currsize <= SERIALIZER_CACHE_SIZE
+    assert get_serializer(app.Property, fieldsets[-1]) is get_serializer(app.Property, fieldsets[-1])
@@ -0,0 +1,134 @@
+"""
+Conditional GET support: collection version counters, ETags and 304s.
+
+Listings carry a strong ETag built from a per-collection version counter and
+the request's query string. The counter lives in ``collection_versions`` and
+is bumped inside the same transaction as any write to the collection, so
+checking ``If-None-Match`` costs one primary-key lookup and a 304 never runs
+the listing query or serializes anything.
+
+Single resources use ``If-Modified-Since`` against their ``updated_at``.
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from flask import current_app, request
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+PROPERTIES_COLLECTION = 'properties'
+
+# model class -> (collections_for, version table)
+_tracked_models = {}
+
+
+def landlord_properties_collection(landlord_id: int) -> str:
+    """Version key for one landlord's property listing."""
+    return f'properties:landlord:{landlord_id}'
+
+
+def get_collection_version(name: str) -> int:
+    """Return the current version of a collection, 0 if it was never written."""
+    CollectionVersion = current_app.CollectionVersion
+    version = current_app.db.session.execute(
+        select(CollectionVersion.version).where(CollectionVersion.name == name)
+    ).scalar()
+    return version or 0
+
+
+def bump_collection_versions(connection, table, names: Iterable[str]) -> None:
+    """
+    Increment the version of each named collection, creating missing rows.
+
+    Names are bumped in sorted order so concurrent writers lock the counter
+    rows in the same order.
+    """
+    dialect = connection.dialect.name
+    for name in sorted(set(names)):
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            statement = insert(table).values(name=name, version=1)
+            connection.execute(statement.on_conflict_do_update(
+                index_elements=[table.c.name], set_={'version': table.c.version + 1}
+            ))
+        else:
+            result = connection.execute(
+                table.update().where(table.c.name == name).values(version=table.c.version + 1)
+            )
+            if result.rowcount == 0:
+                connection.execute(table.insert().values(name=name, version=1))
+
+
+def track_collection_versions(model, version_table, collections_for) -> None:
+    """
+    Bump collection versions whenever instances of ``model`` are flushed.
+
+    Args:
+        model: Mapped class to watch
+        version_table: The ``collection_versions`` table
+        collections_for: Callable mapping an instance to the collection
+                         names it belongs to
+    """
+    _tracked_models[model] = (collections_for, version_table)
+    if not event.contains(Session, 'before_flush', _bump_on_flush):
+        event.listen(Session, 'before_flush', _bump_on_flush)
+
+
+def _bump_on_flush(session, flush_context, instances):
+    pending = {}
+    for obj in list(session.new) + list(session.deleted) + list(session.dirty):
+        tracked = _tracked_models.get(type(obj))
+        if tracked is None:
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        collections_for, version_table = tracked
+        pending.setdefault(version_table, set()).update(collections_for(obj))
+    for version_table, names in pending.items():
+        bump_collection_versions(session.connection(), version_table, names)
+
+
+def collection_etag(version: int) -> str:
+    """Strong ETag for a listing: the collection version plus the query string."""
+    digest = hashlib.sha1(request.query_string).hexdigest()[:16]
+    return f'{version}-{digest}'
+
+
+def etag_matches(etag: str) -> bool:
+    """Whether the request's If-None-Match already names ``etag``."""
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified_since(last_modified: Optional[datetime]) -> bool:
+    """Whether the request's If-Modified-Since is at or after ``last_modified``."""
+    since = request.if_modified_since
+    if since is None or last_modified is None:
+        return False
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; every timestamp we store is UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def not_modified_response(etag: Optional[str] = None, last_modified: Optional[datetime] = None):
+    """Build an empty 304 carrying the validators the client should keep."""
+    response = current_app.response_class(status=304)
+    return with_validators(response, etag, last_modified)
+
+
+def with_validators(response, etag: Optional[str] = None, last_modified: Optional[datetime] = None):
+    """Attach ETag / Last-Modified and require revalidation on every use."""
+    if etag is not None:
+        response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _as_utc(last_modified)
+    # Responses are per-user (JWT), so only private caches may keep them
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Authorization')
+    return response
@@ -0,0 +1,226 @@
+"""
+Server-sent events for the admin UI.
+
+Every worker owns one :class:`EventBroker`, which fans published events out
+to the streams connected to that worker, each with its own bounded queue.
+With ``REDIS_URL`` set, events are published to a Redis channel instead. One
+listener thread per worker relays the channel into the local broker, so an
+approval made on one gunicorn worker reaches admins streaming from every
+other worker.
+
+Streams block on their queue between events. Under gevent or eventlet
+(``WORKER_CLASS=gevent``, the default) that wait yields to other
+connections. A gunicorn sync or threaded worker would be held by the stream
+for its whole duration, so there streams are refused and clients fall back
+to polling. Streams close after ``SSE_MAX_DURATION`` seconds and clients
+reconnect. ``SSE_MAX_CONNECTIONS`` caps the streams per worker.
+"""
+import json
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, Mapping, Optional, Set
+
+from utils.logger import get_logger
+from utils.redis_client import get_redis_client
+
+logger = get_logger(__name__)
+
+# Events a slow client may fall behind by before its stream is closed
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Sent in place of an event when a subscriber's queue overflowed
+_OVERFLOW = object()
+
+
+class StreamLimitError(RuntimeError):
+    """Raised when a worker already serves ``max_connections`` streams."""
+
+
+def blocks_worker(environ: Mapping[str, Any]) -> bool:
+    """
+    Whether a stream served from this request would hold a whole worker.
+
+    Args:
+        environ: WSGI environ of the request
+
+    Returns:
+        bool: True under gunicorn without gevent or eventlet patching
+    """
+    if not str(environ.get('SERVER_SOFTWARE', '')).startswith('gunicorn'):
+        # Development server and test client
+        return False
+    gevent_monkey = sys.modules.get('gevent.monkey')
+    if gevent_monkey is not None and gevent_monkey.is_module_patched('socket'):
+        return False
+    eventlet_patcher = sys.modules.get('eventlet.patcher')
+    if eventlet_patcher is not None and eventlet_patcher.is_monkey_patched('socket'):
+        return False
+    return True
+
+
+class EventBroker:
+    """
+    In-process fan-out of events to connected streams.
+
+    Args:
+        max_connections: Concurrent streams allowed on this worker
+    """
+
+    name = 'memory'
+
+    def __init__(self, max_connections: int = 100):
+        self.max_connections = max_connections
+        self._subscribers: Set[queue.Queue] = set()
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self) -> queue.Queue:
+        """
+        Register a new stream and return the queue it reads from.
+
+        Raises:
+            StreamLimitError: If the worker is at ``max_connections``
+        """
+        subscriber: queue.Queue = queue.Queue(SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            if len(self._subscribers) >= self.max_connections:
+                raise StreamLimitError('Too many event streams open')
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        """Send an event to every stream connected to any worker."""
+        self.fanout({'event': event, 'data': data})
+
+    def fanout(self, message: Dict[str, Any]) -> None:
+        """Deliver ``message`` to the streams connected to this worker."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # Too far behind to catch up; close it so the client reconnects
+                # and reloads the list
+                self.unsubscribe(subscriber)
+                self.dropped += 1
+                try:
+                    subscriber.get_nowait()
+                    subscriber.put_nowait(_OVERFLOW)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /health/metrics."""
+        with self._lock:
+            connections = len(self._subscribers)
+        return {
+            'backend': self.name,
+            'connections': connections,
+            'max_connections': self.max_connections,
+            'published': self.published,
+            'dropped_streams': self.dropped,
+        }
+
+
+class RedisEventBroker(EventBroker):
+    """Broker whose events travel through a Redis channel to every worker."""
+
+    name = 'redis'
+    channel = 'renteasy:events'
+
+    def __init__(self, url: str, max_connections: int = 100):
+        super().__init__(max_connections)
+        self.client = get_redis_client(url)
+        self._listener: Optional[threading.Thread] = None
+        self._listener_lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        # The listener starts with the first stream, after gunicorn forked
+        self._ensure_listener()
+        return super().subscribe()
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        try:
+            self.client.publish(self.channel, json.dumps({'event': event, 'data': data}))
+        except Exception as e:
+            # Still reach the streams on this worker
+            logger.warning(f"Event publish to Redis failed: {e}")
+            self.fanout({'event': event, 'data': data})
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name='event-listener', daemon=True)
+                self._listener.start()
+
+    def _listen(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                backoff = 1.0
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self.fanout(json.loads(message['data']))
+            except Exception as e:
+                logger.warning(f"Event listener lost Redis, retrying in {backoff:g}s: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+def format_event(event: str, data: Dict[str, Any]) -> str:
+    """Encode one SSE frame."""
+    return f'event: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+def event_stream(broker: EventBroker, subscriber: queue.Queue, keepalive: float,
+                 max_duration: float) -> Iterator[str]:
+    """
+    Yield SSE frames from ``subscriber`` until ``max_duration`` passes.
+
+    A comment line is sent every ``keepalive`` seconds so proxies keep the
+    connection open and disconnected clients are noticed.
+    """
+    deadline = time.monotonic() + max_duration
+    try:
+        # Clients wait this long before reconnecting after the stream ends
+        yield 'retry: 3000\n\n'
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                message = subscriber.get(timeout=min(keepalive, remaining))
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+            if message is _OVERFLOW:
+                return
+            yield format_event(message['event'], message['data'])
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+def create_event_broker(config: Mapping[str, Any]) -> EventBroker:
+    """Build the event broker described by the app config."""
+    max_connections = int(config.get('SSE_MAX_CONNECTIONS', 100))
+    redis_url = config.get('REDIS_URL')
+    if redis_url:
+        try:
+            return RedisEventBroker(redis_url, max_connections)
+        except ImportError:
+            logger.warning("redis package not available, events reach this worker's streams only")
+    return EventBroker(max_connections)
@@ -0,0 +1,204 @@
+"""
+Geospatial helpers for radius and bounding-box property queries.
+
+Each property stores the geohash of its coordinates. Nearby points share
+geohash prefixes, so a viewport or search circle is covered by a handful of
+prefixes, and each prefix is an index range scan on the ``geohash`` column.
+An exact distance or bounding-box check on the candidates then removes the
+extra area the cells over-cover.
+
+Distances inside the database use the equirectangular approximation. It
+needs only arithmetic, so it runs the same on SQLite and PostgreSQL, and at
+city scale it is within a fraction of a percent of the great-circle
+distance. :func:`haversine_km` gives the exact figure for rows we return.
+"""
+import math
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import and_, or_
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+
+GEOHASH_PRECISION = 9  # ~5 m cells
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Upper bound on prefixes per query; more cells means a tighter cover but
+# more index range scans
+MAX_COVER_CELLS = 16
+
+
+class GeoParameterError(ValueError):
+    """Raised when a geo query parameter cannot be parsed."""
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    Encode a coordinate as a geohash string.
+
+    Args:
+        latitude: Latitude in degrees (-90..90)
+        longitude: Longitude in degrees (-180..180)
+        precision: Number of base32 characters
+
+    Returns:
+        str: Geohash of the cell containing the point
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # geohash interleaves bits starting with longitude
+
+    while len(chars) < precision:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def geohash_for(latitude: Optional[float], longitude: Optional[float]) -> Optional[str]:
+    """Return the stored geohash for a coordinate pair, or None if incomplete."""
+    if latitude is None or longitude is None:
+        return None
+    return encode_geohash(latitude, longitude)
+
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    """Return (height, width) in degrees of a geohash cell at ``precision``."""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def cover_bbox(min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+               max_cells: int = MAX_COVER_CELLS) -> List[str]:
+    """
+    Return geohash prefixes whose cells together cover a bounding box.
+
+    Picks the finest precision that needs at most ``max_cells`` prefixes.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size(precision)
+        lat_start = math.floor((min_lat + 90.0) / height)
+        lat_end = math.floor((min(max_lat, 90.0 - 1e-9) + 90.0) / height)
+        lng_start = math.floor((min_lng + 180.0) / width)
+        lng_end = math.floor((min(max_lng, 180.0 - 1e-9) + 180.0) / width)
+        if (lat_end - lat_start + 1) * (lng_end - lng_start + 1) > max_cells:
+            continue
+
+        cells: Set[str] = set()
+        for lat_index in range(lat_start, lat_end + 1):
+            for lng_index in range(lng_start, lng_end + 1):
+                # Encode the centre of each cell to get its prefix
+                cells.add(encode_geohash(
+                    (lat_index + 0.5) * height - 90.0,
+                    (lng_index + 0.5) * width - 180.0,
+                    precision
+                ))
+        return sorted(cells)
+
+    return ['']  # The box spans most of the globe; every row is a candidate
+
+
+def bbox_around(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Return the (min_lat, min_lng, max_lat, max_lng) box enclosing a circle.
+
+    Raises:
+        GeoParameterError: If the circle crosses the antimeridian; clamping
+            the box there would silently drop the far side
+    """
+    lat_delta = radius_km / KM_PER_DEGREE
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    lng_delta = radius_km / (KM_PER_DEGREE * cos_lat)
+    if abs(latitude) + lat_delta >= 90.0:
+        # The circle contains a pole, so it spans every longitude
+        return max(latitude - lat_delta, -90.0), -180.0, min(latitude + lat_delta, 90.0), 180.0
+    if longitude - lng_delta < -180.0 or longitude + lng_delta > 180.0:
+        raise GeoParameterError('near circle crossing the antimeridian is not supported')
+    return (
+        max(latitude - lat_delta, -90.0),
+        longitude - lng_delta,
+        min(latitude + lat_delta, 90.0),
+        longitude + lng_delta,
+    )
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def geohash_prefix_filter(column, prefixes: List[str], dialect: str):
+    """
+    Build an OR of index range scans, one per geohash prefix.
+
+    PostgreSQL serves ``LIKE 'prefix%'`` from the ``text_pattern_ops`` index;
+    SQLite's default LIKE is case-insensitive and cannot use a plain index,
+    so there the prefix becomes an explicit half-open range.
+    """
+    if prefixes == ['']:
+        return column.isnot(None)
+    if dialect == 'postgresql':
+        return or_(*[column.like(f'{prefix}%') for prefix in prefixes])
+    # '~' sorts after every geohash character under binary collation
+    return or_(*[and_(column >= prefix, column < f'{prefix}~') for prefix in prefixes])
+
+
+def squared_distance_expr(Property, latitude: float, longitude: float):
+    """
+    SQL expression for the equirectangular squared distance in degrees².
+
+    The cosine depends only on the query origin, so it is computed here and
+    the database evaluates plain arithmetic per row.
+    """
+    cos_lat = math.cos(math.radians(latitude))
+    dx = (Property.longitude - longitude) * cos_lat
+    dy = Property.latitude - latitude
+    return dx * dx + dy * dy
+
+
+def parse_near(value: str) -> Tuple[float, float]:
+    """Parse ``near=lat,lng``."""
+    try:
+        lat_str, lng_str = value.split(',')
+        latitude, longitude = float(lat_str), float(lng_str)
+    except ValueError:
+        raise GeoParameterError('near must be "lat,lng"')
+    if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+        raise GeoParameterError('near is out of range')
+    return latitude, longitude
+
+
+def parse_bbox(value: str) -> Tuple[float, float, float, float]:
+    """Parse ``bbox=min_lng,min_lat,max_lng,max_lat`` (GeoJSON order)."""
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(part) for part in value.split(','))
+    except ValueError:
+        raise GeoParameterError('bbox must be "min_lng,min_lat,max_lng,max_lat"')
+    if not (-90.0 <= min_lat <= max_lat <= 90.0):
+        raise GeoParameterError('bbox latitudes are out of range')
+    if not (-180.0 <= min_lng <= 180.0 and -180.0 <= max_lng <= 180.0):
+        raise GeoParameterError('bbox longitudes are out of range')
+    if min_lng > max_lng:
+        raise GeoParameterError('bbox crossing the antimeridian is not supported')
+    return min_lat, min_lng, max_lat, max_lng
@@ -0,0 +1,119 @@
+"""
+Background sampling of health checks.
+
+Database, Redis and system checks take from milliseconds to seconds, too
+slow to run inside every /healthz request on a sync worker. A daemon thread
+in each worker runs them every ``interval`` seconds and swaps the results
+into a snapshot that the endpoints serve as is, together with its age.
+
+The thread starts on the first read, so with ``preload_app`` it runs in
+each forked worker rather than in the gunicorn master. An interval of 0
+runs the checks inline on every read instead.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from flask import Flask
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class HealthSampler:
+    """
+    Periodically refreshed snapshot of health check results.
+
+    Args:
+        app: Flask application the checks run under
+        checks: Check functions keyed by component name
+        interval: Seconds between samples; 0 samples on every read
+        stale_after: Age in seconds after which a snapshot counts as stale,
+            three intervals by default
+    """
+
+    def __init__(self, app: Flask, checks: Mapping[str, Callable[[], Dict[str, Any]]],
+                 interval: float = 15.0, stale_after: Optional[float] = None):
+        self.app = app
+        self.checks = dict(checks)
+        self.interval = interval
+        self.stale_after = stale_after if stale_after is not None else interval * 3
+        # (results, monotonic time of the sample), replaced as a whole
+        self._sample: Optional[Tuple[Dict[str, Any], float]] = None
+        self._samples = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Latest check results plus their age.
+
+        Returns:
+            dict: Results keyed by component name, and ``snapshot`` with
+            ``age_seconds``, ``interval_seconds`` and ``stale``
+        """
+        if self.interval <= 0:
+            self.refresh()
+        else:
+            self._ensure_thread()
+            if self._sample is None:
+                # Only the first request of a worker waits for a sample
+                with self._lock:
+                    if self._sample is None:
+                        self.refresh()
+        results, sampled_at = self._sample
+        age = time.monotonic() - sampled_at
+        return {
+            **results,
+            'snapshot': {
+                'age_seconds': round(age, 3),
+                'interval_seconds': self.interval,
+                'stale': self.interval > 0 and age > self.stale_after,
+            }
+        }
+
+    def refresh(self) -> None:
+        """Run every check now and replace the snapshot."""
+        results = {}
+        with self.app.app_context():
+            for name, check in self.checks.items():
+                try:
+                    results[name] = check()
+                except Exception as e:
+                    logger.error(f"Health check {name} failed: {e}")
+                    results[name] = {'status': 'error', 'error': str(e)}
+        # A single assignment, so readers never see a half-built snapshot
+        self._sample = (results, time.monotonic())
+        self._samples += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Sampler counters for /health/metrics."""
+        return {
+            'interval_seconds': self.interval,
+            'samples': self._samples,
+            'running': self._thread is not None and self._thread.is_alive(),
+        }
+
+    def close(self) -> None:
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _ensure_thread(self) -> None:
+        # A thread started before fork is not alive in the child
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if not self._stop.is_set() and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name='health-sampler', daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Health sampling failed: {e}")
@@ -0,0 +1,237 @@
+"""
+Asynchronous, batched log output.
+
+Loguru runs its handlers on the thread that logs, so requests used to pay
+for writing to stdout and the log file, and for rotating and compressing
+that file. Here the loguru sinks only hand the formatted line to a bounded
+queue. One background writer drains it, writing each batch with a single
+write and flush per output.
+
+When the queue is full, the ``drop`` policy discards the line and counts it,
+while ``block`` waits up to ``block_timeout`` seconds for space. ERROR and
+above always wait.
+"""
+import glob
+import os
+import queue
+import sys
+import threading
+import time
+import weakref
+import zipfile
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+QUEUE_POLICIES = ('drop', 'block')
+
+# Levels at or above this never take the drop policy
+_ERROR_LEVEL = 40
+
+# Tells the writer to drain what is queued and exit
+_STOP = object()
+
+
+class StreamOutput:
+    """Batches written to a text stream such as stdout."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, lines: List[str]) -> None:
+        self.stream.write(''.join(lines))
+        self.stream.flush()
+
+    def close(self) -> None:
+        pass
+
+
+class RotatingFileOutput:
+    """
+    Log file rotated by size into zip archives, pruned by age.
+
+    Args:
+        path: Log file path; its directory is created if missing
+        max_bytes: Size at which the file is rotated
+        retention_days: Age after which archives are deleted
+    """
+
+    def __init__(self, path: str, max_bytes: int = 100 * 1024 * 1024, retention_days: float = 30):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.retention_seconds = retention_days * 86400
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, lines: List[str]) -> None:
+        self._file.write(''.join(lines))
+        self._file.flush()
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        root, ext = os.path.splitext(self.path)
+        rotated = f"{root}.{datetime.now().strftime('%Y-%m-%d_%H-%M-%S_%f')}{ext}"
+        os.rename(self.path, rotated)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        with zipfile.ZipFile(rotated + '.zip', 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.write(rotated, os.path.basename(rotated))
+        os.remove(rotated)
+        cutoff = time.time() - self.retention_seconds
+        for archive_path in glob.glob(f"{glob.escape(root)}.*{ext}.zip"):
+            if os.path.getmtime(archive_path) < cutoff:
+                os.remove(archive_path)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class LogPipeline:
+    """
+    Bounded queue of formatted log lines drained by one writer thread.
+
+    Args:
+        outputs: Outputs by name; :meth:`sink` feeds one of them
+        max_queue: Lines held before the full-queue policy applies
+        batch_size: Most lines written per batch
+        flush_interval: Seconds the writer lets lines gather before a batch
+        policy: 'drop' or 'block'
+        block_timeout: Seconds a blocked put waits before dropping
+    """
+
+    def __init__(self, outputs: Mapping[str, Any], max_queue: int = 10000, batch_size: int = 512,
+                 flush_interval: float = 0.2, policy: str = 'drop', block_timeout: float = 1.0):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Log queue policy must be one of {QUEUE_POLICIES}")
+        self.outputs = dict(outputs)
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._counters = {'queued': 0, 'written': 0, 'dropped': 0, 'batches': 0, 'errors': 0}
+        _pipelines.add(self)
+
+    def sink(self, name: str) -> Callable[[Any], None]:
+        """Loguru sink that queues lines for output ``name``."""
+        def enqueue(message) -> None:
+            self.put(name, str(message), message.record['level'].no)
+        return enqueue
+
+    def put(self, name: str, line: str, level: int = 20) -> None:
+        """Queue ``line`` for output ``name``, applying the full-queue policy."""
+        if self._writer is None:
+            self._start_writer()
+        try:
+            self._queue.put_nowait((name, line))
+        except queue.Full:
+            self._wake.set()
+            if self.policy == 'drop' and level < _ERROR_LEVEL:
+                self._counters['dropped'] += 1
+                return
+            try:
+                self._queue.put((name, line), timeout=self.block_timeout)
+            except queue.Full:
+                self._counters['dropped'] += 1
+                return
+        self._counters['queued'] += 1
+
+    def _start_writer(self) -> None:
+        with self._lock:
+            if self._writer is None and not self._closed:
+                self._writer = threading.Thread(target=self._run, name='log-writer', daemon=True)
+                self._writer.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            # Let the batch fill rather than waking for every line; a full
+            # queue or close() cuts the wait short
+            if item is not _STOP and self.flush_interval > 0:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+            batch = []
+            stop = False
+            while True:
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch: List) -> None:
+        by_output: Dict[str, List[str]] = {}
+        for name, line in batch:
+            by_output.setdefault(name, []).append(line)
+        for name, lines in by_output.items():
+            try:
+                self.outputs[name].write(lines)
+            except Exception as e:
+                self._counters['errors'] += 1
+                # The logger itself cannot report this
+                print(f"Log output {name} failed: {e}", file=sys.stderr)
+        self._counters['written'] += len(batch)
+        self._counters['batches'] += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write everything queued, stop the writer and close the outputs."""
+        with self._lock:
+            self._closed = True
+            writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._wake.set()
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            writer.join(timeout)
+        for output in self.outputs.values():
+            try:
+                output.close()
+            except Exception:
+                pass
+
+    def _after_fork(self) -> None:
+        # The writer thread does not survive fork; the child starts its own
+        # and leaves the parent's queued lines to the parent
+        self._queue = queue.Queue(self.max_queue)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._writer = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /health/metrics."""
+        return {
+            'policy': self.policy,
+            'pending': self._queue.qsize(),
+            'max_queue': self.max_queue,
+            **self._counters,
+        }
+
+
+_pipelines: 'weakref.WeakSet[LogPipeline]' = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    for pipeline in list(_pipelines):
+        pipeline._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,15 +1,22 @@
 """
 Structured logging configuration using Loguru.
 """
+import atexit
+import itertools
 import os
+import re
 import sys
 import json
 import time
-import uuid
 from typing import Any, Dict, Optional
 from loguru import logger
 from flask import g, request, has_request_context
 
+from utils.log_pipeline import LogPipeline, RotatingFileOutput, StreamOutput
+
+# Background writer behind the loguru sinks, set by setup_logger
+_pipeline: Optional[LogPipeline] = None
+
 
 class RequestIDFilter:
     """Filter to add request ID to log records."""
@@ -25,7 +32,9 @@ class RequestIDFilter:
 def setup_logger(
     log_level: str = "INFO",
     json_output: bool = False,
-    log_file: Optional[str] = None
+    log_file: Optional[str] = None,
+    async_output: bool = True,
+    queue_options: Optional[Dict[str, Any]] = None
 ) -> None:
     """
     Configure Loguru logger with structured output.
@@ -34,9 +43,18 @@ def setup_logger(
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         json_output: Whether to use JSON format for structured logging
         log_file: Optional file path for log output
+        async_output: Write through a background LogPipeline instead of on
+                      the logging thread
+        queue_options: LogPipeline options (max_queue, batch_size,
+                       flush_interval, policy, block_timeout)
     """
+    global _pipeline
+    
     # Remove default handler
     logger.remove()
+    if _pipeline is not None:
+        _pipeline.close()
+        _pipeline = None
     
     # Configure log format
     if json_output:
@@ -58,9 +76,20 @@ def setup_logger(
             "<level>{message}</level>"
         )
     
+    if async_output:
+        outputs = {"console": StreamOutput(sys.stdout)}
+        if log_file:
+            outputs["file"] = RotatingFileOutput(log_file, max_bytes=100 * 1024 * 1024, retention_days=30)
+        _pipeline = LogPipeline(outputs, **(queue_options or {}))
+        console_sink = _pipeline.sink("console")
+        file_sink = _pipeline.sink("file") if log_file else None
+    else:
+        console_sink = sys.stdout
+        file_sink = log_file
+    
     # Console handler
     logger.add(
-        sys.stdout,
+        console_sink,
         format=log_format,
         level=log_level,
         colorize=not json_output,
@@ -69,9 +98,19 @@ def setup_logger(
     )
     
     # File handler (if specified)
-    if log_file:
+    if file_sink and async_output:
+        # Rotation and compression happen in the pipeline's writer
+        logger.add(
+            file_sink,
+            format=log_format,
+            level=log_level,
+            colorize=False,
+            filter=RequestIDFilter(),
+            serialize=json_output,
+        )
+    elif file_sink:
         logger.add(
-            log_file,
+            file_sink,
             format=log_format,
             level=log_level,
             rotation="100 MB",
@@ -82,6 +121,18 @@ def setup_logger(
         )
 
 
+@atexit.register
+def _flush_log_pipeline() -> None:
+    """Write out queued lines when the process exits."""
+    if _pipeline is not None:
+        _pipeline.close()
+
+
+def get_log_pipeline() -> Optional[LogPipeline]:
+    """Return the active log pipeline, if output is asynchronous."""
+    return _pipeline
+
+
 def get_logger(name: str = None):
     """Get a logger instance with optional name."""
     if name:
@@ -89,35 +140,78 @@ def get_logger(name: str = None):
     return logger
 
 
+# Request ids: a per-worker prefix and a counter, unique across workers
+# without the cost of uuid4()
+_request_counter = itertools.count(1)
+_worker_prefix = format(os.getpid(), "x")
+
+# Incoming X-Request-ID values are kept only when they look like ids
+_REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,64}")
+
+
+def _reset_request_ids() -> None:
+    global _request_counter, _worker_prefix
+    _request_counter = itertools.count(1)
+    _worker_prefix = format(os.getpid(), "x")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_request_ids)
+
+
+def next_request_id(incoming: Optional[str] = None) -> str:
+    """
+    Return the id for a new request.
+    
+    Args:
+        incoming: X-Request-ID sent by a proxy or client, reused when valid
+    
+    Returns:
+        str: ``incoming``, or ``<worker pid>-<counter>`` in hex
+    """
+    if incoming and _REQUEST_ID_PATTERN.fullmatch(incoming):
+        return incoming
+    return f"{_worker_prefix}-{next(_request_counter):x}"
+
+
 def log_request_start():
-    """Log the start of a request."""
+    """Stamp the request id and start time; the access record is written at the end."""
     if has_request_context():
-        g.request_id = str(uuid.uuid4())[:8]
-        g.request_start_time = time.time()
-        
-        logger.info(
-            "Request started",
-            extra={
-                "method": request.method,
-                "path": request.path,
-                "remote_addr": request.remote_addr,
-                "user_agent": request.headers.get("User-Agent", ""),
-            }
-        )
+        g.request_id = next_request_id(request.headers.get("X-Request-ID"))
+        g.request_start_time = time.perf_counter()
 
 
-def log_request_end():
-    """Log the end of a request with duration."""
+def request_duration_ms() -> Optional[float]:
+    """Milliseconds since log_request_start, or None outside a timed request."""
+    start = getattr(g, "request_start_time", None) if has_request_context() else None
+    if start is None:
+        return None
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def log_request_end(level: str = "INFO", duration_ms: Optional[float] = None):
+    """
+    Log one access record for the request, with its duration.
+    
+    Args:
+        level: Level of the record
+        duration_ms: Duration already measured by the caller
+    """
     if has_request_context() and hasattr(g, "request_start_time"):
-        duration = time.time() - g.request_start_time
+        if duration_ms is None:
+            duration_ms = request_duration_ms()
+        status_code = getattr(g, "response_status", None)
         
-        logger.info(
-            "Request completed",
+        logger.log(
+            level,
+            f"{request.method} {request.path} {status_code} {duration_ms}ms",
             extra={
                 "method": request.method,
                 "path": request.path,
-                "status_code": getattr(g, "response_status", None),
-                "duration_ms": round(duration * 1000, 2),
+                "status_code": status_code,
+                "duration_ms": duration_ms,
+                "remote_addr": request.remote_addr,
+                "user_agent": request.headers.get("User-Agent", ""),
             }
         )
 
@@ -0,0 +1,153 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque to clients: a url-safe base64 encoding of the sort key of
+the last row on the previous page. Seeking past that key with an indexed
+``WHERE (sort_column, id) < (:value, :id)`` keeps the cost of page N the
+same as page 1, unlike ``OFFSET`` which has to walk every skipped row.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor we did not issue."""
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """
+    Encode a ``(sort_value, id)`` key as an opaque cursor string.
+
+    Args:
+        sort_value: Sort column value of the last row on the page
+        row_id: Primary key of the last row on the page
+
+    Returns:
+        str: Url-safe cursor token
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, value_type: type = datetime) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor: Cursor token received from the client
+        value_type: Python type of the sort column the cursor was built from
+
+    Returns:
+        Tuple[Any, int]: The ``(sort_value, id)`` key
+
+    Raises:
+        InvalidCursorError: If the token is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if value_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        elif sort_value is not None:
+            sort_value = value_type(sort_value)
+        return sort_value, int(row_id)
+    except Exception as e:
+        raise InvalidCursorError('Invalid cursor') from e
+
+
+def parse_limit(value: Optional[str], default: int, maximum: int) -> int:
+    """
+    Parse a ``limit`` query parameter, clamping it to ``[1, maximum]``.
+
+    Raises:
+        ValueError: If the value is not an integer
+    """
+    if value in (None, ''):
+        return default
+    return max(1, min(int(value), maximum))
+
+
+def paginate_keyset(query, sort_column, id_column, limit: int,
+                    cursor: Optional[str] = None, descending: bool = True) -> Dict[str, Any]:
+    """
+    Fetch one page of ``query`` ordered by ``(sort_column, id_column)``.
+
+    The sort column must be non-null for every row in ``query``, and an index
+    leading with the query's equality filters followed by ``(sort_column, id)``
+    is what makes each page an index range scan.
+
+    Args:
+        query: SQLAlchemy query to paginate (already filtered)
+        sort_column: Mapped column to sort on
+        id_column: Unique tiebreaker column, normally the primary key
+        limit: Maximum number of rows on the page
+        cursor: Cursor from the previous page, if any
+        descending: Sort direction for both columns
+
+    Returns:
+        Dict with ``items``, ``next_cursor`` and ``has_more`` keys
+    """
+    key = tuple_(sort_column, id_column)
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_column.type.python_type)
+        query = query.filter(key < (sort_value, row_id) if descending else key > (sort_value, row_id))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    # Fetch one extra row to learn whether another page exists
+    rows: List[Any] = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    items = rows[:limit]
+
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return {
+        'items': items,
+        'next_cursor': next_cursor,
+        'has_more': has_more
+    }
+
+
+def paginate_offset(query, limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Fetch one page of an already ordered ``query`` by position.
+
+    Used where the sort key is a computed score (such as text-search
+    relevance) that no index can seek on; the database has to score every
+    match to rank them anyway, so an offset costs little extra.
+
+    Returns:
+        Dict with ``items``, ``next_cursor`` and ``has_more`` keys
+    """
+    offset = 0
+    if cursor:
+        offset, _ = decode_cursor(cursor, int)
+        if offset < 0:
+            raise InvalidCursorError('Invalid cursor')
+
+    rows: List[Any] = query.offset(offset).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    items = rows[:limit]
+
+    return {
+        'items': items,
+        'next_cursor': encode_cursor(offset + len(items), 0) if has_more else None,
+        'has_more': has_more
+    }
+
+
+def paginate_by_created_at(query, model, limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Fetch one page of ``query`` ordered newest first by ``(created_at, id)``."""
+    return paginate_keyset(query, model.created_at, model.id, limit, cursor)
@@ -0,0 +1,219 @@
+"""
+Compile property search parameters into a single SQL query.
+
+Every filter becomes a ``WHERE`` clause on one query, so the database does
+the narrowing with the composite indexes declared on ``Property`` instead of
+the client filtering the full listing.
+"""
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from utils.geo import (
+    KM_PER_DEGREE, GeoParameterError, bbox_around, cover_bbox, geohash_prefix_filter,
+    parse_bbox, parse_near, squared_distance_expr
+)
+from utils.text_search import apply_text_search
+
+
+class SearchParameterError(ValueError):
+    """Raised when a search parameter cannot be parsed."""
+
+
+DEFAULT_RADIUS_KM = 5.0
+MAX_RADIUS_KM = 100.0
+
+
+# sort name -> (column attribute, descending)
+SORT_OPTIONS: Dict[str, Tuple[str, bool]] = {
+    'newest': ('created_at', True),
+    'oldest': ('created_at', False),
+    'price_asc': ('price', False),
+    'price_desc': ('price', True),
+    'size_asc': ('square_feet', False),
+    'size_desc': ('square_feet', True),
+}
+
+DEFAULT_SORT = 'newest'
+
+# Only meaningful with a text query; the default sort when ``q`` is given
+RELEVANCE_SORT = 'relevance'
+
+# Only meaningful with near= or bbox=; the default sort for either
+DISTANCE_SORT = 'distance'
+
+
+class PropertySearch(NamedTuple):
+    """A compiled search: filtered query plus how to order and page it."""
+    query: Any
+    sort_column: Any
+    descending: bool
+    # True when sort_column is a computed score (relevance or distance)
+    # rather than a column
+    ranked: bool
+    # (lat, lng) distances are measured from, for near= and bbox= searches
+    origin: Optional[Tuple[float, float]] = None
+
+
+def _parse_number(args: Mapping[str, str], name: str, cast=float) -> Optional[Any]:
+    """Parse an optional numeric query parameter."""
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise SearchParameterError(f'{name} must be a number')
+
+
+def _parse_list(args: Mapping[str, str], name: str) -> List[str]:
+    """Parse a comma-separated query parameter into a list of values."""
+    value = args.get(name) or ''
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def build_property_search(Property, args: Mapping[str, str]):
+    """
+    Build the filtered query and sort order for a property search.
+
+    Supported parameters:
+        min_price, max_price: Monthly price range
+        bedrooms: Exact bedroom count
+        min_bedrooms, max_bedrooms: Bedroom range
+        min_bathrooms: Minimum bathroom count
+        property_type (or type): One or more comma-separated types
+        min_sqft, max_sqft: Square footage range
+        amenities: Comma-separated amenities that must all be present
+        location: Case-insensitive substring of the location
+        q: Free text matched against name, location and description
+        near: "lat,lng" centre of a radius search
+        radius: Radius in km for near (default 5, at most 100)
+        bbox: "min_lng,min_lat,max_lng,max_lat" viewport
+        sort: One of SORT_OPTIONS, "relevance" with q or "distance" with
+              near/bbox. Defaults to distance for geo searches, then
+              relevance with q, otherwise "newest".
+
+    Args:
+        Property: The Property model class
+        args: Request query parameters
+
+    Returns:
+        PropertySearch
+
+    Raises:
+        SearchParameterError: If a parameter is malformed
+    """
+    query = Property.query.filter_by(available=True)
+
+    min_price = _parse_number(args, 'min_price')
+    max_price = _parse_number(args, 'max_price')
+    if min_price is not None:
+        query = query.filter(Property.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Property.price <= max_price)
+
+    bedrooms = _parse_number(args, 'bedrooms', int)
+    min_bedrooms = _parse_number(args, 'min_bedrooms', int)
+    max_bedrooms = _parse_number(args, 'max_bedrooms', int)
+    if bedrooms is not None:
+        query = query.filter(Property.bedrooms == bedrooms)
+    if min_bedrooms is not None:
+        query = query.filter(Property.bedrooms >= min_bedrooms)
+    if max_bedrooms is not None:
+        query = query.filter(Property.bedrooms <= max_bedrooms)
+
+    min_bathrooms = _parse_number(args, 'min_bathrooms', int)
+    if min_bathrooms is not None:
+        query = query.filter(Property.bathrooms >= min_bathrooms)
+
+    property_types = _parse_list(args, 'property_type') or _parse_list(args, 'type')
+    if len(property_types) == 1:
+        query = query.filter(Property.property_type == property_types[0])
+    elif property_types:
+        query = query.filter(Property.property_type.in_(property_types))
+
+    min_sqft = _parse_number(args, 'min_sqft')
+    max_sqft = _parse_number(args, 'max_sqft')
+    if min_sqft is not None:
+        query = query.filter(Property.square_feet >= min_sqft)
+    if max_sqft is not None:
+        query = query.filter(Property.square_feet <= max_sqft)
+
+    for amenity in _parse_list(args, 'amenities'):
+        # One EXISTS per amenity, served by the (amenity, property_id) index
+        query = query.filter(Property.amenity_rows.any(amenity=amenity))
+
+    location = (args.get('location') or '').strip()
+    if location:
+        query = query.filter(Property.location.icontains(location, autoescape=True))
+
+    query, distance, origin = _apply_geo_filters(query, Property, args)
+
+    q = (args.get('q') or '').strip()
+    sort = args.get('sort') or (DISTANCE_SORT if origin else RELEVANCE_SORT if q else DEFAULT_SORT)
+    if origin and sort == DISTANCE_SORT:
+        if q:
+            query, _ = apply_text_search(query, Property, q, ranked=False)
+        return PropertySearch(query.order_by(distance.asc(), Property.id.asc()), distance, False, True, origin)
+    if q and sort == RELEVANCE_SORT:
+        query, rank = apply_text_search(query, Property, q, ranked=True)
+        return PropertySearch(query.order_by(rank.desc(), Property.id.desc()), rank, True, True, origin)
+    if sort not in SORT_OPTIONS:
+        raise SearchParameterError(f'sort must be one of: {list(SORT_OPTIONS)}')
+    if q:
+        query, _ = apply_text_search(query, Property, q, ranked=False)
+
+    column_name, descending = SORT_OPTIONS[sort]
+    sort_column = getattr(Property, column_name)
+
+    # Keyset pagination needs a non-null sort key; listings without a
+    # square footage cannot be ranked by size.
+    if column_name == 'square_feet':
+        query = query.filter(Property.square_feet.isnot(None))
+
+    return PropertySearch(query, sort_column, descending, False, origin)
+
+
+def _apply_geo_filters(query, Property, args: Mapping[str, str]):
+    """
+    Apply near=/radius= or bbox= filters.
+
+    Returns:
+        Tuple of (query, squared-distance expression, origin) where the last
+        two are None when neither parameter is present
+    """
+    near = args.get('near')
+    bbox = args.get('bbox')
+    if not near and not bbox:
+        return query, None, None
+    if near and bbox:
+        raise SearchParameterError('near and bbox cannot be combined')
+
+    try:
+        if near:
+            latitude, longitude = parse_near(near)
+            radius_km = _parse_number(args, 'radius')
+            radius_km = DEFAULT_RADIUS_KM if radius_km is None else radius_km
+            if not 0 < radius_km <= MAX_RADIUS_KM:
+                raise SearchParameterError(f'radius must be between 0 and {MAX_RADIUS_KM:g} km')
+            min_lat, min_lng, max_lat, max_lng = bbox_around(latitude, longitude, radius_km)
+        else:
+            min_lat, min_lng, max_lat, max_lng = parse_bbox(bbox)
+            latitude, longitude = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+    except GeoParameterError as e:
+        raise SearchParameterError(str(e))
+
+    dialect = query.session.get_bind().dialect.name
+    distance = squared_distance_expr(Property, latitude, longitude)
+
+    # Index range scans over the covering geohash cells, then an exact test
+    query = query.filter(geohash_prefix_filter(
+        Property.geohash, cover_bbox(min_lat, min_lng, max_lat, max_lng), dialect
+    ))
+    if near:
+        query = query.filter(distance <= (radius_km / KM_PER_DEGREE) ** 2)
+    else:
+        query = query.filter(
+            Property.latitude.between(min_lat, max_lat),
+            Property.longitude.between(min_lng, max_lng)
+        )
+
+    return query, distance, (latitude, longitude)
@@ -0,0 +1,38 @@
+"""
+Shared Redis clients.
+
+redis-py clients hold a connection pool, so one client per URL is created
+and reused for the life of the process instead of connecting per call.
+"""
+import threading
+from typing import Dict
+
+_clients: Dict[str, object] = {}
+_lock = threading.Lock()
+
+
+def get_redis_client(url: str, socket_timeout: float = 5.0):
+    """
+    Return the process-wide Redis client for ``url``.
+
+    Args:
+        url: Redis connection URL, e.g. ``redis://localhost:6379/0``
+        socket_timeout: Connect and read timeout in seconds
+
+    Returns:
+        redis.Redis: Client backed by a shared connection pool
+
+    Raises:
+        ImportError: If the redis package is not installed
+    """
+    client = _clients.get(url)
+    if client is None:
+        import redis
+
+        with _lock:
+            client = _clients.get(url)
+            if client is None:
+                client = _clients[url] = redis.Redis.from_url(
+                    url, socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout
+                )
+    return client
@@ -0,0 +1,233 @@
+"""
+Shared cache for listing responses that look the same to every caller.
+
+Entries are the encoded JSON body, keyed on the endpoint, the collection
+version (see ``utils.conditional``) and the normalized query string. Keying
+on the version means a committed write can never be answered from an older
+entry, even one made by another process; tags let the write routes drop the
+affected entries straight away instead of leaving them to age out.
+
+Redis is used when ``REDIS_URL`` is configured so workers share one cache;
+otherwise each process keeps a bounded LRU with a TTL.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from utils.logger import get_logger
+from utils.redis_client import get_redis_client
+
+logger = get_logger(__name__)
+
+LISTING_TAG = 'properties'
+
+
+def landlord_tag(landlord_id: int) -> str:
+    """Tag carried by every cached entry that lists one landlord's properties."""
+    return f'landlord:{landlord_id}'
+
+
+def listing_cache_key(namespace: str, version: int, args) -> str:
+    """
+    Build a cache key from the endpoint, collection version and query args.
+
+    Args:
+        namespace: Endpoint name
+        version: Collection version the response was built from
+        args: Request query parameters (a MultiDict)
+
+    Parameter order and empty values do not change the key, so equivalent
+    queries share one entry.
+    """
+    items = sorted(
+        (name, value.strip())
+        for name, value in args.items(multi=True)
+        if value.strip()
+    )
+    digest = hashlib.sha1(repr(items).encode('utf-8')).hexdigest()
+    return f'{namespace}:{version}:{digest}'
+
+
+class MemoryCacheBackend:
+    """Bounded in-process LRU with a per-entry TTL."""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # key -> (expires_at, value, tags)
+        self._entries: 'OrderedDict[str, Tuple[float, bytes, Tuple[str, ...]]]' = OrderedDict()
+        self._tags: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float, tags: Tuple[str, ...]) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.pop(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend:
+    """Cache shared by every worker through Redis; tags are Redis sets."""
+
+    name = 'redis'
+    prefix = 'renteasy:cache:'
+
+    def __init__(self, url: str):
+        self.client = get_redis_client(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float, tags: Tuple[str, ...]) -> None:
+        ttl = max(1, int(ttl))
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(self.prefix + key, value, ex=ttl)
+        for tag in tags:
+            tag_key = f'{self.prefix}tag:{tag}'
+            pipe.sadd(tag_key, key)
+            # Outlive every member so invalidation always finds them
+            pipe.expire(tag_key, ttl * 2)
+        pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tag_keys = [f'{self.prefix}tag:{tag}' for tag in tags]
+        pipe = self.client.pipeline(transaction=False)
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        keys = set()
+        for members in pipe.execute():
+            keys.update(self.prefix + member.decode('utf-8') for member in members)
+        if tag_keys:
+            self.client.delete(*keys, *tag_keys)
+        return len(keys)
+
+    def size(self) -> Optional[int]:
+        return None  # Shared keyspace; see Redis INFO for totals
+
+    @property
+    def evictions(self) -> Optional[int]:
+        try:
+            return self.client.info('stats').get('evicted_keys')
+        except Exception:
+            return None
+
+
+class ResponseCache:
+    """
+    Response cache with hit/miss counters.
+
+    Backend errors are logged and treated as misses so a Redis outage only
+    costs the cache, never the request.
+    """
+
+    def __init__(self, backend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'invalidations': 0, 'errors': 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for ``key``, or None."""
+        if not self.enabled:
+            return None
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, key: str, value: bytes, tags: Iterable[str]) -> None:
+        """Store ``value`` under ``key`` with the given invalidation tags."""
+        if not self.enabled:
+            return
+        try:
+            self.backend.set(key, value, self.ttl, tuple(tags))
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Response cache write failed: {e}")
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry carrying any of ``tags``."""
+        if not self.enabled:
+            return
+        try:
+            self._count('invalidations', self.backend.invalidate(tags))
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Response cache invalidation failed: {e}")
+
+    def stats(self) -> Dict[str, object]:
+        """Counters for /health/metrics."""
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters['hits'] + counters['misses']
+        return {
+            'backend': self.backend.name,
+            'enabled': self.enabled,
+            **counters,
+            'evictions': self.backend.evictions,
+            'hit_ratio': round(counters['hits'] / lookups, 4) if lookups else None,
+            'entries': self.backend.size(),
+        }
+
+
+def create_response_cache(config: Mapping[str, object]) -> ResponseCache:
+    """Build the response cache described by the app config."""
+    ttl = float(config.get('RESPONSE_CACHE_TTL', 30))
+    enabled = bool(config.get('RESPONSE_CACHE_ENABLED', True))
+    redis_url = config.get('REDIS_URL')
+    if redis_url:
+        try:
+            return ResponseCache(RedisCacheBackend(redis_url), ttl, enabled)
+        except ImportError:
+            logger.warning("redis package not available, using in-process response cache")
+    return ResponseCache(MemoryCacheBackend(int(config.get('RESPONSE_CACHE_MAX_ENTRIES', 1024))), ttl, enabled)
@@ -0,0 +1,97 @@
+"""
+Aggregated security events.
+
+Events such as error responses or proxy headers from unknown hosts are
+counted per type rather than logged one by one, so log volume does not
+grow with traffic. Each event key writes at most one exemplar line per
+interval, carrying the number of events seen since the previous line. The
+counters are reported on /health/metrics.
+"""
+import ipaddress
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+
+from utils.logger import log_security_event
+
+# Behind Render and most load balancers the proxy connects from a private
+# or loopback address
+DEFAULT_TRUSTED_PROXIES = '127.0.0.0/8,::1/128,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16,fc00::/7'
+
+
+class TrustedProxies:
+    """
+    Allowlist of addresses whose forwarding headers are expected.
+
+    Args:
+        networks: Addresses or CIDR ranges
+    """
+
+    def __init__(self, networks: Iterable[str]):
+        self.networks = tuple(ipaddress.ip_network(network.strip(), strict=False)
+                              for network in networks if network.strip())
+        # Clients arrive from a small set of proxy addresses; remember them
+        self.is_trusted = lru_cache(maxsize=4096)(self._is_trusted)
+
+    def _is_trusted(self, address: Optional[str]) -> bool:
+        if not address:
+            return False
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.networks)
+
+
+class SecurityEventCounter:
+    """
+    Per-key event counts with rate-limited exemplar logging.
+
+    Args:
+        exemplar_interval: Seconds between exemplar lines for one key
+    """
+
+    def __init__(self, exemplar_interval: float = 60.0):
+        self.exemplar_interval = exemplar_interval
+        self._counts: Dict[str, int] = {}
+        self._last_logged: Dict[str, float] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, details: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Count an event and log it if its key has not logged recently.
+
+        Args:
+            key: Event key, e.g. 'error_response:404'
+            details: Context for the exemplar line
+
+        Returns:
+            bool: True if an exemplar line was written
+        """
+        now = time.monotonic()
+        with self._lock:
+            total = self._counts[key] = self._counts.get(key, 0) + 1
+            last = self._last_logged.get(key)
+            if last is not None and now - last < self.exemplar_interval:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+            self._last_logged[key] = now
+            suppressed = self._suppressed.pop(key, 0)
+        log_security_event(key.partition(':')[0], {
+            **(details or {}),
+            'total': total,
+            'suppressed_since_last': suppressed,
+        })
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /health/metrics."""
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            'counts': dict(sorted(counts.items())),
+            'total': sum(counts.values()),
+            'exemplar_interval_seconds': self.exemplar_interval,
+        }
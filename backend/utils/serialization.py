@@ -0,0 +1,253 @@
+"""
+Compiled model serializers for high-volume JSON responses.
+
+``to_dict()`` on a model evaluates a literal dict per row, calling
+``isoformat()`` and ``.value`` field by field, and ``jsonify`` then walks the
+result again with the stdlib encoder. A :class:`ModelSerializer` inspects the
+model's ``serialize_fields`` once, records which columns need converting for
+the active encoder, and emits bytes straight from :func:`dumps`.
+
+``orjson`` is used when installed; it encodes datetimes, dates and enums
+natively, so those columns need no per-row conversion at all. Without it the
+stdlib encoder is used and the compiled converters produce the same output.
+
+Serializers also work on plain row tuples from
+``query.with_entities(*serializer.columns)``, so listing endpoints can skip
+hydrating ORM objects. Child collections (such as property amenities) are then
+fetched with one batched query per collection.
+
+Every serializer can be narrowed to a sparse fieldset (the ``fields=`` query
+parameter). The projection reaches the SQL ``SELECT``: row serializers select
+only the chosen columns, and :meth:`ModelSerializer.load_options` gives the
+``load_only`` options for endpoints that load ORM objects.
+"""
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from flask import current_app
+from sqlalchemy import Date, DateTime, select
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.orm import lazyload, load_only
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+FAST_JSON = orjson is not None
+
+
+def dumps(payload: Any) -> bytes:
+    """
+    Encode ``payload`` as compact JSON bytes.
+
+    Args:
+        payload: JSON-serializable value; with orjson, datetimes and enums
+                 are also accepted
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def json_response(payload: Any, status: int = 200):
+    """Build a JSON response from ``payload`` without going through jsonify."""
+    return current_app.response_class(dumps(payload), status=status, mimetype='application/json')
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def _enum_value(value):
+    return value.value if value is not None else None
+
+
+def _converter_for(column_type) -> Optional[Callable[[Any], Any]]:
+    """Return the per-value converter a column needs for the active encoder."""
+    if FAST_JSON:
+        # orjson encodes datetime, date and Enum values itself
+        return None
+    if isinstance(column_type, (DateTime, Date)):
+        return _isoformat
+    if isinstance(column_type, SAEnum):
+        return _enum_value
+    return None
+
+
+class FieldSelectionError(ValueError):
+    """Raised when ``fields=`` names a field the model does not expose."""
+
+
+class ScalarCollection(NamedTuple):
+    """A list of scalar values held in a child table, e.g. property amenities."""
+    key: str
+    relationship: str
+    value_attr: str
+    order_attr: str
+
+
+class ModelSerializer:
+    """
+    Field plan for one model, compiled once and reused for every row.
+
+    Args:
+        model: Mapped model class declaring ``serialize_fields`` (column
+               names, in output order) and optionally
+               ``serialize_collections`` (``ScalarCollection`` entries)
+        fields: Sparse fieldset to emit; None emits every field. ``id`` is
+                always included.
+    """
+
+    def __init__(self, model, fields: Optional[Iterable[str]] = None):
+        self.model = model
+        all_collections = tuple(getattr(model, 'serialize_collections', ()))
+        selected = None if fields is None else set(fields) | {'id'}
+        self.fields: Tuple[str, ...] = tuple(
+            name for name in model.serialize_fields if selected is None or name in selected
+        )
+        self.columns = [getattr(model, name) for name in self.fields]
+        self.collections: Tuple[ScalarCollection, ...] = tuple(
+            collection for collection in all_collections
+            if selected is None or collection.key in selected
+        )
+        self._skipped_collections = tuple(
+            collection for collection in all_collections if collection not in self.collections
+        )
+        # (index, converter) for the columns that need converting per row
+        self._conversions = [
+            (index, converter)
+            for index, column in enumerate(self.columns)
+            for converter in [_converter_for(column.type)]
+            if converter is not None
+        ]
+        self._id_index = self.fields.index('id')
+
+    def select(self, query, *extra_columns):
+        """
+        Project ``query`` onto this serializer's columns.
+
+        ``extra_columns`` the caller needs but the fieldset may lack, such as
+        a keyset sort key, are appended after them.
+        """
+        extra = [column for column in extra_columns if column.key not in self.fields]
+        return query.with_entities(*self.columns, *extra)
+
+    def load_options(self) -> list:
+        """
+        Query options that load only this serializer's columns.
+
+        Collections outside the fieldset are switched to lazy loading so
+        their selectin queries never run.
+        """
+        options = [load_only(*self.columns)]
+        for collection in self._skipped_collections:
+            options.append(lazyload(getattr(self.model, collection.relationship)))
+        return options
+
+    def serialize_objects(self, objects: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Serialize hydrated model instances, including their collections."""
+        fields = self.fields
+        collections = self.collections
+        rows = []
+        for obj in objects:
+            values = [getattr(obj, name) for name in fields]
+            for index, converter in self._conversions:
+                values[index] = converter(values[index])
+            item = dict(zip(fields, values))
+            for collection in collections:
+                item[collection.key] = [
+                    getattr(child, collection.value_attr)
+                    for child in getattr(obj, collection.relationship)
+                ]
+            rows.append(item)
+        return rows
+
+    def serialize_rows(self, rows: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+        """
+        Serialize row tuples selected with ``with_entities(*self.columns)``.
+
+        Rows may carry extra trailing columns (e.g. a sort key the fieldset
+        left out); they are ignored. Collections are loaded with one query
+        each for the whole batch.
+        """
+        fields = self.fields
+        conversions = self._conversions
+        items = []
+        for row in rows:
+            if conversions:
+                row = list(row)
+                for index, converter in conversions:
+                    row[index] = converter(row[index])
+            items.append(dict(zip(fields, row)))
+
+        if self.collections and items:
+            ids = [row[self._id_index] for row in rows]
+            for collection in self.collections:
+                values = self._load_collection(collection, ids)
+                for item in items:
+                    item[collection.key] = values.get(item['id'], [])
+        return items
+
+    def _load_collection(self, collection: ScalarCollection, ids: List[int]) -> Dict[int, List[Any]]:
+        """Fetch ``collection`` values for ``ids`` as ``{parent_id: [values]}``."""
+        relationship = getattr(self.model, collection.relationship).property
+        child = relationship.mapper.class_
+        (_, fk_column), = relationship.local_remote_pairs
+        fk = getattr(child, fk_column.key)
+        # A Core select skips the ORM's per-row loading machinery
+        statement = (
+            select(fk, getattr(child, collection.value_attr))
+            .where(fk.in_(ids))
+            .order_by(fk, getattr(child, collection.order_attr))
+        )
+        values: Dict[int, List[Any]] = {}
+        for parent_id, value in self.model.query.session.connection().execute(statement):
+            values.setdefault(parent_id, []).append(value)
+        return values
+
+
+# Compiled serializers kept per worker. ``fields=`` lets clients choose from
+# many thousands of fieldsets, so the least recently used are dropped
+SERIALIZER_CACHE_SIZE = 256
+
+
+def parse_fields(model, value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated ``fields=`` parameter for ``model``.
+
+    Args:
+        model: Mapped model class declaring ``serialize_fields``
+        value: Raw parameter value
+
+    Returns:
+        Sorted tuple of field names, or None when no fieldset was requested
+
+    Raises:
+        FieldSelectionError: If a name is not a serializable field
+    """
+    requested = {name.strip() for name in (value or '').split(',') if name.strip()}
+    if not requested:
+        return None
+    available = set(model.serialize_fields)
+    available.update(collection.key for collection in getattr(model, 'serialize_collections', ()))
+    unknown = requested - available
+    if unknown:
+        raise FieldSelectionError(f'Unknown fields: {", ".join(sorted(unknown))}')
+    return tuple(sorted(requested))
+
+
+@lru_cache(maxsize=SERIALIZER_CACHE_SIZE)
+def get_serializer(model, fields: Optional[Tuple[str, ...]] = None) -> ModelSerializer:
+    """
+    Return the compiled serializer for ``model``, building it on first use.
+
+    Args:
+        model: Mapped model class
+        fields: Sparse fieldset from :func:`parse_fields`, or None for all
+    """
+    return ModelSerializer(model, fields)
@@ -0,0 +1,139 @@
+"""
+Free-text search over property name, location and description.
+
+PostgreSQL uses the ``pg_trgm`` extension (enabled by ``init.sql``) with GIN
+trigram indexes on each column, so ``ILIKE '%term%'`` matches are index
+scans and results are ranked by trigram word similarity.
+
+SQLite has no trigram support, so an FTS5 external-content table mirrors the
+three columns and is kept in sync by triggers. Both backends are reached
+through :func:`apply_text_search`, so dev and tests exercise the same API.
+"""
+import re
+from typing import List
+
+from sqlalchemy import DDL, column, event, func, literal, literal_column, or_, select, table, text
+
+FTS_TABLE = 'properties_fts'
+
+# Column weights used for ranking: a hit in the name counts for more than
+# one in the location, which counts for more than one in the description.
+NAME_WEIGHT = 3.0
+LOCATION_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+SQLITE_FTS_DDL: List[str] = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, location, description,
+        content='properties', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS properties_fts_ai AFTER INSERT ON properties BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, location, description)
+        VALUES (new.id, new.name, new.location, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS properties_fts_ad AFTER DELETE ON properties BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, location, description)
+        VALUES ('delete', old.id, old.name, old.location, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS properties_fts_au AFTER UPDATE OF name, location, description ON properties BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, location, description)
+        VALUES ('delete', old.id, old.name, old.location, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, location, description)
+        VALUES (new.id, new.name, new.location, new.description);
+    END""",
+]
+
+SQLITE_FTS_DROP_DDL: List[str] = [
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_TRGM_DDL: List[str] = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_properties_name_trgm ON properties USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_properties_location_trgm ON properties USING gin (location gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_properties_description_trgm ON properties USING gin (description gin_trgm_ops)",
+]
+
+
+def register_text_search_ddl(table) -> None:
+    """
+    Attach the backend-specific search DDL to ``table`` create/drop events.
+
+    This keeps ``db.create_all()`` (dev and tests) in step with the Alembic
+    migration that creates the same objects on existing databases.
+    """
+    for statement in SQLITE_FTS_DDL:
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    for statement in SQLITE_FTS_DROP_DDL:
+        event.listen(table, 'before_drop', DDL(statement).execute_if(dialect='sqlite'))
+    for statement in POSTGRES_TRGM_DDL:
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+
+
+def _search_terms(q: str) -> List[str]:
+    """Split free text into the words both backends match on."""
+    return re.findall(r'\w+', q, flags=re.UNICODE)
+
+
+def _fts5_query(q: str) -> str:
+    """Turn free text into an FTS5 query of quoted prefix terms (implicit AND)."""
+    return ' '.join(f'"{term}"*' for term in _search_terms(q))
+
+
+def apply_text_search(query, Property, q: str, ranked: bool = True):
+    """
+    Restrict ``query`` to properties matching ``q``.
+
+    Args:
+        query: Property query to filter
+        Property: The Property model class
+        q: Free text entered by the user
+        ranked: Whether the caller will order by relevance
+
+    Returns:
+        Tuple of (filtered query, relevance expression where higher is
+        better, or None when ``ranked`` is False)
+    """
+    dialect = query.session.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        match = _fts5_query(q)
+        if not match:
+            return query.filter(literal(False)), (literal(0.0) if ranked else None)
+        fts = table(FTS_TABLE, column('rowid'))
+        match_clause = text(f'{FTS_TABLE} MATCH :fts_query').bindparams(fts_query=match)
+
+        if not ranked:
+            # Resolve the match set once instead of probing the FTS index for
+            # every row an ordered index scan visits
+            return query.filter(Property.id.in_(select(fts.c.rowid).where(match_clause))), None
+
+        query = query.join(fts, fts.c.rowid == Property.id).filter(match_clause)
+        # bm25() is lower-is-better, so negate it
+        rank = -func.bm25(literal_column(FTS_TABLE), NAME_WEIGHT, LOCATION_WEIGHT, DESCRIPTION_WEIGHT)
+        return query, rank
+
+    # Same terms as the FTS5 query: every word must appear in some column.
+    # Each pattern is built in Python so the planner sees a constant it can
+    # match against the trigram indexes
+    terms = _search_terms(q)
+    if not terms:
+        return query.filter(literal(False)), (literal(0.0) if ranked else None)
+    for term in terms:
+        escaped = term.replace('/', '//').replace('%', '/%').replace('_', '/_')
+        pattern = f'%{escaped}%'
+        query = query.filter(or_(
+            Property.name.ilike(pattern, escape='/'),
+            Property.location.ilike(pattern, escape='/'),
+            Property.description.ilike(pattern, escape='/'),
+        ))
+    if not ranked:
+        return query, None
+
+    rank = (
+        NAME_WEIGHT * func.word_similarity(q, Property.name)
+        + LOCATION_WEIGHT * func.word_similarity(q, Property.location)
+        + DESCRIPTION_WEIGHT * func.word_similarity(q, func.coalesce(Property.description, ''))
+    )
+    return query, rank
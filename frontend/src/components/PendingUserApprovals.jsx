@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import {
   CheckCircle,
   XCircle,
@@ -13,18 +13,26 @@ import {
   AlertTriangle,
 } from 'lucide-react';
 import toast from 'react-hot-toast';
-import { API_BASE_URL } from '../config/api';
+import { API_BASE_URL, API_ENDPOINTS } from '../config/api';
 
 const PendingUserApprovals = () => {
   const [pendingUsers, setPendingUsers] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [selectedIds, setSelectedIds] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalPending, setTotalPending] = useState(0);
+  const [loadingMore, setLoadingMore] = useState(false);
 
-  // Fetch pending users from backend
-  const fetchPendingUsers = async () => {
+  // Fetch one page of pending users; without a cursor the list restarts.
+  // A quiet reload keeps the current list on screen while it runs
+  const fetchPendingUsers = async (cursor = null, { quiet = false } = {}) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else if (!quiet) {
+        setLoading(true);
+      }
       setError(null);
       
       const token = localStorage.getItem('access_token');
@@ -32,7 +40,14 @@ const PendingUserApprovals = () => {
         throw new Error('No authentication token found');
       }
 
-      const response = await fetch(`${API_BASE_URL}/auth/admin/pending-users`, {
+      const params = new URLSearchParams({ limit: '50' });
+      if (cursor) {
+        params.set('cursor', cursor);
+      } else {
+        params.set('count', 'estimate');
+      }
+
+      const response = await fetch(`${API_BASE_URL}/auth/admin/pending-users?${params}`, {
         method: 'GET',
         headers: {
           'Authorization': `Bearer ${token}`,
@@ -45,13 +60,19 @@ const PendingUserApprovals = () => {
       }
 
       const data = await response.json();
-      setPendingUsers(data.pending_users || []);
+      const users = data.pending_users || [];
+      setPendingUsers(prev => (cursor ? [...prev, ...users] : users));
+      setNextCursor(data.next_cursor || null);
+      if (!cursor) {
+        setTotalPending(data.total ?? users.length);
+      }
     } catch (err) {
       console.error('Error fetching pending users:', err);
       setError(err.message);
       toast.error(`Failed to fetch pending users: ${err.message}`);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -80,6 +101,7 @@ const PendingUserApprovals = () => {
       
       // Remove the approved user from the list
       setPendingUsers(prev => prev.filter(user => user.id !== userId));
+      setTotalPending(prev => Math.max(0, prev - 1));
     } catch (err) {
       console.error('Error approving user:', err);
       toast.error(`Failed to approve user: ${err.message}`);
@@ -111,40 +133,54 @@ const PendingUserApprovals = () => {
       
       // Remove the rejected user from the list
       setPendingUsers(prev => prev.filter(user => user.id !== userId));
+      setTotalPending(prev => Math.max(0, prev - 1));
     } catch (err) {
       console.error('Error rejecting user:', err);
       toast.error(`Failed to reject user: ${err.message}`);
     }
   };
 
-  // Bulk approve users
-  const bulkApprove = async () => {
+  // Approve or reject every selected user in one request
+  const bulkReview = async (action) => {
     if (!selectedIds.length) return;
     
     try {
-      for (const userId of selectedIds) {
-        await approveUser(userId);
+      const token = localStorage.getItem('access_token');
+      if (!token) {
+        throw new Error('No authentication token found');
       }
-      setSelectedIds([]);
-    } catch (err) {
-      console.error('Error in bulk approve:', err);
-    }
-  };
 
-  // Bulk reject users
-  const bulkReject = async () => {
-    if (!selectedIds.length) return;
-    
-    try {
-      for (const userId of selectedIds) {
-        await rejectUser(userId);
+      const response = await fetch(`${API_BASE_URL}/auth/admin/bulk-approval`, {
+        method: 'POST',
+        headers: {
+          'Authorization': `Bearer ${token}`,
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ action, user_ids: selectedIds }),
+      });
+
+      if (!response.ok) {
+        throw new Error(`Failed to ${action} users: ${response.status}`);
       }
+
+      const data = await response.json();
+      toast.success(`${action === 'approve' ? '✅' : '❌'} ${data.message}`);
+
+      // Every id in the results has left the queue: changed now, already
+      // reviewed by another admin, or deleted
+      const handled = new Set(data.results.map(result => result.id));
+      setPendingUsers(prev => prev.filter(user => !handled.has(user.id)));
+      setTotalPending(prev => Math.max(0, prev - handled.size));
       setSelectedIds([]);
     } catch (err) {
-      console.error('Error in bulk reject:', err);
+      console.error(`Error in bulk ${action}:`, err);
+      toast.error(`Failed to ${action} users: ${err.message}`);
     }
   };
 
+  const bulkApprove = () => bulkReview('approve');
+  const bulkReject = () => bulkReview('reject');
+
   // Toggle user selection
   const toggleSelect = (userId) => {
     setSelectedIds(prev =>
@@ -188,8 +224,95 @@ const PendingUserApprovals = () => {
   };
 
   // Load data on component mount
+  const listedIds = useRef(new Set());
+  useEffect(() => {
+    listedIds.current = new Set(pendingUsers.map(user => user.id));
+  }, [pendingUsers]);
+
+  // Apply one server-sent event to the list
+  const applyEvent = (event, data) => {
+    if (event === 'user_registered') {
+      setPendingUsers(prev => (
+        prev.some(user => user.id === data.user.id) ? prev : [data.user, ...prev]
+      ));
+      setTotalPending(prev => prev + 1);
+    } else if (event === 'approval_changed' || event === 'user_deleted') {
+      const ids = new Set(data.user_ids);
+      // Our own reviews already left the list and the count
+      const removed = data.user_ids.filter(id => listedIds.current.has(id)).length;
+      setPendingUsers(prev => prev.filter(user => !ids.has(user.id)));
+      if (removed) {
+        setTotalPending(prev => Math.max(0, prev - removed));
+      }
+      setSelectedIds(prev => prev.filter(id => !ids.has(id)));
+    }
+  };
+
+  // Follow /auth/admin/events; fetch keeps the token in a header rather
+  // than the URL, which EventSource would require. onOpen runs once the
+  // stream is connected, so nothing published after it can be missed
+  const streamEvents = async (signal, onOpen) => {
+    const token = localStorage.getItem('access_token');
+    if (!token) return 'stop';
+
+    const response = await fetch(`${API_BASE_URL}${API_ENDPOINTS.ADMIN_EVENTS}`, {
+      headers: { 'Authorization': `Bearer ${token}` },
+      signal,
+    });
+    if (response.status === 503) return 'busy';
+    if (!response.ok) return 'stop';
+    if (onOpen) onOpen();
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) return 'reconnect';
+      buffer += value;
+      let end;
+      while ((end = buffer.indexOf('\n\n')) !== -1) {
+        const frame = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        let event = 'message';
+        let data = '';
+        for (const line of frame.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        }
+        if (data) applyEvent(event, JSON.parse(data));
+      }
+    }
+  };
+
   useEffect(() => {
     fetchPendingUsers();
+
+    // The server ends each stream after a while; reconnect and reload the
+    // list to pick up events published in between, and when the stream
+    // limit is reached, fall back to reloading the list
+    const controller = new AbortController();
+    const follow = async () => {
+      let resync = false;
+      while (!controller.signal.aborted) {
+        let outcome;
+        try {
+          outcome = await streamEvents(controller.signal, resync ? () => fetchPendingUsers(null, { quiet: true }) : null);
+        } catch {
+          if (controller.signal.aborted) return;
+          outcome = 'busy';
+        }
+        if (outcome === 'stop') return;
+        if (outcome === 'busy') {
+          await new Promise(resolve => setTimeout(resolve, 30000));
+          if (!controller.signal.aborted) fetchPendingUsers();
+        } else {
+          await new Promise(resolve => setTimeout(resolve, 3000));
+        }
+        resync = outcome === 'reconnect';
+      }
+    };
+    follow();
+    return () => controller.abort();
   }, []);
 
   if (loading) {
@@ -214,7 +337,7 @@ const PendingUserApprovals = () => {
             <h3 className="text-xl font-semibold text-[#003B4C] mb-2">Error Loading Users</h3>
             <p className="text-red-600 font-medium mb-4">{error}</p>
             <button
-              onClick={fetchPendingUsers}
+              onClick={() => fetchPendingUsers()}
               className="bg-gradient-to-r from-[#007C99] to-[#0099B3] text-white px-6 py-3 rounded-xl hover:from-[#0099B3] hover:to-[#007C99] transition-all duration-300 flex items-center gap-2 shadow-lg hover:shadow-xl transform hover:scale-105 font-medium mx-auto"
             >
               <RefreshCw className="w-5 h-5" />
@@ -243,7 +366,7 @@ const PendingUserApprovals = () => {
             </div>
             <div>
               <p className="text-sm text-yellow-600 font-medium">Pending Approval</p>
-              <p className="text-xl font-bold text-yellow-800">{pendingUsers.length}</p>
+              <p className="text-xl font-bold text-yellow-800">{totalPending}</p>
             </div>
           </div>
         </div>
@@ -276,7 +399,7 @@ const PendingUserApprovals = () => {
       {/* Refresh Button */}
       <div className="flex justify-end mb-4">
         <button
-          onClick={fetchPendingUsers}
+          onClick={() => fetchPendingUsers()}
           className="bg-gradient-to-r from-[#007C99] to-[#0099B3] text-white px-4 py-2 rounded-xl hover:from-[#0099B3] hover:to-[#007C99] transition-all duration-300 flex items-center gap-2 shadow-lg hover:shadow-xl transform hover:scale-105"
         >
           <RefreshCw className="w-4 h-4" />
@@ -383,6 +506,20 @@ const PendingUserApprovals = () => {
         </div>
       )}
 
+      {/* Load More */}
+      {nextCursor && (
+        <div className="flex justify-center">
+          <button
+            onClick={() => fetchPendingUsers(nextCursor)}
+            disabled={loadingMore}
+            className="bg-gradient-to-r from-[#007C99] to-[#0099B3] text-white px-6 py-3 rounded-xl hover:from-[#0099B3] hover:to-[#007C99] transition-all duration-300 flex items-center gap-2 shadow-lg hover:shadow-xl font-medium disabled:opacity-60"
+          >
+            <RefreshCw className={`w-4 h-4 ${loadingMore ? 'animate-spin' : ''}`} />
+            {loadingMore ? 'Loading...' : `Load more (${pendingUsers.length} of ${totalPending})`}
+          </button>
+        </div>
+      )}
+
       {/* Select All */}
       {pendingUsers.length > 0 && (
         <div className="bg-gradient-to-r from-white to-[#f8fafc] p-4 rounded-2xl border border-white/50 backdrop-blur-sm">
@@ -38,6 +38,8 @@ const PropertyList = ({ onBook }) => {
         if (max) params.append('max_price', max.replace('K', '000'));
       }
       if (filters.propertyType) params.append('type', filters.propertyType);
+      // Listing is paginated server-side; keep the full list until this view pages
+      params.append('unpaged', 'true');
       
       const response = await get(`/api/properties?${params.toString()}`);
       if (response.ok) {
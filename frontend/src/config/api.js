@@ -14,6 +14,8 @@ export const API_ENDPOINTS = {
   PENDING_USERS: '/auth/admin/pending-users',
   APPROVE_USER: (id) => `/auth/admin/approve-user/${id}`,
   REJECT_USER: (id) => `/auth/admin/reject-user/${id}`,
+  BULK_APPROVAL: '/auth/admin/bulk-approval',
+  ADMIN_EVENTS: '/auth/admin/events',
   
   // Properties
   PROPERTIES: '/api/properties',